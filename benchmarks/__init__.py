@@ -0,0 +1,5 @@
+#
+# SPDX-FileCopyrightText: The LineageOS Project
+# SPDX-License-Identifier: LGPL-3.0-or-later
+#
+"""liblineage benchmarks."""
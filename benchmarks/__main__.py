@@ -0,0 +1,152 @@
+#
+# SPDX-FileCopyrightText: The LineageOS Project
+# SPDX-License-Identifier: LGPL-3.0-or-later
+#
+"""Run the benchmark suite with timeit, and track the results over time.
+
+Run with `python -m benchmarks`, see --help for the options. Every run is appended to a JSON
+lines history file along with the git revision, and compared to the previous run.
+
+For more rigorous measurements (separate processes, calibration, system tuning checks), install
+pyperf and use `python -m benchmarks.pyperf_runner` instead.
+"""
+
+from argparse import ArgumentParser
+from datetime import datetime, timezone
+import fnmatch
+import json
+from pathlib import Path
+import platform
+import subprocess
+from timeit import Timer
+from typing import Any, Dict, List, Optional
+
+from benchmarks.suite import BENCHMARKS, SLOW_BENCHMARKS
+from liblineage.updater.json_backend import JSON_BACKEND
+from liblineage.wiki.yaml_loader import YAML_BACKEND
+
+DEFAULT_HISTORY = Path(".benchmarks") / "history.jsonl"
+REGRESSION_THRESHOLD = 0.1
+"""Relative slowdown flagged as a regression when comparing with the previous run."""
+
+
+def get_git_revision() -> Optional[str]:
+    try:
+        revision = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, check=True, text=True
+        ).stdout.strip()
+        dirty = subprocess.run(
+            ["git", "status", "--porcelain", "--untracked-files=no"],
+            capture_output=True,
+            check=True,
+            text=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+    return f"{revision}-dirty" if dirty else revision
+
+
+def select_benchmarks(patterns: List[str], quick: bool) -> List[str]:
+    names = [name for name in BENCHMARKS if not quick or name not in SLOW_BENCHMARKS]
+    if patterns:
+        names = [name for name in names if any(fnmatch.fnmatch(name, p) for p in patterns)]
+
+    return names
+
+
+def run_benchmark(name: str, repeat: int) -> Dict[str, Any]:
+    timer = Timer(BENCHMARKS[name]())
+
+    # Like `python -m timeit`, loop enough times to take at least 0.2 seconds
+    number, _ = timer.autorange()
+    times = [time / number for time in timer.repeat(repeat, number)]
+
+    return {
+        "min": min(times),
+        "mean": sum(times) / len(times),
+        "loops": number,
+        "repeat": repeat,
+    }
+
+
+def load_previous_run(history: Path) -> Optional[Dict[str, Any]]:
+    try:
+        lines = history.read_text().splitlines()
+    except FileNotFoundError:
+        return None
+
+    return json.loads(lines[-1]) if lines else None
+
+
+def format_time(seconds: float) -> str:
+    for unit, scale in (("s", 1), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.3g} {unit}"
+
+    return f"{seconds / 1e-9:.3g} ns"
+
+
+def main() -> None:
+    parser = ArgumentParser(prog="python -m benchmarks", description=__doc__)
+    parser.add_argument("patterns", nargs="*", help="Only run the benchmarks matching these globs")
+    parser.add_argument("--quick", action="store_true", help="Skip the slow benchmarks")
+    parser.add_argument("--repeat", type=int, default=5, help="Number of timed repetitions")
+    parser.add_argument("--history", type=Path, default=DEFAULT_HISTORY, help="History file")
+    parser.add_argument("--no-save", action="store_true", help="Don't append to the history")
+    parser.add_argument("--list", action="store_true", help="List the benchmarks and exit")
+    args = parser.parse_args()
+
+    names = select_benchmarks(args.patterns, args.quick)
+    if args.list:
+        print("\n".join(names))
+        return
+
+    previous = load_previous_run(args.history)
+    previous_results = previous["results"] if previous is not None else {}
+
+    revision = get_git_revision()
+    print(f"liblineage {revision}, Python {platform.python_version()}, ", end="")
+    print(f"JSON backend {JSON_BACKEND}, YAML backend {YAML_BACKEND}")
+    if previous is not None:
+        print(f"Compared with {previous['revision']} ({previous['timestamp']})")
+    print()
+
+    results = {}
+    regressions = []
+    for name in names:
+        result = results[name] = run_benchmark(name, args.repeat)
+
+        line = f"{name:<28} {format_time(result['min']):>10}"
+
+        previous_result = previous_results.get(name)
+        if previous_result is not None:
+            change = result["min"] / previous_result["min"] - 1
+            line += f" {change:+8.1%}"
+            if change > REGRESSION_THRESHOLD:
+                line += "  <- slower"
+                regressions.append(name)
+
+        print(line, flush=True)
+
+    if regressions:
+        print(f"\n{len(regressions)} benchmarks slower by more than {REGRESSION_THRESHOLD:.0%}")
+
+    if args.no_save:
+        return
+
+    args.history.parent.mkdir(parents=True, exist_ok=True)
+    with args.history.open("a") as history:
+        run = {
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "revision": revision,
+            "python": platform.python_version(),
+            "json_backend": JSON_BACKEND,
+            "yaml_backend": YAML_BACKEND,
+            "results": results,
+        }
+        history.write(json.dumps(run) + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+#
+# SPDX-FileCopyrightText: The LineageOS Project
+# SPDX-License-Identifier: LGPL-3.0-or-later
+#
+"""Synthetic, reproducible data resembling the real LineageOS wiki and updater data."""
+
+from datetime import date
+from random import Random
+from typing import Any, Dict, List
+
+import yaml
+
+SOCS = [
+    "Qualcomm SM8350 Snapdragon 888",
+    "Qualcomm SM8250 Snapdragon 865",
+    "Qualcomm SDM845 Snapdragon 845",
+    "Qualcomm SM7325 Snapdragon 778G",
+    "MediaTek Helio G90T",
+    "Google Tensor G2",
+]
+VENDORS = ["Google", "OnePlus", "Samsung", "Xiaomi", "Motorola", "Fairphone", "Sony"]
+VERSIONS = [18.1, 19.1, 20.0, 21.0, 22.1, 22.2]
+
+
+def _device_dict(random: Random, index: int) -> Dict[str, Any]:
+    vendor = random.choice(VENDORS)
+    codename = f"device{index}"
+    models = [
+        f"{vendor[:2].upper()}{random.randint(1000, 9999)}" for _ in range(random.randint(1, 4))
+    ]
+    versions = sorted(random.sample(VERSIONS, random.randint(1, 4)))
+
+    def battery() -> Dict[str, Any]:
+        return {"removable": False, "capacity": random.randint(20, 60) * 100, "tech": "Li-Po"}
+
+    def screen() -> Dict[str, Any]:
+        return {
+            "size": f"{random.randint(50, 70) / 10} in",
+            "resolution": random.choice(["1080x2400", "1440x3200", "720x1600"]),
+            "technology": random.choice(["AMOLED", "IPS LCD", "P-OLED"]),
+            "refresh_rate": random.choice([60, 90, 120]),
+        }
+
+    def dimensions() -> Dict[str, Any]:
+        return {
+            "height": f"{random.randint(1400, 1700) / 10} mm",
+            "width": f"{random.randint(680, 780) / 10} mm",
+            "depth": f"{random.randint(75, 95) / 10} mm",
+        }
+
+    # About a third of the devices have per-model variants
+    variants = len(models) > 1 and random.random() < 0.5
+
+    return {
+        "architecture": {"cpu": "arm64", "userspace": "arm64"},
+        "battery": [{model: battery()} for model in models] if variants else battery(),
+        "bluetooth": {"spec": random.choice(["5.0", "5.1", "5.2"]), "profiles": ["A2DP"]},
+        "cameras": [
+            {"info": f"{random.choice([12, 48, 50, 64])} MP", "flash": "LED"}
+            for _ in range(random.randint(1, 4))
+        ],
+        "codename": codename,
+        "cpu": "Kryo 680",
+        "cpu_cores": 8,
+        "cpu_freq": f"1 x {random.randint(25, 32) / 10} GHz + 3 x 2.42 GHz + 4 x 1.8 GHz",
+        "current_branch": versions[-1],
+        "dimensions": [{model: dimensions()} for model in models] if variants else dimensions(),
+        "gpu": "Adreno 660",
+        "image": f"{codename}.png",
+        "install_method": random.choice(["fastboot_nexus", "fastboot_xiaomi", "heimdall"]),
+        "is_ab_device": random.random() < 0.6,
+        "kernel": {"repo": f"android_kernel_{vendor.lower()}_{codename}", "version": "5.4"},
+        "maintainers": [f"maintainer{random.randint(0, 200)}" for _ in range(random.randint(0, 3))],
+        "models": models,
+        "name": f"{vendor} Phone {index}",
+        "network": ["2G GSM", "3G UMTS", "4G LTE", "5G NR"][: random.randint(2, 4)],
+        "peripherals": ["Dual SIM", "Fingerprint reader", "NFC", "Accelerometer", "Gyroscope"],
+        "release": date(random.randint(2016, 2024), random.randint(1, 12), random.randint(1, 28)),
+        "screen": [{model: screen()} for model in models] if variants else screen(),
+        "soc": random.choice(SOCS),
+        "tree": f"android_device_{vendor.lower()}_{codename}",
+        "type": random.choice(["phone", "phone", "phone", "tablet"]),
+        "vendor": vendor,
+        "vendor_short": vendor.lower(),
+        "versions": versions,
+        "wifi": "802.11 a/b/g/n/ac/ax",
+    }
+
+
+def device_yaml_corpus(count: int, seed: int = 0) -> List[bytes]:
+    """Generate `count` wiki device YAML files."""
+    random = Random(seed)
+    return [
+        yaml.safe_dump(_device_dict(random, index), sort_keys=False).encode()
+        for index in range(count)
+    ]
+
+
+def _build_file_json(random: Random, device: str, name: str) -> Dict[str, Any]:
+    filepath = f"/full/{device}/{random.randint(20200101, 20241231)}/{name}"
+    return {
+        "filename": name,
+        "filepath": filepath,
+        "sha1": f"{random.getrandbits(160):040x}",
+        "sha256": f"{random.getrandbits(256):064x}",
+        "size": random.randint(1 << 20, 1 << 31),
+        "url": f"https://mirrorbits.lineageos.org{filepath}",
+    }
+
+
+def v2_builds_json(count: int, device: str = "device0", seed: int = 0) -> List[Dict[str, Any]]:
+    """Generate the JSON of `count` v2 builds, as returned by /v2/devices/{device}/builds."""
+    random = Random(seed)
+    builds = []
+
+    for _ in range(count):
+        timestamp = random.randint(1577836800, 1735689600)
+        version = random.choice(VERSIONS)
+        day = date.fromtimestamp(timestamp).isoformat()
+        builds.append(
+            {
+                "date": day,
+                "datetime": timestamp,
+                "files": [
+                    _build_file_json(random, device, name)
+                    for name in [
+                        f"lineage-{version}-{day.replace('-', '')}-nightly-{device}-signed.zip",
+                        "boot.img",
+                        "dtbo.img",
+                        "vendor_boot.img",
+                    ]
+                ],
+                "os_patch_level": day[:7],
+                "type": "nightly",
+                "version": str(version),
+            }
+        )
+
+    return builds
+
+
+def v1_builds_json(count: int, device: str = "device0", seed: int = 0) -> Dict[str, Any]:
+    """Generate the JSON of `count` v1 builds, as returned by /v1/{device}/{type}/{incremental}."""
+    random = Random(seed)
+    builds = []
+
+    for _ in range(count):
+        timestamp = random.randint(1577836800, 1735689600)
+        version = random.choice(VERSIONS)
+        filename = f"lineage-{version}-{timestamp}-nightly-{device}-signed.zip"
+        builds.append(
+            {
+                "datetime": timestamp,
+                "filename": filename,
+                "id": f"{random.getrandbits(256):064x}",
+                "romtype": "nightly",
+                "size": random.randint(1 << 20, 1 << 31),
+                "url": f"https://mirrorbits.lineageos.org/full/{device}/{filename}",
+                "version": str(version),
+            }
+        )
+
+    return {"response": builds}
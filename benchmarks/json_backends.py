@@ -0,0 +1,54 @@
+#
+# SPDX-FileCopyrightText: The LineageOS Project
+# SPDX-License-Identifier: LGPL-3.0-or-later
+#
+"""v2 builds list decoding benchmark, for each installed JSON backend.
+
+Run with `python -m benchmarks.json_backends`.
+"""
+
+import json
+from timeit import repeat
+from typing import Any, Callable, Dict
+
+from benchmarks._corpus import v2_builds_json
+from liblineage.updater import json_backend
+from liblineage.updater.json_backend import JSON_BACKEND
+from liblineage.updater.v2._deserializer import decode_device_builds, get_device_builds
+
+BUILDS = 10_000
+REPEAT = 5
+
+
+def main() -> None:
+    data = json.dumps(v2_builds_json(BUILDS)).encode()
+
+    backends: Dict[str, Callable[[bytes], Any]] = {"json": json.loads}
+    try:
+        import orjson  # pyright: ignore[reportMissingImports]
+
+        backends["orjson"] = orjson.loads
+    except ImportError:
+        pass
+    try:
+        import msgspec  # pyright: ignore[reportMissingImports]
+
+        backends["msgspec"] = msgspec.json.decode
+    except ImportError:
+        pass
+
+    print(f"{BUILDS} builds, {len(data) // 1024} KiB")
+
+    for name, loads in backends.items():
+        result = min(
+            repeat(lambda loads=loads: get_device_builds(loads(data)), number=1, repeat=REPEAT)
+        )
+        print(f"{name:>8}: {result * 1000:8.1f} ms")
+
+    decoder = "msgspec typed structs" if json_backend.msgspec is not None else JSON_BACKEND
+    result = min(repeat(lambda: decode_device_builds(data), number=1, repeat=REPEAT))
+    print(f"decode_device_builds ({decoder}): {result * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+#
+# SPDX-FileCopyrightText: The LineageOS Project
+# SPDX-License-Identifier: LGPL-3.0-or-later
+#
+"""Run the benchmark suite with pyperf (pip install pyperf).
+
+Run from the root of the repository with `python -m benchmarks.pyperf_runner -o results.json`,
+and compare two runs with `python -m pyperf compare_to old.json new.json`. Pass
+--benchmarks with comma separated globs to only run some of them, the pyperf options are
+accepted as-is.
+"""
+
+from argparse import Namespace
+import fnmatch
+from typing import Any, Callable, List, Optional
+
+import pyperf  # pyright: ignore[reportMissingImports]
+
+from benchmarks.suite import BENCHMARKS, Benchmark
+
+
+def lazy(setup: Benchmark) -> Callable[[], Any]:
+    # pyperf runs every benchmark in its own worker processes, the setup only happens in the
+    # workers running it, and its first call is part of the discarded warmup
+    function: Optional[Callable[[], Any]] = None
+
+    def run() -> Any:
+        nonlocal function
+        if function is None:
+            function = setup()
+
+        return function()
+
+    return run
+
+
+def add_cmdline_args(cmd: List[str], args: Namespace) -> None:
+    # Forwarded to the worker processes
+    if args.benchmarks:
+        cmd.extend(("--benchmarks", args.benchmarks))
+
+
+def main() -> None:
+    # Workers are spawned as `python -m benchmarks.pyperf_runner`, so that the imports work
+    runner = pyperf.Runner(
+        add_cmdline_args=add_cmdline_args, program_args=("-m", "benchmarks.pyperf_runner")
+    )
+    runner.argparser.add_argument("--benchmarks", help="Comma separated globs of benchmarks")
+    args = runner.parse_args()
+
+    patterns = [pattern for pattern in (args.benchmarks or "").split(",") if pattern]
+
+    for name, setup in BENCHMARKS.items():
+        if patterns and not any(fnmatch.fnmatch(name, pattern) for pattern in patterns):
+            continue
+
+        runner.bench_func(name, lazy(setup))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+#
+# SPDX-FileCopyrightText: The LineageOS Project
+# SPDX-License-Identifier: LGPL-3.0-or-later
+#
+"""Definitions of the benchmarks run by `python -m benchmarks` and `benchmarks.pyperf_runner`.
+
+Every benchmark is a setup function returning the function to time, so that the corpus
+generation isn't measured and only happens for the selected benchmarks.
+"""
+
+import asyncio
+import atexit
+import json
+from typing import Any, Callable, Dict, List
+
+from benchmarks._corpus import device_yaml_corpus, v1_builds_json, v2_builds_json
+from liblineage.testing.fake_updater import FakeUpdater, FakeUpdaterData
+from liblineage.updater.http_utils import AsyncHttpClient
+from liblineage.updater.json_backend import loads
+from liblineage.updater.v1._deserializer import get_device_builds as get_v1_device_builds
+from liblineage.updater.v2 import AsyncV2Api
+from liblineage.updater.v2._deserializer import decode_device_builds
+from liblineage.wiki.device_data import DeviceData
+from liblineage.wiki.yaml_loader import load_yaml
+
+WIKI_CORPUS_SIZE = 200
+BUILD_LIST_SIZES = {"10": 10, "1k": 1_000, "100k": 100_000}
+THROUGHPUT_DEVICES = 50
+THROUGHPUT_REQUESTS = 500
+
+Benchmark = Callable[[], Callable[[], Any]]
+
+BENCHMARKS: Dict[str, Benchmark] = {}
+"""Dictionary of benchmark name to its setup function."""
+
+SLOW_BENCHMARKS = {"v1_builds_100k", "v2_builds_100k"}
+"""Benchmarks skipped by quick runs."""
+
+
+def benchmark(name: str) -> Callable[[Benchmark], Benchmark]:
+    def decorator(setup: Benchmark) -> Benchmark:
+        BENCHMARKS[name] = setup
+        return setup
+
+    return decorator
+
+
+@benchmark("wiki_yaml_parse")
+def wiki_yaml_parse() -> Callable[[], Any]:
+    corpus = device_yaml_corpus(WIKI_CORPUS_SIZE)
+    return lambda: [load_yaml(data) for data in corpus]
+
+
+@benchmark("wiki_from_dict")
+def wiki_from_dict() -> Callable[[], Any]:
+    dicts = [load_yaml(data) for data in device_yaml_corpus(WIKI_CORPUS_SIZE)]
+    return lambda: [DeviceData.from_dict(data) for data in dicts]
+
+
+def _v1_builds(count: int) -> Benchmark:
+    def setup() -> Callable[[], Any]:
+        data = json.dumps(v1_builds_json(count)).encode()
+        return lambda: get_v1_device_builds(loads(data))
+
+    return setup
+
+
+def _v2_builds(count: int) -> Benchmark:
+    def setup() -> Callable[[], Any]:
+        data = json.dumps(v2_builds_json(count)).encode()
+        return lambda: decode_device_builds(data)
+
+    return setup
+
+
+for _label, _count in BUILD_LIST_SIZES.items():
+    benchmark(f"v1_builds_{_label}")(_v1_builds(_count))
+    benchmark(f"v2_builds_{_label}")(_v2_builds(_count))
+
+
+@benchmark("async_client_throughput")
+def async_client_throughput() -> Callable[[], Any]:
+    # The server runs in its own thread and event loop, to keep it out of the client's loop.
+    # It's stopped when the process exits
+    data = FakeUpdaterData.generate(devices=THROUGHPUT_DEVICES, builds_per_device=30)
+    server = FakeUpdater(data)
+    context = server.serve_in_thread()
+    context.__enter__()
+    atexit.register(context.__exit__, None, None, None)
+
+    devices = [f"device{index % THROUGHPUT_DEVICES}" for index in range(THROUGHPUT_REQUESTS)]
+
+    async def fetch_all() -> List[Any]:
+        async with AsyncHttpClient(base_urls=server.base_urls) as client:
+            return [
+                result async for result in AsyncV2Api.get_many_device_builds(devices, client=client)
+            ]
+
+    return lambda: asyncio.run(fetch_all())
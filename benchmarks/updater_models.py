@@ -0,0 +1,73 @@
+#
+# SPDX-FileCopyrightText: The LineageOS Project
+# SPDX-License-Identifier: LGPL-3.0-or-later
+#
+"""Memory footprint of the updater models, compared to equivalent __dict__ based classes.
+
+Run with `python -m benchmarks.updater_models`.
+"""
+
+from datetime import datetime
+import gc
+import tracemalloc
+from typing import Any, Callable, Dict, List
+
+from benchmarks._corpus import v2_builds_json
+from liblineage.updater.v2.build import Build
+
+BUILDS = 10_000
+
+
+class DictBuildFile:
+    """v2 BuildFile, without __slots__."""
+
+    def __init__(self, json: Dict[str, Any]) -> None:
+        self.filename = json["filename"]
+        self.filepath = json["filepath"]
+        self.sha1 = json["sha1"]
+        self.sha256 = json["sha256"]
+        self.size = json["size"]
+        self.url = json["url"]
+
+
+class DictBuild:
+    """v2 Build, without __slots__."""
+
+    def __init__(self, json: Dict[str, Any]) -> None:
+        self.date = json["date"]
+        self.datetime = datetime.fromtimestamp(json["datetime"])
+        self.files = [DictBuildFile(file) for file in json["files"]]
+        self.os_patch_level = json["os_patch_level"]
+        self.build_type = json["type"]
+        self.version = json["version"]
+        self.ota_zip = self.files[0]
+
+
+def measure(factory: Callable[[], List[Any]]) -> int:
+    """Return the memory still allocated after factory() returns, in bytes."""
+    gc.collect()
+    tracemalloc.start()
+    objects = factory()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del objects
+    return size
+
+
+def main() -> None:
+    # The strings are shared with the JSON objects, so only the models are measured
+    builds_json = v2_builds_json(BUILDS)
+    files = sum(len(build["files"]) for build in builds_json)
+
+    dict_based = measure(lambda: [DictBuild(build) for build in builds_json])
+    slotted = measure(lambda: [Build.from_json(build) for build in builds_json])
+
+    print(f"{BUILDS} builds, {files} build files")
+    print(f"{'__dict__':>10}: {dict_based / 1024 / 1024:6.2f} MiB")
+    print(f"{'__slots__':>10}: {slotted / 1024 / 1024:6.2f} MiB")
+    print(f"{'saved':>10}: {(dict_based - slotted) / 1024 / 1024:6.2f} MiB", end=" ")
+    print(f"({(1 - slotted / dict_based) * 100:.0f}%)")
+
+
+if __name__ == "__main__":
+    main()
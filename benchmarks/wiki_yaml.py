@@ -0,0 +1,55 @@
+#
+# SPDX-FileCopyrightText: The LineageOS Project
+# SPDX-License-Identifier: LGPL-3.0-or-later
+#
+"""Wiki device YAML parsing benchmark, pure Python loader vs libyaml.
+
+Run with `python -m benchmarks.wiki_yaml`.
+"""
+
+from timeit import repeat
+from typing import Any, Dict
+
+import yaml
+
+from benchmarks._corpus import device_yaml_corpus
+from liblineage.wiki.device_data import DeviceData
+from liblineage.wiki.yaml_loader import YAML_BACKEND
+
+CORPUS_SIZE = 200
+REPEAT = 5
+
+
+def main() -> None:
+    corpus = device_yaml_corpus(CORPUS_SIZE)
+
+    loaders: Dict[str, Any] = {"SafeLoader": yaml.SafeLoader}
+    if hasattr(yaml, "CSafeLoader"):
+        loaders["CSafeLoader"] = yaml.CSafeLoader
+
+    print(f"{CORPUS_SIZE} device files, {sum(map(len, corpus)) // 1024} KiB")
+
+    results = {}
+    for name, loader in loaders.items():
+        results[name] = min(
+            repeat(
+                lambda loader=loader: [yaml.load(data, Loader=loader) for data in corpus],
+                number=1,
+                repeat=REPEAT,
+            )
+        )
+        print(f"{name:>12}: {results[name] * 1000:8.1f} ms")
+
+    if "CSafeLoader" in results:
+        print(f"{'speedup':>12}: {results['SafeLoader'] / results['CSafeLoader']:8.1f}x")
+
+    from_yaml_bytes = min(
+        repeat(
+            lambda: [DeviceData.from_yaml_bytes(data) for data in corpus], number=1, repeat=REPEAT
+        )
+    )
+    print(f"DeviceData.from_yaml_bytes ({YAML_BACKEND}): {from_yaml_bytes * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
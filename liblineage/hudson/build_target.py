@@ -3,19 +3,40 @@
 # SPDX-License-Identifier: LGPL-3.0-or-later
 #
 
+import asyncio
 from datetime import date, timedelta
 from random import Random
-import requests
+from threading import RLock
+from time import monotonic
+from typing import Dict, Iterable, List, Optional, Tuple
+from weakref import WeakKeyDictionary
 
 from liblineage.constants.infra import GITHUB_ORG
 from liblineage.hudson.period import Period
+from liblineage.updater.http_utils import (
+    AsyncHttpClient,
+    AsyncHttpRequests,
+    SyncHttpClient,
+    SyncHttpRequests,
+)
 
 LINEAGE_BUILD_TARGETS_FILE = (
     f"https://raw.githubusercontent.com/{GITHUB_ORG}/hudson/main/lineage-build-targets"
 )
 
+LINEAGE_BUILD_TARGETS_TTL = 300.0
+"""Default time (in seconds) the parsed lineage-build-targets file is kept in memory."""
+
 
 class BuildTarget:
+    # The parsed lineage-build-targets file is kept in memory for cache_ttl seconds, so looking
+    # up many devices doesn't download it every time
+    cache_ttl = LINEAGE_BUILD_TARGETS_TTL
+    _cache_lock = RLock()
+    _cache_timestamp: Optional[float] = None
+    _cached_targets: List["BuildTarget"] = []
+    _cached_index: Dict[str, "BuildTarget"] = {}
+
     def __init__(
         self,
         device: str,
@@ -36,16 +57,95 @@ class BuildTarget:
         args = line.split()
         return cls(args[0], args[1], args[2], Period(args[3]))
 
+    def to_api(self) -> str:
+        """Convert the object to a line of the lineage-build-targets file."""
+        return f"{self.device} {self.build_type} {self.branch_name} {self.period.value}"
+
     @classmethod
-    def get_lineage_build_targets(cls):
-        response = requests.get(url=LINEAGE_BUILD_TARGETS_FILE).text.split("\n")
-        return [cls.from_api(line) for line in response if line and not line.startswith("#")]
+    def from_lineage_build_targets(cls, text: str) -> List["BuildTarget"]:
+        """Parse the content of the lineage-build-targets file."""
+        return [
+            cls.from_api(line) for line in text.split("\n") if line and not line.startswith("#")
+        ]
+
+    @classmethod
+    def get_lineage_build_targets(
+        cls, client: Optional[SyncHttpClient] = None, refresh: bool = False
+    ) -> List["BuildTarget"]:
+        """Get all the build targets.
+
+        The result is cached in memory for cache_ttl seconds, set refresh to True to download it
+        again anyway.
+        """
+        return list(cls._get_cache(client, refresh)[0])
 
     @classmethod
-    def get_device(cls, device: str):
-        """Get the build target given a device codename."""
-        # There can't be duplicates, plus this will miserably fail if this device isn't there
-        return [target for target in cls.get_lineage_build_targets() if target.device == device][0]
+    def get_lineage_build_targets_index(
+        cls, client: Optional[SyncHttpClient] = None, refresh: bool = False
+    ) -> Dict[str, "BuildTarget"]:
+        """Get all the build targets, as a dictionary of device codename to build target.
+
+        The result is cached in memory like get_lineage_build_targets().
+        """
+        return dict(cls._get_cache(client, refresh)[1])
+
+    @classmethod
+    def refresh_lineage_build_targets(cls, client: Optional[SyncHttpClient] = None) -> None:
+        """Download the build targets again, replacing the cached ones."""
+        cls._get_cache(client, True)
+
+    @classmethod
+    def invalidate_lineage_build_targets(cls) -> None:
+        """Drop the cached build targets, the next lookup will download them again."""
+        with cls._cache_lock:
+            cls._cache_timestamp = None
+            cls._cached_targets = []
+            cls._cached_index = {}
+
+    @classmethod
+    def get_device(cls, device: str, client: Optional[SyncHttpClient] = None) -> "BuildTarget":
+        """Get the build target given a device codename.
+
+        Raises KeyError if the device has no build target.
+        """
+        try:
+            return cls._get_cache(client)[1][device]
+        except KeyError:
+            raise KeyError(f"No build target found for device {device}") from None
+
+    @classmethod
+    def _get_cache(
+        cls, client: Optional[SyncHttpClient] = None, refresh: bool = False
+    ) -> Tuple[List["BuildTarget"], Dict[str, "BuildTarget"]]:
+        # The lock is held while downloading, so concurrent lookups don't download it again
+        with cls._cache_lock:
+            cache = None if refresh else cls._get_valid_cache()
+            if cache is None:
+                text = SyncHttpRequests.get_text(LINEAGE_BUILD_TARGETS_FILE, client=client)
+                cache = cls._update_cache(cls.from_lineage_build_targets(text))
+
+            return cache
+
+    @classmethod
+    def _get_valid_cache(cls) -> Optional[Tuple[List["BuildTarget"], Dict[str, "BuildTarget"]]]:
+        # The cached list and index are replaced and never modified in place
+        with cls._cache_lock:
+            if cls._cache_timestamp is None or monotonic() - cls._cache_timestamp >= cls.cache_ttl:
+                return None
+
+            return cls._cached_targets, cls._cached_index
+
+    @classmethod
+    def _update_cache(
+        cls, targets: List["BuildTarget"]
+    ) -> Tuple[List["BuildTarget"], Dict[str, "BuildTarget"]]:
+        with cls._cache_lock:
+            # There can't be duplicates
+            cls._cached_targets = targets
+            cls._cached_index = {target.device: target for target in targets}
+            cls._cache_timestamp = monotonic()
+
+            return cls._cached_targets, cls._cached_index
 
     def get_next_build_date(self) -> date:
         """Get the next build date for this build target."""
@@ -78,3 +178,78 @@ class BuildTarget:
             return today + timedelta(days=delta_day)
 
         raise NotImplementedError(f"Unknown period {self.period}")
+
+
+class AsyncBuildTarget:
+    """Asynchronous variants of the BuildTarget fetchers.
+
+    They share the in-memory cache of BuildTarget.
+    """
+
+    # One lock per event loop, held while downloading so concurrent lookups don't download the
+    # file again (asyncio locks can't be shared between loops)
+    _cache_locks: "WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Lock]" = WeakKeyDictionary()
+
+    @staticmethod
+    async def get_lineage_build_targets(
+        client: Optional[AsyncHttpClient] = None, refresh: bool = False
+    ) -> List[BuildTarget]:
+        """Get all the build targets."""
+        return list((await AsyncBuildTarget._get_cache(client, refresh))[0])
+
+    @staticmethod
+    async def get_lineage_build_targets_index(
+        client: Optional[AsyncHttpClient] = None, refresh: bool = False
+    ) -> Dict[str, BuildTarget]:
+        """Get all the build targets, as a dictionary of device codename to build target."""
+        return dict((await AsyncBuildTarget._get_cache(client, refresh))[1])
+
+    @staticmethod
+    async def get_device(device: str, client: Optional[AsyncHttpClient] = None) -> BuildTarget:
+        """Get the build target given a device codename.
+
+        Raises KeyError if the device has no build target.
+        """
+        try:
+            return (await AsyncBuildTarget._get_cache(client))[1][device]
+        except KeyError:
+            raise KeyError(f"No build target found for device {device}") from None
+
+    @staticmethod
+    async def get_devices(
+        devices: Iterable[str], client: Optional[AsyncHttpClient] = None
+    ) -> Dict[str, BuildTarget]:
+        """Get the build targets of many devices, as a dictionary of device codename to build
+        target.
+
+        Devices without a build target are left out.
+        """
+        index = (await AsyncBuildTarget._get_cache(client))[1]
+
+        return {device: index[device] for device in devices if device in index}
+
+    @staticmethod
+    async def _get_cache(
+        client: Optional[AsyncHttpClient] = None, refresh: bool = False
+    ) -> Tuple[List[BuildTarget], Dict[str, BuildTarget]]:
+        cache = None if refresh else BuildTarget._get_valid_cache()
+        if cache is not None:
+            return cache
+
+        async with AsyncBuildTarget._get_cache_lock():
+            # Another task may have downloaded it while waiting for the lock
+            cache = None if refresh else BuildTarget._get_valid_cache()
+            if cache is None:
+                text = await AsyncHttpRequests.get_text(LINEAGE_BUILD_TARGETS_FILE, client=client)
+                cache = BuildTarget._update_cache(BuildTarget.from_lineage_build_targets(text))
+
+            return cache
+
+    @staticmethod
+    def _get_cache_lock() -> asyncio.Lock:
+        loop = asyncio.get_running_loop()
+        lock = AsyncBuildTarget._cache_locks.get(loop)
+        if lock is None:
+            lock = AsyncBuildTarget._cache_locks[loop] = asyncio.Lock()
+
+        return lock
@@ -0,0 +1,261 @@
+#
+# SPDX-FileCopyrightText: The LineageOS Project
+# SPDX-License-Identifier: LGPL-3.0-or-later
+#
+"""Binary snapshots of the device catalog, for a fast cold start.
+
+A snapshot holds the wiki device data, the v2 OEMs and devices, and the Hudson build targets,
+so that a service can start from a local file instead of downloading and parsing everything.
+
+The file starts with a fixed size header (magic, format version, creation time, liblineage
+version, payload size and checksum) followed by a small JSON metadata block and the payload.
+The header can be read on its own, to decide whether the snapshot is recent enough without
+loading it.
+
+The payload is JSON holding only data: the wiki device data in the format of the wiki YAML files
+(see DeviceData.to_dict()), the updater models and the build targets in the format of their
+APIs. Loading a snapshot never runs code from the file, it skips the network and the YAML
+parsing. Snapshots with another format version are rejected, whichever liblineage version wrote
+them.
+
+Usage:
+
+.. code-block:: python
+
+    snapshot = Snapshot.load_if_fresh("catalog.snapshot", max_age=3600)
+    if snapshot is None:
+        snapshot = Snapshot(devices=DeviceDataLoader.load(...), oems=SyncV2Api.get_oems())
+        snapshot.save("catalog.snapshot")
+"""
+
+import json
+import os
+from pathlib import Path
+import struct
+from time import time
+from typing import Any, BinaryIO, Dict, List, Optional, Union
+import zlib
+
+from liblineage import __version__
+from liblineage.hudson.build_target import BuildTarget
+from liblineage.updater.json_backend import loads
+from liblineage.updater.v2.device import Device
+from liblineage.updater.v2.oem import Oem
+from liblineage.wiki.device_data import DeviceData
+
+MAGIC = b"LLSNAP\r\n"
+"""Bytes every snapshot starts with."""
+
+FORMAT_VERSION = 2
+"""Version of the snapshot format, bumped on incompatible changes."""
+
+_HEADER = struct.Struct("<8sHHd16sIQI")
+# magic, format version, reserved, created at, liblineage version, metadata size,
+# payload size, payload CRC32
+
+
+class SnapshotHeader:
+    """Header of a snapshot.
+
+    Attributes:
+    - version (int): The format version of the snapshot
+    - created_at (float): When the snapshot was created (UNIX timestamp)
+    - library_version (str): The liblineage version that created the snapshot, for information
+    - metadata (Dict[str, Any]): The metadata of the snapshot, including the number of objects
+      of every kind
+    - payload_offset (int): Offset of the payload in the file
+    - payload_size (int): Size of the payload
+    - payload_crc32 (int): CRC32 of the payload
+    """
+
+    def __init__(
+        self,
+        version: int,
+        created_at: float,
+        library_version: str,
+        metadata: Dict[str, Any],
+        payload_offset: int,
+        payload_size: int,
+        payload_crc32: int,
+    ) -> None:
+        self.version = version
+        self.created_at = created_at
+        self.library_version = library_version
+        self.metadata = metadata
+        self.payload_offset = payload_offset
+        self.payload_size = payload_size
+        self.payload_crc32 = payload_crc32
+
+    @property
+    def age(self) -> float:
+        """Time (in seconds) since the snapshot was created."""
+        return time() - self.created_at
+
+    @property
+    def is_compatible(self) -> bool:
+        """Whether this liblineage version can load the snapshot."""
+        return self.version == FORMAT_VERSION
+
+    def is_stale(self, max_age: float) -> bool:
+        """Whether the snapshot is older than max_age seconds."""
+        return self.age > max_age
+
+    @classmethod
+    def read(cls, path: Union[Path, str]) -> "SnapshotHeader":
+        """Read the header of a snapshot file, without loading its payload.
+
+        Raises ValueError if the file isn't a snapshot.
+        """
+        with open(path, "rb") as file:
+            return cls._read(file)
+
+    @classmethod
+    def _read(cls, file: BinaryIO) -> "SnapshotHeader":
+        data = file.read(_HEADER.size)
+        if len(data) < _HEADER.size or not data.startswith(MAGIC):
+            raise ValueError("Not a liblineage snapshot")
+
+        (
+            _,
+            version,
+            _,
+            created_at,
+            library_version,
+            metadata_size,
+            payload_size,
+            payload_crc32,
+        ) = _HEADER.unpack_from(data)
+
+        metadata = json.loads(file.read(metadata_size))
+
+        return cls(
+            version,
+            created_at,
+            library_version.rstrip(b"\0").decode(),
+            metadata,
+            _HEADER.size + metadata_size,
+            payload_size,
+            payload_crc32,
+        )
+
+
+class Snapshot:
+    """A snapshot of the device catalog.
+
+    Attributes:
+    - devices (Dict[str, DeviceData]): The wiki device data, by device name
+    - oems (List[Oem]): The v2 OEMs
+    - v2_devices (Dict[str, Device]): The v2 devices, by name
+    - build_targets (List[BuildTarget]): The Hudson build targets
+    - created_at (float): When the snapshot was created (UNIX timestamp)
+    """
+
+    def __init__(
+        self,
+        devices: Optional[Dict[str, DeviceData]] = None,
+        oems: Optional[List[Oem]] = None,
+        v2_devices: Optional[Dict[str, Device]] = None,
+        build_targets: Optional[List[BuildTarget]] = None,
+        created_at: Optional[float] = None,
+    ) -> None:
+        self.devices = devices or {}
+        self.oems = oems or []
+        self.v2_devices = v2_devices or {}
+        self.build_targets = build_targets or []
+        self.created_at = time() if created_at is None else created_at
+
+    @property
+    def age(self) -> float:
+        """Time (in seconds) since the snapshot was created."""
+        return time() - self.created_at
+
+    def save(self, path: Union[Path, str]) -> None:
+        """Save the snapshot, atomically replacing the file if it exists."""
+        path = Path(path)
+
+        payload = json.dumps(
+            {
+                "devices": {name: device.to_dict() for name, device in self.devices.items()},
+                "oems": [oem.to_json() for oem in self.oems],
+                "v2_devices": {name: device.to_json() for name, device in self.v2_devices.items()},
+                "build_targets": [target.to_api() for target in self.build_targets],
+            },
+            separators=(",", ":"),
+        ).encode()
+        metadata = json.dumps(
+            {
+                "devices": len(self.devices),
+                "oems": len(self.oems),
+                "v2_devices": len(self.v2_devices),
+                "build_targets": len(self.build_targets),
+            }
+        ).encode()
+        header = _HEADER.pack(
+            MAGIC,
+            FORMAT_VERSION,
+            0,
+            self.created_at,
+            __version__.encode(),
+            len(metadata),
+            len(payload),
+            zlib.crc32(payload),
+        )
+
+        tmp_path = path.with_name(f"{path.name}.tmp")
+        with open(tmp_path, "wb") as file:
+            file.write(header)
+            file.write(metadata)
+            file.write(payload)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: Union[Path, str]) -> "Snapshot":
+        """Load a snapshot.
+
+        Raises ValueError if the file isn't a snapshot, is corrupted or has another format
+        version (see SnapshotHeader.is_compatible).
+        """
+        with open(path, "rb") as file:
+            header = SnapshotHeader._read(file)
+            if not header.is_compatible:
+                raise ValueError(
+                    f"Snapshot format {header.version} from liblineage {header.library_version} "
+                    f"isn't supported, expected format {FORMAT_VERSION}"
+                )
+
+            payload = file.read(header.payload_size)
+
+        if len(payload) < header.payload_size:
+            raise ValueError("Truncated snapshot")
+        if zlib.crc32(payload) != header.payload_crc32:
+            raise ValueError("Corrupted snapshot")
+
+        try:
+            data = loads(payload)
+            devices = {
+                name: DeviceData.from_dict(device) for name, device in data["devices"].items()
+            }
+            oems = [Oem.from_json(oem) for oem in data["oems"]]
+            v2_devices = {
+                name: Device.from_json(device) for name, device in data["v2_devices"].items()
+            }
+            build_targets = [BuildTarget.from_api(line) for line in data["build_targets"]]
+        except (KeyError, TypeError, AttributeError, IndexError) as e:
+            raise ValueError(f"Invalid snapshot payload: {e!r}") from e
+
+        return cls(devices, oems, v2_devices, build_targets, header.created_at)
+
+    @classmethod
+    def load_if_fresh(cls, path: Union[Path, str], max_age: float) -> Optional["Snapshot"]:
+        """Load a snapshot if it exists, is compatible and is at most max_age seconds old.
+
+        Returns None otherwise, so that the caller can fetch the data and save a new snapshot.
+        """
+        try:
+            header = SnapshotHeader.read(path)
+            if not header.is_compatible or header.is_stale(max_age):
+                return None
+
+            return cls.load(path)
+        except (OSError, ValueError):
+            return None
@@ -0,0 +1,459 @@
+#
+# SPDX-FileCopyrightText: The LineageOS Project
+# SPDX-License-Identifier: LGPL-3.0-or-later
+#
+
+import asyncio
+from contextlib import contextmanager
+from datetime import date
+import hashlib
+import json
+from pathlib import Path
+from random import Random
+from threading import Thread
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from aiohttp import web
+
+from liblineage.constants.infra import DOMAIN
+from liblineage.updater import BASE_API_URL
+from liblineage.updater.http_utils import AsyncHttpClient, AsyncHttpRequests
+
+FAKE_FILES_URL = f"https://mirrorbits.{DOMAIN}"
+"""Base URL of the generated build files, served by the fake server under the same path."""
+
+FILE_BLOCK_SIZE = 64 * 1024
+"""Size of the block repeated to make up the content of the build files (bytes)."""
+
+_OEMS = ["Google", "OnePlus", "Samsung", "Xiaomi", "Motorola", "Fairphone", "Sony"]
+_VERSIONS = ["18.1", "19.1", "20.0", "21.0", "22.1", "22.2"]
+_FILE_NAMES = ["boot.img", "dtbo.img", "vendor_boot.img", "recovery.img"]
+
+
+class FakeUpdaterData:
+    """Data served by FakeUpdater, in the v2 API format.
+
+    The v1 API responses are derived from it.
+
+    Attributes:
+    - oems (List[Dict[str, Any]]): The OEMs, as returned by /v2/oems
+    - devices (Dict[str, Dict[str, Any]]): Dictionary of device codename to its information,
+      as returned by /v2/devices/{device}
+    - builds (Dict[str, List[Dict[str, Any]]]): Dictionary of device codename to its builds,
+      as returned by /v2/devices/{device}/builds
+    """
+
+    def __init__(
+        self,
+        oems: List[Dict[str, Any]],
+        devices: Dict[str, Dict[str, Any]],
+        builds: Dict[str, List[Dict[str, Any]]],
+    ) -> None:
+        self.oems = oems
+        self.devices = devices
+        self.builds = builds
+
+    @classmethod
+    def from_json(cls, json: Dict[str, Any]):
+        """Create an object from a JSON object."""
+        return cls(json["oems"], json["devices"], json["builds"])
+
+    def to_json(self) -> Dict[str, Any]:
+        """Convert the object to a JSON object."""
+        return {
+            "oems": self.oems,
+            "devices": self.devices,
+            "builds": self.builds,
+        }
+
+    @classmethod
+    def load(cls, path: Union[Path, str]) -> "FakeUpdaterData":
+        """Load data saved with save()."""
+        return cls.from_json(json.loads(Path(path).read_text()))
+
+    def save(self, path: Union[Path, str]) -> None:
+        """Save the data, e.g. after recording it."""
+        Path(path).write_text(json.dumps(self.to_json()))
+
+    @classmethod
+    def generate(
+        cls,
+        devices: int = 10,
+        builds_per_device: int = 30,
+        files_per_build: int = 1,
+        file_size: int = 1024 * 1024,
+        seed: int = 0,
+    ) -> "FakeUpdaterData":
+        """Generate reproducible data.
+
+        All the build files have the same content (see get_file_content()), so that their hashes
+        are only computed once and the downloads can be verified.
+
+        Args:
+        - devices (int): Number of devices
+        - builds_per_device (int): Number of builds of each device
+        - files_per_build (int): Number of files of each build, the first one being the OTA zip
+        - file_size (int): Size of every build file, in bytes
+        - seed (int): Seed of the random generator
+        """
+        random = Random(seed)
+
+        sha1_hash = hashlib.sha1()
+        sha256_hash = hashlib.sha256()
+        for offset in range(0, file_size, FILE_BLOCK_SIZE):
+            chunk = get_file_content(offset, min(file_size - offset, FILE_BLOCK_SIZE))
+            sha1_hash.update(chunk)
+            sha256_hash.update(chunk)
+        sha1 = sha1_hash.hexdigest()
+        sha256 = sha256_hash.hexdigest()
+
+        oems: Dict[str, List[Dict[str, Any]]] = {}
+        devices_json = {}
+        builds = {}
+
+        for index in range(devices):
+            oem = random.choice(_OEMS)
+            codename = f"device{index}"
+            versions = sorted(random.sample(_VERSIONS, random.randint(1, 3)))
+
+            oems.setdefault(oem, []).append({"name": f"{oem} Phone {index}", "model": codename})
+            devices_json[codename] = {
+                "name": f"{oem} Phone {index}",
+                "model": codename,
+                "oem": oem,
+                "info_url": f"https://wiki.{DOMAIN}/devices/{codename}",
+                "versions": versions,
+                "dependencies": [f"android_device_{oem.lower()}_{codename}"],
+            }
+
+            # Weekly builds, newest first
+            timestamp = 1735689600 - random.randint(0, 6) * 86400
+            device_builds = []
+            for _ in range(builds_per_device):
+                day = date.fromtimestamp(timestamp).isoformat()
+                compact_day = day.replace("-", "")
+                version = versions[-1]
+
+                names = [f"lineage-{version}-{compact_day}-nightly-{codename}-signed.zip"]
+                names += _FILE_NAMES[: files_per_build - 1]
+
+                device_builds.append(
+                    {
+                        "date": day,
+                        "datetime": timestamp,
+                        "files": [
+                            {
+                                "filename": name,
+                                "filepath": f"/full/{codename}/{compact_day}/{name}",
+                                "sha1": sha1,
+                                "sha256": sha256,
+                                "size": file_size,
+                                "url": f"{FAKE_FILES_URL}/full/{codename}/{compact_day}/{name}",
+                            }
+                            for name in names
+                        ],
+                        "os_patch_level": day[:7],
+                        "type": "nightly",
+                        "version": version,
+                    }
+                )
+                timestamp -= 7 * 86400
+
+            builds[codename] = device_builds
+
+        oems_json = [{"name": name, "devices": devices} for name, devices in sorted(oems.items())]
+
+        return cls(oems_json, devices_json, builds)
+
+    @classmethod
+    async def record(
+        cls, devices: Iterable[str], client: Optional[AsyncHttpClient] = None
+    ) -> "FakeUpdaterData":
+        """Record the data of some devices from the real API.
+
+        The build files aren't recorded, the fake server serves generated content for them,
+        which doesn't match their hashes.
+        """
+        api_url = f"{BASE_API_URL}/v2"
+
+        oems = await AsyncHttpRequests.get_json(f"{api_url}/oems", client=client)
+
+        devices_json = {}
+        builds = {}
+        for device in devices:
+            devices_json[device] = await AsyncHttpRequests.get_json(
+                f"{api_url}/devices/{device}", client=client
+            )
+            builds[device] = await AsyncHttpRequests.get_json(
+                f"{api_url}/devices/{device}/builds", client=client
+            )
+
+        return cls(oems, devices_json, builds)
+
+
+class FakeUpdater:
+    """Local stand-in for the LineageOS updater API, built on aiohttp.web.
+
+    It serves the v1 and v2 API and the build files (with Range support) from the given data,
+    with configurable latency and error rate. Use base_urls with the HTTP clients to point the
+    APIs at it.
+
+    Usage:
+
+    .. code-block:: python
+
+        async with FakeUpdater(FakeUpdaterData.generate(devices=100), latency=0.05) as server:
+            async with AsyncHttpClient(base_urls=server.base_urls) as client:
+                builds = await AsyncV2Api.get_device_builds("device0", client=client)
+
+        # For synchronous clients, the server runs in a separate thread
+        with FakeUpdater().serve_in_thread() as server:
+            with SyncHttpClient(base_urls=server.base_urls) as client:
+                builds = SyncV2Api.get_device_builds("device0", client=client)
+
+    Attributes:
+    - data (FakeUpdaterData): The data served
+    - latency (float): Time (in seconds) every response is delayed by
+    - jitter (float): Maximum random time (in seconds) added to the latency
+    - error_rate (float): Probability (0 to 1) of replying with 503 Service Unavailable
+    - requests (int): Number of requests received
+    - errors (int): Number of requests failed because of the error rate
+    """
+
+    def __init__(
+        self,
+        data: Optional[FakeUpdaterData] = None,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        seed: int = 0,
+    ) -> None:
+        """Initialize the server.
+
+        Args:
+        - data (Optional[FakeUpdaterData]): The data to serve, generated with the default
+          parameters if not set
+        - latency (float): Time (in seconds) every response is delayed by
+        - jitter (float): Maximum random time (in seconds) added to the latency
+        - error_rate (float): Probability (0 to 1) of replying with 503 Service Unavailable
+        - seed (int): Seed of the random generator used for jitter and errors
+        """
+        self.data = data if data is not None else FakeUpdaterData.generate()
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+
+        self.requests = 0
+        self.errors = 0
+
+        self._random = Random(seed)
+        self._runner: Optional[web.AppRunner] = None
+        self._url: Optional[str] = None
+
+        # Responses are serialized once, so that the server isn't the bottleneck
+        self._responses: Dict[Tuple[str, ...], bytes] = {}
+        self._files: Dict[str, int] = {
+            file["filepath"]: file["size"]
+            for builds in self.data.builds.values()
+            for build in builds
+            for file in build["files"]
+        }
+
+        self.app = web.Application(middlewares=[self._middleware])
+        self.app.router.add_get("/api/v1/devices", self._v1_devices)
+        self.app.router.add_get("/api/v1/types/{device}", self._v1_types)
+        self.app.router.add_get("/api/v1/{device}/{romtype}/{incremental}", self._v1_builds)
+        self.app.router.add_get("/api/v2/oems", self._v2_oems)
+        self.app.router.add_get("/api/v2/devices/{device}", self._v2_device)
+        self.app.router.add_get("/api/v2/devices/{device}/builds", self._v2_builds)
+        self.app.router.add_get("/{filepath:.+}", self._file)
+
+    async def __aenter__(self) -> "FakeUpdater":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *args: Any) -> None:
+        await self.stop()
+
+    @property
+    def url(self) -> str:
+        """Base URL of the running server."""
+        if self._url is None:
+            raise RuntimeError("The server isn't running")
+
+        return self._url
+
+    @property
+    def base_urls(self) -> Dict[str, str]:
+        """base_urls for the HTTP clients, to point them at this server."""
+        return {
+            BASE_API_URL: f"{self.url}/api",
+            FAKE_FILES_URL: self.url,
+        }
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        """Start the server, on a random free port by default.
+
+        Returns the base URL of the server.
+        """
+        self._runner = web.AppRunner(self.app, access_log=None)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, host, port).start()
+
+        address = self._runner.addresses[0]
+        self._url = f"http://{address[0]}:{address[1]}"
+
+        return self._url
+
+    async def stop(self) -> None:
+        """Stop the server."""
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+            self._url = None
+
+    @contextmanager
+    def serve_in_thread(self, host: str = "127.0.0.1", port: int = 0) -> Iterator["FakeUpdater"]:
+        """Run the server in a separate thread with its own event loop, for synchronous code."""
+        loop = asyncio.new_event_loop()
+        loop.run_until_complete(self.start(host, port))
+
+        thread = Thread(target=loop.run_forever, daemon=True)
+        thread.start()
+
+        try:
+            yield self
+        finally:
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join()
+
+            loop.run_until_complete(self.stop())
+            loop.close()
+
+    @web.middleware
+    async def _middleware(self, request: web.Request, handler: Any) -> web.StreamResponse:
+        self.requests += 1
+
+        delay = self.latency + self._random.uniform(0, self.jitter)
+        if delay:
+            await asyncio.sleep(delay)
+
+        if self.error_rate and self._random.random() < self.error_rate:
+            self.errors += 1
+            raise web.HTTPServiceUnavailable()
+
+        return await handler(request)
+
+    def _json_response(self, key: Tuple[str, ...], get_json: Any) -> web.Response:
+        body = self._responses.get(key)
+        if body is None:
+            body = self._responses[key] = json.dumps(get_json()).encode()
+
+        return web.Response(body=body, content_type="application/json")
+
+    def _get_builds(self, request: web.Request) -> List[Dict[str, Any]]:
+        try:
+            return self.data.builds[request.match_info["device"]]
+        except KeyError:
+            raise web.HTTPNotFound() from None
+
+    async def _v1_devices(self, request: web.Request) -> web.Response:
+        def get_json() -> Dict[str, List[str]]:
+            versions: Dict[str, List[str]] = {}
+            for device, device_json in self.data.devices.items():
+                for version in device_json["versions"]:
+                    versions.setdefault(version, []).append(device)
+
+            return versions
+
+        return self._json_response(("v1", "devices"), get_json)
+
+    async def _v1_types(self, request: web.Request) -> web.Response:
+        builds = self._get_builds(request)
+
+        return self._json_response(
+            ("v1", "types", request.match_info["device"]),
+            lambda: {"response": sorted({build["type"] for build in builds})},
+        )
+
+    async def _v1_builds(self, request: web.Request) -> web.Response:
+        builds = self._get_builds(request)
+        romtype = request.match_info["romtype"]
+
+        def get_json() -> Dict[str, List[Dict[str, Any]]]:
+            return {
+                "response": [
+                    {
+                        "datetime": build["datetime"],
+                        "filename": build["files"][0]["filename"],
+                        "id": build["files"][0]["sha256"],
+                        "romtype": build["type"],
+                        "size": build["files"][0]["size"],
+                        "url": build["files"][0]["url"],
+                        "version": build["version"],
+                    }
+                    for build in builds
+                    if build["type"] == romtype
+                ]
+            }
+
+        return self._json_response(
+            ("v1", "builds", request.match_info["device"], romtype), get_json
+        )
+
+    async def _v2_oems(self, request: web.Request) -> web.Response:
+        return self._json_response(("v2", "oems"), lambda: self.data.oems)
+
+    async def _v2_device(self, request: web.Request) -> web.Response:
+        device = request.match_info["device"]
+        if device not in self.data.devices:
+            raise web.HTTPNotFound()
+
+        return self._json_response(("v2", "device", device), lambda: self.data.devices[device])
+
+    async def _v2_builds(self, request: web.Request) -> web.Response:
+        builds = self._get_builds(request)
+
+        return self._json_response(("v2", "builds", request.match_info["device"]), lambda: builds)
+
+    async def _file(self, request: web.Request) -> web.StreamResponse:
+        filepath = f"/{request.match_info['filepath']}"
+
+        size = self._files.get(filepath)
+        if size is None:
+            raise web.HTTPNotFound()
+
+        start, stop, _ = request.http_range.indices(size)
+        partial = "Range" in request.headers
+        if partial and start >= stop:
+            raise web.HTTPRequestRangeNotSatisfiable(headers={"Content-Range": f"bytes */{size}"})
+
+        response = web.StreamResponse(status=206 if partial else 200)
+        response.content_length = stop - start
+        response.headers["Accept-Ranges"] = "bytes"
+        if partial:
+            response.headers["Content-Range"] = f"bytes {start}-{stop - 1}/{size}"
+        await response.prepare(request)
+
+        while start < stop:
+            chunk = get_file_content(start, min(stop - start, FILE_BLOCK_SIZE))
+            await response.write(chunk)
+            start += len(chunk)
+
+        await response.write_eof()
+
+        return response
+
+
+_FILE_BLOCK = Random(0).getrandbits(FILE_BLOCK_SIZE * 8).to_bytes(FILE_BLOCK_SIZE, "little")
+
+
+def get_file_content(offset: int, size: int) -> bytes:
+    """Get the content of the build files served by FakeUpdater, from offset for size bytes.
+
+    Every file is made of the same random block repeated.
+    """
+    start = offset % FILE_BLOCK_SIZE
+    repeats = (start + size) // FILE_BLOCK_SIZE + 1
+
+    return (_FILE_BLOCK * repeats)[start : start + size]
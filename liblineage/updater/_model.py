@@ -0,0 +1,52 @@
+#
+# SPDX-FileCopyrightText: The LineageOS Project
+# SPDX-License-Identifier: LGPL-3.0-or-later
+#
+
+from typing import Any, ClassVar, Tuple
+
+
+class Model:
+    """Base class for the updater API models.
+
+    Subclasses store their attributes in __slots__, so that instances don't carry a __dict__,
+    and get equality, hashing and repr based on their public attributes (_fields).
+
+    Lists are hashed as tuples, so don't modify an object while it's used as a set member or
+    dictionary key.
+    """
+
+    __slots__ = ()
+
+    _fields: ClassVar[Tuple[str, ...]] = ()
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+
+        if "_fields" not in cls.__dict__:
+            cls._fields = tuple(slot for slot in cls.__slots__ if not slot.startswith("_"))
+
+    def _values(self) -> Tuple[Any, ...]:
+        return tuple(getattr(self, field) for field in self._fields)
+
+    def __eq__(self, other: object) -> bool:
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+
+        assert isinstance(other, Model)
+
+        return self._values() == other._values()
+
+    def __hash__(self) -> int:
+        return hash(tuple(_to_hashable(value) for value in self._values()))
+
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{field}={getattr(self, field)!r}" for field in self._fields)
+        return f"{self.__class__.__name__}({fields})"
+
+
+def _to_hashable(value: Any) -> Any:
+    if isinstance(value, list):
+        return tuple(_to_hashable(item) for item in value)
+
+    return value
@@ -0,0 +1,552 @@
+#
+# SPDX-FileCopyrightText: The LineageOS Project
+# SPDX-License-Identifier: LGPL-3.0-or-later
+#
+
+import asyncio
+from concurrent.futures import FIRST_EXCEPTION, ThreadPoolExecutor, wait
+import json
+import os
+from pathlib import Path
+from threading import Event, Lock
+from time import monotonic
+from typing import Any, BinaryIO, Callable, Dict, List, Optional, Union
+
+from liblineage.updater.http_utils import DEFAULT_CHUNK_SIZE, AsyncHttpClient, SyncHttpClient
+from liblineage.updater.v2.build_file import BuildFile
+from liblineage.updater.verify import BuildFileHasher, BuildFileVerifier
+
+DEFAULT_SEGMENTS = 4
+"""Default number of segments downloaded concurrently."""
+
+MIN_SEGMENT_SIZE = 8 * 1024 * 1024
+"""Minimum size of a segment (bytes), smaller files are split in less segments."""
+
+STATE_SAVE_INTERVAL = 1.0
+"""Minimum time (in seconds) between two saves of the download state."""
+
+WRITE_BUFFER_SIZE = 1024 * 1024
+"""Size of the data of a segment buffered in memory before it's written to disk (bytes)."""
+
+PART_SUFFIX = ".part"
+"""Suffix of the file being downloaded, renamed once complete."""
+
+STATE_SUFFIX = ".part.json"
+"""Suffix of the file storing the progress of a download, to resume it."""
+
+ProgressCallback = Callable[[int, int], None]
+"""Called with the number of bytes downloaded so far and the total size."""
+
+
+class DownloadSegment:
+    """A byte range of a file, downloaded with its own request.
+
+    Attributes:
+    - start (int): The offset of the first byte of the segment
+    - end (int): The offset after the last byte of the segment
+    - downloaded (int): The number of bytes of the segment already written to disk
+    """
+
+    def __init__(self, start: int, end: int, downloaded: int = 0) -> None:
+        self.start = start
+        self.end = end
+        self.downloaded = downloaded
+
+    @classmethod
+    def from_json(cls, json: Dict[str, Any]):
+        """Create an object from a JSON object."""
+        return cls(json["start"], json["end"], json["downloaded"])
+
+    def to_json(self) -> Dict[str, Any]:
+        """Convert the object to a JSON object."""
+        return {
+            "start": self.start,
+            "end": self.end,
+            "downloaded": self.downloaded,
+        }
+
+    @property
+    def offset(self) -> int:
+        """Offset of the next byte to download."""
+        return self.start + self.downloaded
+
+    @property
+    def remaining(self) -> int:
+        """Number of bytes left to download."""
+        return self.end - self.offset
+
+    @property
+    def range_header(self) -> str:
+        """Value of the Range header requesting the remaining bytes."""
+        return f"bytes={self.offset}-{self.end - 1}"
+
+
+class DownloadState:
+    """Progress of a download, saved next to it so that it can be resumed after an interruption.
+
+    Attributes:
+    - url (str): The URL of the file
+    - size (int): The size of the file, in bytes
+    - sha256 (str): The SHA256 hash of the file, to tell apart different files at the same URL
+    - segments (List[DownloadSegment]): The segments of the file
+    """
+
+    def __init__(self, url: str, size: int, sha256: str, segments: List[DownloadSegment]) -> None:
+        self.url = url
+        self.size = size
+        self.sha256 = sha256
+        self.segments = segments
+
+    @classmethod
+    def from_json(cls, json: Dict[str, Any]):
+        """Create an object from a JSON object."""
+        return cls(
+            json["url"],
+            json["size"],
+            json["sha256"],
+            [DownloadSegment.from_json(segment) for segment in json["segments"]],
+        )
+
+    def to_json(self) -> Dict[str, Any]:
+        """Convert the object to a JSON object."""
+        return {
+            "url": self.url,
+            "size": self.size,
+            "sha256": self.sha256,
+            "segments": [segment.to_json() for segment in self.segments],
+        }
+
+    @classmethod
+    def from_build_file(cls, build_file: BuildFile, segments: int):
+        """Create the initial state of a download, splitting the file in segments.
+
+        The number of segments is lowered so that they're at least MIN_SEGMENT_SIZE long.
+        """
+        size = build_file.size
+        count = max(1, min(segments, size // MIN_SEGMENT_SIZE))
+
+        # An empty file has no segments
+        bounds = [size * i // count for i in range(count + 1)] if size else [0]
+
+        return cls(
+            build_file.url,
+            size,
+            build_file.sha256,
+            [DownloadSegment(start, end) for start, end in zip(bounds, bounds[1:])],
+        )
+
+    @classmethod
+    def load(cls, path: Path) -> Optional["DownloadState"]:
+        """Load a saved state, None if missing or unreadable."""
+        try:
+            return cls.from_json(json.loads(path.read_text()))
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def save(self, path: Path) -> None:
+        """Save the state, atomically replacing the previous one."""
+        tmp_path = path.with_name(f"{path.name}.tmp")
+        tmp_path.write_text(json.dumps(self.to_json()))
+        os.replace(tmp_path, path)
+
+    @property
+    def downloaded(self) -> int:
+        """Number of bytes already written to disk."""
+        return sum(segment.downloaded for segment in self.segments)
+
+    def matches(self, build_file: BuildFile) -> bool:
+        """Whether this state belongs to a download of the given file."""
+        return (
+            self.url == build_file.url
+            and self.size == build_file.size
+            and self.sha256 == build_file.sha256
+        )
+
+
+class AsyncDownloader:
+    """Asynchronous downloader of build files.
+
+    Files are split in segments downloaded concurrently with HTTP Range requests, written in
+    place into a preallocated <dest>.part file. The progress is regularly saved to
+    <dest>.part.json, so an interrupted download resumes from where it stopped. Once complete,
+    the file is verified against the size and hashes of the build file and renamed to its
+    destination.
+
+    A file downloaded with a single request is hashed while it's written, otherwise it's hashed
+    from disk once complete (see BuildFileVerifier).
+
+    Files from servers not supporting Range requests, and files not larger than
+    MIN_SEGMENT_SIZE, are downloaded with a single request instead, which can't be resumed.
+
+    Usage:
+
+    .. code-block:: python
+
+        builds = await AsyncV2Api.get_device_builds("lemonadep")
+        await AsyncDownloader.download(builds[0].ota_zip, "ota.zip", segments=8)
+    """
+
+    @staticmethod
+    async def download(
+        build_file: BuildFile,
+        dest: Union[Path, str],
+        segments: int = DEFAULT_SEGMENTS,
+        client: Optional[AsyncHttpClient] = None,
+        progress: Optional[ProgressCallback] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        verify: bool = True,
+    ) -> Path:
+        """Download a build file.
+
+        Args:
+        - build_file (BuildFile): The file to download
+        - dest (Union[Path, str]): The destination path
+        - segments (int): Maximum number of segments downloaded concurrently
+        - client (Optional[AsyncHttpClient]): The client used for the requests
+        - progress (Optional[ProgressCallback]): Called on the event loop after every block
+          written to disk
+        - chunk_size (int): Size of the chunks read from the responses (bytes)
+        - verify (bool): Whether to verify the file once downloaded
+
+        Returns the destination path.
+        Raises aiohttp.ClientError on network errors, ValueError if the server sends unexpected
+        data. The partial download is kept to be resumed in both cases, unless the complete file
+        fails the verification.
+        """
+        if client is None:
+            async with AsyncHttpClient(limit_per_host=segments) as owned_client:
+                return await AsyncDownloader.download(
+                    build_file, dest, segments, owned_client, progress, chunk_size, verify
+                )
+
+        # Disk I/O (writes, fsync, hashing) runs in the default executor, so that it doesn't
+        # block the event loop, progress is dispatched back to the loop
+        loop = asyncio.get_running_loop()
+        download = _Download(build_file, Path(dest), segments, progress, verify, loop)
+
+        # Files fitting in a single segment aren't worth an extra request
+        ranges = build_file.size > MIN_SEGMENT_SIZE and await AsyncDownloader._supports_ranges(
+            client, build_file.url
+        )
+        pending = await loop.run_in_executor(None, download.prepare, ranges)
+        url = client.resolve_url(build_file.url)
+
+        async def fetch(segment: DownloadSegment) -> None:
+            headers = {"Range": segment.range_header} if ranges else {}
+
+            async with await client.request(url, stream=True, headers=headers) as resp:
+                resp.raise_for_status()
+                if ranges and resp.status != 206:
+                    raise ValueError(f"Range request ignored by the server for {build_file.url}")
+
+                with download.open(segment) as writer:
+                    async for chunk in resp.content.iter_chunked(chunk_size):
+                        if writer.append(chunk):
+                            await loop.run_in_executor(None, writer.flush)
+                    await loop.run_in_executor(None, writer.flush)
+
+        tasks = [asyncio.ensure_future(fetch(segment)) for segment in pending]
+        try:
+            await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+            await loop.run_in_executor(None, download.save)
+
+        return await loop.run_in_executor(None, download.finish)
+
+    @staticmethod
+    async def _supports_ranges(client: AsyncHttpClient, url: str) -> bool:
+        # The body isn't read, a server ignoring the range just gets the connection closed
+        async with await client.request(
+            client.resolve_url(url), stream=True, headers={"Range": "bytes=0-0"}
+        ) as resp:
+            resp.raise_for_status()
+            return resp.status == 206
+
+
+class SyncDownloader:
+    """Synchronous downloader of build files, segments are downloaded by a thread pool.
+
+    See AsyncDownloader for details.
+    """
+
+    @staticmethod
+    def download(
+        build_file: BuildFile,
+        dest: Union[Path, str],
+        segments: int = DEFAULT_SEGMENTS,
+        client: Optional[SyncHttpClient] = None,
+        progress: Optional[ProgressCallback] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        verify: bool = True,
+    ) -> Path:
+        """Download a build file.
+
+        The arguments are the same as AsyncDownloader.download(), progress is called from the
+        worker threads.
+
+        Returns the destination path.
+        Raises requests.RequestException on network errors, ValueError if the server sends
+        unexpected data. The partial download is kept to be resumed in both cases, unless the
+        complete file fails the verification.
+        """
+        if client is None:
+            with SyncHttpClient(limit_per_host=segments) as owned_client:
+                return SyncDownloader.download(
+                    build_file, dest, segments, owned_client, progress, chunk_size, verify
+                )
+
+        download = _Download(build_file, Path(dest), segments, progress, verify)
+
+        ranges = build_file.size > MIN_SEGMENT_SIZE and SyncDownloader._supports_ranges(
+            client, build_file.url
+        )
+        pending = download.prepare(ranges)
+        url = client.resolve_url(build_file.url)
+
+        def fetch(segment: DownloadSegment) -> None:
+            headers = {"Range": segment.range_header} if ranges else {}
+
+            with client.request(url, stream=True, headers=headers) as resp:
+                resp.raise_for_status()
+                if ranges and resp.status_code != 206:
+                    raise ValueError(f"Range request ignored by the server for {build_file.url}")
+
+                with download.open(segment) as writer:
+                    for chunk in resp.iter_content(chunk_size):
+                        if writer.append(chunk):
+                            writer.flush()
+                    writer.flush()
+
+        if pending:
+            with ThreadPoolExecutor(max_workers=len(pending)) as executor:
+                futures = [executor.submit(fetch, segment) for segment in pending]
+                try:
+                    wait(futures, return_when=FIRST_EXCEPTION)
+                finally:
+                    # Threads can't be cancelled, they stop at their next chunk
+                    download.abort()
+                    wait(futures)
+
+                    download.save()
+
+                # Raise the error that caused the abort, not the ones caused by it
+                errors = [future.exception() for future in futures]
+                for error in errors:
+                    if error is not None and not isinstance(error, _DownloadAborted):
+                        raise error
+
+        return download.finish()
+
+    @staticmethod
+    def _supports_ranges(client: SyncHttpClient, url: str) -> bool:
+        with client.request(
+            client.resolve_url(url), stream=True, headers={"Range": "bytes=0-0"}
+        ) as resp:
+            resp.raise_for_status()
+            return resp.status_code == 206
+
+
+class _DownloadAborted(Exception):
+    pass
+
+
+class _Download:
+    # State of a download in progress, shared by the sync and async downloaders
+
+    def __init__(
+        self,
+        build_file: BuildFile,
+        dest: Path,
+        segments: int,
+        progress: Optional[ProgressCallback],
+        verify: bool,
+        loop: Optional[asyncio.AbstractEventLoop] = None,
+    ) -> None:
+        self.build_file = build_file
+        self.dest = dest
+        self.part_path = dest.with_name(f"{dest.name}{PART_SUFFIX}")
+        self.state_path = dest.with_name(f"{dest.name}{STATE_SUFFIX}")
+        self.segments = segments
+        self.progress = progress
+        self.verify = verify
+        # Set for the async downloader, progress is then called on the event loop
+        self.loop = loop
+
+        # Set when the whole file is downloaded sequentially, so it can be hashed on the fly
+        self.hasher: Optional[BuildFileHasher] = None
+
+        self.state = DownloadState.from_build_file(build_file, segments)
+
+        self._lock = Lock()
+        self._aborted = Event()
+        self._downloaded = 0
+        self._saved_at = 0.0
+
+    def prepare(self, ranges: bool) -> List[DownloadSegment]:
+        """Resume the saved download if possible, start a new one otherwise.
+
+        Returns the segments left to download.
+        """
+        state = DownloadState.load(self.state_path) if ranges else None
+
+        if (
+            state is None
+            or not state.matches(self.build_file)
+            or not self.part_path.is_file()
+            or self.part_path.stat().st_size != self.build_file.size
+        ):
+            state = DownloadState.from_build_file(self.build_file, self.segments if ranges else 1)
+            self._preallocate()
+
+        self.state = state
+        self._downloaded = state.downloaded
+        self.save()
+
+        if self.verify and len(state.segments) == 1 and state.segments[0].downloaded == 0:
+            self.hasher = BuildFileHasher(self.build_file)
+
+        self._report_progress(self._downloaded)
+
+        return [segment for segment in state.segments if segment.remaining > 0]
+
+    def open(self, segment: DownloadSegment) -> "_SegmentWriter":
+        return _SegmentWriter(self, segment)
+
+    def written(self, segment: DownloadSegment, size: int) -> None:
+        # Called once data of a segment is written to the part file
+        with self._lock:
+            segment.downloaded += size
+            self._downloaded += size
+            downloaded = self._downloaded
+
+            if monotonic() - self._saved_at >= STATE_SAVE_INTERVAL:
+                self._save()
+
+            if self.loop is not None:
+                # Scheduled under the lock, so that the loop gets the calls in order
+                self._report_progress(downloaded)
+
+        if self.loop is None:
+            self._report_progress(downloaded)
+
+    def _report_progress(self, downloaded: int) -> None:
+        if self.progress is None:
+            return
+
+        if self.loop is not None:
+            self.loop.call_soon_threadsafe(self.progress, downloaded, self.build_file.size)
+        else:
+            self.progress(downloaded, self.build_file.size)
+
+    def check_aborted(self) -> None:
+        if self._aborted.is_set():
+            raise _DownloadAborted()
+
+    def abort(self) -> None:
+        self._aborted.set()
+
+    def save(self) -> None:
+        with self._lock:
+            self._save()
+
+    def finish(self) -> Path:
+        if self._downloaded != self.build_file.size:
+            raise ValueError(
+                f"Incomplete download of {self.build_file.url}: "
+                f"{self._downloaded}/{self.build_file.size} bytes"
+            )
+
+        if self.verify:
+            try:
+                if self.hasher is not None:
+                    self.hasher.verify()
+                else:
+                    BuildFileVerifier.verify(self.build_file, self.part_path)
+            except ValueError:
+                # The data is corrupted, don't resume from it
+                self.part_path.unlink(missing_ok=True)
+                self.state_path.unlink(missing_ok=True)
+                raise
+
+        os.replace(self.part_path, self.dest)
+        self.state_path.unlink(missing_ok=True)
+
+        return self.dest
+
+    def _save(self) -> None:
+        # The data must be on disk before the state saying it's there, so that a crash never
+        # leaves a state trusting bytes that were lost
+        fd = os.open(self.part_path, os.O_RDWR)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+        self.state.save(self.state_path)
+        self._saved_at = monotonic()
+
+    def _preallocate(self) -> None:
+        with open(self.part_path, "wb") as file:
+            size = self.build_file.size
+            if size and hasattr(os, "posix_fallocate"):
+                try:
+                    os.posix_fallocate(file.fileno(), 0, size)
+                    return
+                except OSError:
+                    # Not supported by the filesystem
+                    pass
+
+            file.truncate(size)
+
+
+class _SegmentWriter:
+    # Buffers the data of a segment in memory and writes it to the part file in big blocks,
+    # append() is cheap enough to run on the event loop, flush() does the hashing and disk I/O
+
+    def __init__(self, download: _Download, segment: DownloadSegment) -> None:
+        self.download = download
+        self.segment = segment
+        self.buffer = bytearray()
+
+        self.file: BinaryIO = open(download.part_path, "r+b", buffering=0)
+        self.file.seek(segment.offset)
+
+    def __enter__(self) -> "_SegmentWriter":
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        # Data still buffered after an error is dropped, it's downloaded again on resume
+        self.file.close()
+
+    def append(self, chunk: bytes) -> bool:
+        """Buffer a chunk, returns whether the buffer should be flushed."""
+        self.download.check_aborted()
+
+        if len(self.buffer) + len(chunk) > self.segment.remaining:
+            raise ValueError(
+                f"Server sent more data than requested for {self.download.build_file.url}"
+            )
+
+        self.buffer += chunk
+        return len(self.buffer) >= WRITE_BUFFER_SIZE
+
+    def flush(self) -> None:
+        """Write the buffered data to the part file."""
+        if not self.buffer:
+            return
+
+        size = len(self.buffer)
+        with memoryview(self.buffer) as view:
+            if self.download.hasher is not None:
+                self.download.hasher.update(view)
+
+            written = 0
+            while written < size:
+                written += self.file.write(view[written:])
+
+        self.buffer.clear()
+        self.download.written(self.segment, size)
@@ -0,0 +1,264 @@
+#
+# SPDX-FileCopyrightText: The LineageOS Project
+# SPDX-License-Identifier: LGPL-3.0-or-later
+#
+
+from hashlib import sha256
+import json
+import os
+from pathlib import Path
+from threading import Lock, get_ident
+from time import time
+from typing import Any, Dict, Optional, Union
+
+DEFAULT_MAX_SIZE = 256 * 1024 * 1024
+"""Default maximum size of the cached bodies (bytes)."""
+
+DEFAULT_SAVE_INTERVAL = 100
+"""Default number of changes (stores, revalidations, reads, removals) after which the index is
+saved."""
+
+
+class CacheEntry:
+    """A cached HTTP response.
+
+    Attributes:
+    - url (str): The URL of the response
+    - etag (Optional[str]): The ETag header of the response
+    - last_modified (Optional[str]): The Last-Modified header of the response
+    - size (int): The size of the body, in bytes
+    - stored_at (float): When the response was last downloaded or revalidated (UNIX timestamp)
+    - accessed_at (float): When the response was last used (UNIX timestamp)
+    """
+
+    def __init__(
+        self,
+        url: str,
+        etag: Optional[str],
+        last_modified: Optional[str],
+        size: int,
+        stored_at: float,
+        accessed_at: float,
+    ) -> None:
+        self.url = url
+        self.etag = etag
+        self.last_modified = last_modified
+        self.size = size
+        self.stored_at = stored_at
+        self.accessed_at = accessed_at
+
+    @classmethod
+    def from_json(cls, json: Dict[str, Any]):
+        """Create an object from a JSON object."""
+        return cls(
+            json["url"],
+            json["etag"],
+            json["last_modified"],
+            json["size"],
+            json["stored_at"],
+            json["accessed_at"],
+        )
+
+    def to_json(self) -> Dict[str, Any]:
+        """Convert the object to a JSON object."""
+        return {
+            "url": self.url,
+            "etag": self.etag,
+            "last_modified": self.last_modified,
+            "size": self.size,
+            "stored_at": self.stored_at,
+            "accessed_at": self.accessed_at,
+        }
+
+    @property
+    def conditional_headers(self) -> Dict[str, str]:
+        """Headers to revalidate this response with a conditional request."""
+        headers = {}
+
+        if self.etag is not None:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified is not None:
+            headers["If-Modified-Since"] = self.last_modified
+
+        return headers
+
+
+class HttpCache:
+    """Persistent on-disk cache of HTTP response bodies, keyed by URL.
+
+    Cached responses are revalidated with conditional requests (If-None-Match and
+    If-Modified-Since), so a 304 Not Modified reply is served from disk without downloading
+    the body again. When max_age is set, responses younger than it are served without
+    contacting the server at all.
+
+    The total size of the cached bodies is capped, least recently used responses are evicted
+    first.
+
+    The index (the metadata of the entries, including their access times) is saved every
+    save_interval changes and by flush(), which the HTTP clients call when they're closed. If
+    the process dies in between, the last changes to the index are lost, the bodies are kept.
+
+    The cache is safe to share between threads and between sync and async clients, but not
+    between processes.
+    """
+
+    INDEX_FILENAME = "index.json"
+
+    def __init__(
+        self,
+        path: Union[Path, str],
+        max_size: int = DEFAULT_MAX_SIZE,
+        max_age: Optional[float] = None,
+        save_interval: int = DEFAULT_SAVE_INTERVAL,
+    ) -> None:
+        """Initialize the cache.
+
+        Args:
+        - path (Union[Path, str]): The directory where the cache is stored, created if needed
+        - max_size (int): Maximum size of the cached bodies, in bytes
+        - max_age (Optional[float]): If set, responses younger than this (seconds) are served
+          without revalidation
+        - save_interval (int): Number of changes after which the index is saved
+        """
+        self.path = Path(path)
+        self.max_size = max_size
+        self.max_age = max_age
+        self.save_interval = save_interval
+
+        self._lock = Lock()
+        self._changes = 0
+
+        self.path.mkdir(parents=True, exist_ok=True)
+
+        self._entries: Dict[str, CacheEntry] = {}
+        try:
+            index = json.loads((self.path / self.INDEX_FILENAME).read_text())
+        except (OSError, ValueError):
+            index = []
+        for entry_json in index:
+            entry = CacheEntry.from_json(entry_json)
+            self._entries[entry.url] = entry
+        self._size = sum(entry.size for entry in self._entries.values())
+
+    def __enter__(self) -> "HttpCache":
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.flush()
+
+    @property
+    def size(self) -> int:
+        """Total size of the cached bodies, in bytes."""
+        return self._size
+
+    def get(self, url: str) -> Optional[CacheEntry]:
+        """Get the cache entry of a URL, if any."""
+        with self._lock:
+            return self._entries.get(url)
+
+    def is_fresh(self, entry: CacheEntry) -> bool:
+        """Whether an entry can be served without revalidation."""
+        return self.max_age is not None and time() - entry.stored_at < self.max_age
+
+    def read(self, entry: CacheEntry) -> Optional[bytes]:
+        """Read the body of an entry, None if it's gone missing."""
+        try:
+            body = self._get_body_path(entry.url).read_bytes()
+        except OSError:
+            self.remove(entry.url)
+            return None
+
+        with self._lock:
+            entry.accessed_at = time()
+            self._changed()
+
+        return body
+
+    def store(
+        self,
+        url: str,
+        body: bytes,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+    ) -> None:
+        """Store the body of a response."""
+        if len(body) > self.max_size:
+            return
+
+        now = time()
+        entry = CacheEntry(url, etag, last_modified, len(body), now, now)
+
+        self._write_atomic(self._get_body_path(url), body)
+
+        with self._lock:
+            previous = self._entries.pop(url, None)
+            if previous is not None:
+                self._size -= previous.size
+            self._entries[url] = entry
+            self._size += entry.size
+            self._evict()
+            self._changed()
+
+    def refresh(self, entry: CacheEntry) -> None:
+        """Mark an entry as revalidated (e.g. after a 304 response)."""
+        with self._lock:
+            entry.stored_at = entry.accessed_at = time()
+            self._changed()
+
+    def remove(self, url: str) -> None:
+        """Remove the entry of a URL, if any."""
+        with self._lock:
+            entry = self._entries.pop(url, None)
+            if entry is None:
+                return
+
+            self._size -= entry.size
+            self._get_body_path(url).unlink(missing_ok=True)
+            self._changed()
+
+    def clear(self) -> None:
+        """Remove all the entries."""
+        with self._lock:
+            for url in self._entries:
+                self._get_body_path(url).unlink(missing_ok=True)
+            self._entries.clear()
+            self._size = 0
+            self._save_index()
+
+    def flush(self) -> None:
+        """Save the index if it changed since it was last saved."""
+        with self._lock:
+            if self._changes:
+                self._save_index()
+
+    def _get_body_path(self, url: str) -> Path:
+        return self.path / sha256(url.encode()).hexdigest()
+
+    def _evict(self) -> None:
+        if self._size <= self.max_size:
+            return
+
+        for entry in sorted(self._entries.values(), key=lambda entry: entry.accessed_at):
+            del self._entries[entry.url]
+            self._get_body_path(entry.url).unlink(missing_ok=True)
+
+            self._size -= entry.size
+            if self._size <= self.max_size:
+                break
+
+    def _changed(self) -> None:
+        # Called with the lock held, saves the index every save_interval changes
+        self._changes += 1
+        if self._changes >= self.save_interval:
+            self._save_index()
+
+    def _save_index(self) -> None:
+        self._changes = 0
+        index = [entry.to_json() for entry in self._entries.values()]
+        self._write_atomic(self.path / self.INDEX_FILENAME, json.dumps(index).encode())
+
+    @staticmethod
+    def _write_atomic(path: Path, data: bytes) -> None:
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{get_ident()}.tmp")
+        tmp_path.write_bytes(data)
+        os.replace(tmp_path, path)
@@ -3,19 +3,785 @@
 # SPDX-License-Identifier: LGPL-3.0-or-later
 #
 
+import asyncio
+from contextlib import asynccontextmanager, contextmanager
+from functools import partial
+from itertools import count
+import time
+from time import perf_counter
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    Optional,
+    Sequence,
+    Tuple,
+    TypeVar,
+    Union,
+)
+
 import aiohttp
 import requests
+from requests.adapters import HTTPAdapter
+from yarl import URL
+
+from liblineage.updater import instrumentation
+from liblineage.updater.http_cache import HttpCache
+from liblineage.updater.instrumentation import RequestMetrics, instrument_decode, measure_request
+from liblineage.updater.json_backend import loads
+from liblineage.updater.json_stream import JsonStreamParser
+from liblineage.updater.rate_limit import RateLimiter
+from liblineage.updater.resilience import (
+    DEFAULT_CONNECT_TIMEOUT,
+    DEFAULT_READ_TIMEOUT,
+    DEFAULT_RETRY_POLICY,
+    CircuitBreaker,
+    RetryPolicy,
+)
+
+DEFAULT_LIMIT = 100
+"""Default maximum number of simultaneous connections of a client."""
+
+DEFAULT_LIMIT_PER_HOST = 10
+"""Default maximum number of simultaneous connections to the same host."""
+
+DEFAULT_KEEPALIVE_TIMEOUT = 30.0
+"""Default time (in seconds) an idle connection is kept open for reuse."""
+
+DEFAULT_MAX_HOSTS = 10
+"""Default maximum number of hosts whose connection pools are kept around."""
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+"""Default size of the chunks read from streamed response bodies (bytes)."""
+
+DEFAULT_CONCURRENCY = 16
+"""Default maximum number of requests in flight for bulk fetches."""
+
+K = TypeVar("K")
+T = TypeVar("T")
+
+_decode_json = instrument_decode("json")(loads)
+
+# Errors worth retrying, the request may succeed if sent again
+_ASYNC_RETRY_ERRORS = (
+    aiohttp.ClientConnectionError,
+    aiohttp.ClientPayloadError,
+    asyncio.TimeoutError,
+)
+_SYNC_RETRY_ERRORS = (
+    requests.ConnectionError,
+    requests.Timeout,
+    requests.exceptions.ChunkedEncodingError,
+)
+
+
+class AsyncHttpClient:
+    """Asynchronous HTTP client owning a pooled aiohttp session.
+
+    Connections are kept alive and reused across requests, so a single client
+    should be shared for all the requests of a job instead of paying a new
+    TCP + TLS handshake every time.
+
+    Requests have connect and read timeouts, transient failures are retried according to the
+    retry policy, a circuit breaker can reject requests to failing hosts right away, and a rate
+    limiter can keep the requests to each host under a given rate.
+
+    Concurrent get_bytes() calls (and so get_text() and get_json()) for the same URL share a
+    single request, unless they pass extra arguments such as headers.
+
+    Usage:
+
+    .. code-block:: python
+
+        async with AsyncHttpClient(limit_per_host=20) as client:
+            oems = await AsyncV2Api.get_oems(client=client)
+            device = await AsyncV2Api.get_device("lemonadep", client=client)
+    """
+
+    def __init__(
+        self,
+        limit: int = DEFAULT_LIMIT,
+        limit_per_host: int = DEFAULT_LIMIT_PER_HOST,
+        keepalive_timeout: float = DEFAULT_KEEPALIVE_TIMEOUT,
+        cache: Optional[HttpCache] = None,
+        base_urls: Optional[Dict[str, str]] = None,
+        connect_timeout: Optional[float] = DEFAULT_CONNECT_TIMEOUT,
+        read_timeout: Optional[float] = DEFAULT_READ_TIMEOUT,
+        retry: Optional[RetryPolicy] = DEFAULT_RETRY_POLICY,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        coalesce: bool = True,
+    ) -> None:
+        """Initialize the client.
+
+        Args:
+        - limit (int): Maximum number of simultaneous connections (0 for no limit)
+        - limit_per_host (int): Maximum number of simultaneous connections to the same host
+          (0 for no limit)
+        - keepalive_timeout (float): Time (in seconds) an idle connection is kept open for reuse
+        - cache (Optional[HttpCache]): Cache used to store and revalidate responses
+        - base_urls (Optional[Dict[str, str]]): URL prefixes to replace in every request, e.g.
+          to point the APIs at a local server ({BASE_API_URL: "http://localhost:8080/api"})
+        - connect_timeout (Optional[float]): Maximum time (in seconds) to establish a connection,
+          None for no limit
+        - read_timeout (Optional[float]): Maximum time (in seconds) to wait for data from the
+          server, None for no limit
+        - retry (Optional[RetryPolicy]): Policy to retry failed requests, None to never retry
+        - circuit_breaker (Optional[CircuitBreaker]): Circuit breaker rejecting requests to
+          failing hosts
+        - rate_limiter (Optional[RateLimiter]): Rate limiter delaying the requests to each host
+        - coalesce (bool): Whether concurrent requests for the same URL share a single request
+        """
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.keepalive_timeout = keepalive_timeout
+        self.cache = cache
+        self.base_urls = base_urls or {}
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.retry = retry
+        self.circuit_breaker = circuit_breaker
+        self.rate_limiter = rate_limiter
+        self.coalesce = coalesce
+
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._inflight: Dict[str, "asyncio.Future[bytes]"] = {}
+
+    async def __aenter__(self) -> "AsyncHttpClient":
+        return self
+
+    async def __aexit__(self, *args: Any) -> None:
+        await self.close()
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        """The underlying aiohttp session, created on first use."""
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.limit,
+                limit_per_host=self.limit_per_host,
+                keepalive_timeout=self.keepalive_timeout,
+            )
+            # No total timeout, big downloads can take a long time
+            timeout = aiohttp.ClientTimeout(
+                total=None, sock_connect=self.connect_timeout, sock_read=self.read_timeout
+            )
+            # DNS and connection times are only measured if instrumented from the start
+            trace_configs = (
+                [instrumentation.create_trace_config()] if instrumentation.is_enabled() else None
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector, timeout=timeout, trace_configs=trace_configs
+            )
+
+        return self._session
+
+    async def close(self) -> None:
+        """Close the session and all its pooled connections, and flush the cache index."""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+        if self.cache is not None:
+            await asyncio.get_running_loop().run_in_executor(None, self.cache.flush)
+
+    def resolve_url(self, url: str) -> str:
+        """Apply the base_urls replacements to a URL."""
+        for prefix, replacement in self.base_urls.items():
+            if url.startswith(prefix):
+                return f"{replacement}{url[len(prefix) :]}"
+
+        return url
+
+    async def request(
+        self,
+        url: str,
+        stream: bool = False,
+        metrics: Optional[RequestMetrics] = None,
+        **kwargs: Any,
+    ) -> aiohttp.ClientResponse:
+        """Send a GET request, applying the retry policy, the circuit breaker and the rate limiter.
+
+        The URL isn't resolved (see resolve_url()) and the cache is bypassed.
+        Unless stream is True, the body is read as part of the request (and retried along with
+        it), otherwise the caller must release the response.
+        The timings, status and size of the request are filled in metrics if given.
+
+        Raises CircuitOpenError if the circuit of the host is open.
+        """
+        host = URL(url).host or ""
+        if metrics is not None:
+            kwargs["trace_request_ctx"] = metrics
+
+        for attempt in count():
+            if self.circuit_breaker is not None:
+                self.circuit_breaker.check(host)
+
+            if self.rate_limiter is not None:
+                await self.rate_limiter.async_wait(host)
+
+            resp = None
+            retry_after = None
+            start = perf_counter()
+            try:
+                resp = await self.session.get(url, **kwargs)
+
+                if metrics is not None:
+                    metrics.attempts = attempt + 1
+                    metrics.status = resp.status
+                    metrics.ttfb = perf_counter() - start
+
+                if self.retry is None or not self.retry.should_retry_status(resp.status, attempt):
+                    if not stream:
+                        body_start = perf_counter()
+                        body = await resp.read()
+
+                        if metrics is not None:
+                            metrics.body = perf_counter() - body_start
+                            metrics.bytes_received = len(body)
+
+                    self._record_result(host, resp.status < 500)
+
+                    return resp
+
+                retry_after = resp.headers.get("Retry-After")
+                resp.release()
+            except _ASYNC_RETRY_ERRORS:
+                if resp is not None:
+                    resp.release()
+
+                self._record_result(host, False)
+
+                if self.retry is None or not self.retry.can_retry(attempt):
+                    raise
+            else:
+                self._record_result(host, resp.status < 500)
+
+            assert self.retry is not None
+            await asyncio.sleep(self.retry.get_delay(attempt, retry_after))
+
+        raise AssertionError("Unreachable")
+
+    def _record_result(self, host: str, success: bool) -> None:
+        if self.circuit_breaker is None:
+            return
+
+        if success:
+            self.circuit_breaker.record_success(host)
+        else:
+            self.circuit_breaker.record_failure(host)
+
+    async def get_bytes(self, url: str, **kwargs: Any) -> bytes:
+        """Send a GET request and return the response body.
+
+        Raises aiohttp.ClientResponseError if the server replies with an error.
+        """
+        url = self.resolve_url(url)
+        if not self.coalesce or kwargs:
+            return await self._measure_get_bytes(url, **kwargs)
+
+        future = self._inflight.get(url)
+        if future is None:
+            future = self._inflight[url] = asyncio.ensure_future(self._measure_get_bytes(url))
+            future.add_done_callback(lambda future: self._on_inflight_done(url, future))
+
+        # Cancelling a caller mustn't cancel the request shared with the others
+        return await asyncio.shield(future)
+
+    def _on_inflight_done(self, url: str, future: "asyncio.Future[bytes]") -> None:
+        if self._inflight.get(url) is future:
+            del self._inflight[url]
+
+        # All the callers may have been cancelled, don't warn about an unretrieved exception
+        if not future.cancelled():
+            future.exception()
+
+    async def _measure_get_bytes(self, url: str, **kwargs: Any) -> bytes:
+        with measure_request(url) as metrics:
+            return await self._get_bytes(url, metrics, **kwargs)
+
+    async def _get_bytes(self, url: str, metrics: Optional[RequestMetrics], **kwargs: Any) -> bytes:
+        headers = kwargs.pop("headers", {})
+        # The cache reads and writes files, that's done in the default executor so that it
+        # doesn't block the event loop
+        loop = asyncio.get_running_loop()
+
+        entry = self.cache.get(url) if self.cache is not None else None
+        if entry is not None:
+            assert self.cache is not None
+
+            if self.cache.is_fresh(entry):
+                body = await loop.run_in_executor(None, self.cache.read, entry)
+                if body is not None:
+                    if metrics is not None:
+                        metrics.cache_hit = True
+
+                    return body
+
+        request_headers = {**headers, **entry.conditional_headers} if entry else headers
+
+        async with await self.request(
+            url, metrics=metrics, headers=request_headers, **kwargs
+        ) as resp:
+            if entry is None or resp.status != 304:
+                resp.raise_for_status()
+                body = await resp.read()
+
+                if self.cache is not None:
+                    await loop.run_in_executor(
+                        None,
+                        partial(
+                            self.cache.store,
+                            url,
+                            body,
+                            etag=resp.headers.get("ETag"),
+                            last_modified=resp.headers.get("Last-Modified"),
+                        ),
+                    )
+
+                return body
+
+        assert self.cache is not None
+
+        body = await loop.run_in_executor(None, self.cache.read, entry)
+        if body is None:
+            # The cached body is gone, download it again
+            return await self._get_bytes(url, metrics, headers=headers, **kwargs)
+
+        await loop.run_in_executor(None, self.cache.refresh, entry)
+        if metrics is not None:
+            metrics.cache_hit = True
+
+        return body
+
+    async def get_text(self, url: str, **kwargs: Any) -> str:
+        """Send a GET request and decode the response body as UTF-8 text."""
+        return (await self.get_bytes(url, **kwargs)).decode()
+
+    async def get_json(self, url: str, **kwargs: Any) -> Any:
+        """Send a GET request and decode the response body as JSON."""
+        return _decode_json(await self.get_bytes(url, **kwargs))
+
+    async def iter_bytes(
+        self, url: str, chunk_size: int = DEFAULT_CHUNK_SIZE, **kwargs: Any
+    ) -> AsyncIterator[bytes]:
+        """Send a GET request and stream the response body in chunks.
+
+        The cache is bypassed.
+        Raises aiohttp.ClientResponseError if the server replies with an error.
+        """
+        url = self.resolve_url(url)
+        with measure_request(url) as metrics:
+            async with await self.request(url, stream=True, metrics=metrics, **kwargs) as resp:
+                resp.raise_for_status()
+
+                if metrics is None:
+                    async for chunk in resp.content.iter_chunked(chunk_size):
+                        yield chunk
+                    return
+
+                body_start = perf_counter()
+                async for chunk in resp.content.iter_chunked(chunk_size):
+                    metrics.bytes_received += len(chunk)
+                    yield chunk
+                metrics.body = perf_counter() - body_start
+
+    async def iter_json(
+        self, url: str, path: Sequence[str] = (), **kwargs: Any
+    ) -> AsyncIterator[Any]:
+        """Send a GET request and decode the items of a JSON container while the response body
+        is streamed.
+
+        See JsonStreamParser for the meaning of path. The cache is bypassed.
+        """
+        parser = JsonStreamParser(path)
+
+        async for chunk in self.iter_bytes(url, **kwargs):
+            for item in parser.feed(chunk):
+                yield item
+
+        for item in parser.close():
+            yield item
+
+
+class SyncHttpClient:
+    """Synchronous HTTP client owning a pooled requests session.
+
+    Connections are kept alive and reused across requests, so a single client
+    should be shared for all the requests of a job instead of paying a new
+    TCP + TLS handshake every time.
+
+    Requests have connect and read timeouts, transient failures are retried according to the
+    retry policy, a circuit breaker can reject requests to failing hosts right away, and a rate
+    limiter can keep the requests to each host under a given rate.
+
+    Usage:
+
+    .. code-block:: python
+
+        with SyncHttpClient(limit_per_host=20) as client:
+            oems = SyncV2Api.get_oems(client=client)
+            device = SyncV2Api.get_device("lemonadep", client=client)
+    """
+
+    def __init__(
+        self,
+        limit_per_host: int = DEFAULT_LIMIT_PER_HOST,
+        max_hosts: int = DEFAULT_MAX_HOSTS,
+        cache: Optional[HttpCache] = None,
+        base_urls: Optional[Dict[str, str]] = None,
+        connect_timeout: Optional[float] = DEFAULT_CONNECT_TIMEOUT,
+        read_timeout: Optional[float] = DEFAULT_READ_TIMEOUT,
+        retry: Optional[RetryPolicy] = DEFAULT_RETRY_POLICY,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+    ) -> None:
+        """Initialize the client.
+
+        Args:
+        - limit_per_host (int): Maximum number of simultaneous connections to the same host,
+          further requests wait for a connection to be released
+        - max_hosts (int): Maximum number of hosts whose connection pools are kept around
+        - cache (Optional[HttpCache]): Cache used to store and revalidate responses
+        - base_urls (Optional[Dict[str, str]]): URL prefixes to replace in every request
+        - connect_timeout (Optional[float]): Maximum time (in seconds) to establish a connection,
+          None for no limit
+        - read_timeout (Optional[float]): Maximum time (in seconds) to wait for data from the
+          server, None for no limit
+        - retry (Optional[RetryPolicy]): Policy to retry failed requests, None to never retry
+        - circuit_breaker (Optional[CircuitBreaker]): Circuit breaker rejecting requests to
+          failing hosts
+        - rate_limiter (Optional[RateLimiter]): Rate limiter delaying the requests to each host
+        """
+        self.limit_per_host = limit_per_host
+        self.max_hosts = max_hosts
+        self.cache = cache
+        self.base_urls = base_urls or {}
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.retry = retry
+        self.circuit_breaker = circuit_breaker
+        self.rate_limiter = rate_limiter
+
+        self.session = requests.Session()
+
+        adapter = HTTPAdapter(
+            pool_connections=max_hosts,
+            pool_maxsize=limit_per_host,
+            pool_block=True,
+        )
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def __enter__(self) -> "SyncHttpClient":
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Close the session and all its pooled connections, and flush the cache index."""
+        self.session.close()
+
+        if self.cache is not None:
+            self.cache.flush()
+
+    def resolve_url(self, url: str) -> str:
+        """Apply the base_urls replacements to a URL."""
+        for prefix, replacement in self.base_urls.items():
+            if url.startswith(prefix):
+                return f"{replacement}{url[len(prefix) :]}"
+
+        return url
+
+    def request(
+        self,
+        url: str,
+        stream: bool = False,
+        metrics: Optional[RequestMetrics] = None,
+        **kwargs: Any,
+    ) -> requests.Response:
+        """Send a GET request, applying the retry policy, the circuit breaker and the rate limiter.
+
+        The URL isn't resolved (see resolve_url()) and the cache is bypassed.
+        Unless stream is True, the body is read as part of the request (and retried along with
+        it), otherwise the caller must close the response.
+        The timings, status and size of the request are filled in metrics if given, DNS
+        resolution and connection times aren't measured.
+
+        Raises CircuitOpenError if the circuit of the host is open.
+        """
+        host = URL(url).host or ""
+        kwargs.setdefault("timeout", (self.connect_timeout, self.read_timeout))
+
+        for attempt in count():
+            if self.circuit_breaker is not None:
+                self.circuit_breaker.check(host)
+
+            if self.rate_limiter is not None:
+                self.rate_limiter.wait(host)
+
+            resp = None
+            retry_after = None
+            start = perf_counter()
+            try:
+                # The body is read separately, so that failing to read it is retried too
+                resp = self.session.get(url, stream=True, **kwargs)
+
+                if metrics is not None:
+                    metrics.attempts = attempt + 1
+                    metrics.status = resp.status_code
+                    metrics.ttfb = perf_counter() - start
+
+                if self.retry is None or not self.retry.should_retry_status(
+                    resp.status_code, attempt
+                ):
+                    if not stream:
+                        body_start = perf_counter()
+                        body = resp.content
+
+                        if metrics is not None:
+                            metrics.body = perf_counter() - body_start
+                            metrics.bytes_received = len(body)
+
+                    self._record_result(host, resp.status_code < 500)
+
+                    return resp
+
+                retry_after = resp.headers.get("Retry-After")
+                resp.close()
+            except _SYNC_RETRY_ERRORS:
+                if resp is not None:
+                    resp.close()
+
+                self._record_result(host, False)
+
+                if self.retry is None or not self.retry.can_retry(attempt):
+                    raise
+            else:
+                self._record_result(host, resp.status_code < 500)
+
+            assert self.retry is not None
+            time.sleep(self.retry.get_delay(attempt, retry_after))
+
+        raise AssertionError("Unreachable")
+
+    def _record_result(self, host: str, success: bool) -> None:
+        if self.circuit_breaker is None:
+            return
+
+        if success:
+            self.circuit_breaker.record_success(host)
+        else:
+            self.circuit_breaker.record_failure(host)
+
+    def get_bytes(self, url: str, **kwargs: Any) -> bytes:
+        """Send a GET request and return the response body.
+
+        Raises requests.HTTPError if the server replies with an error.
+        """
+        url = self.resolve_url(url)
+        with measure_request(url) as metrics:
+            return self._get_bytes(url, metrics, **kwargs)
+
+    def _get_bytes(self, url: str, metrics: Optional[RequestMetrics], **kwargs: Any) -> bytes:
+        headers = kwargs.pop("headers", {})
+
+        entry = self.cache.get(url) if self.cache is not None else None
+        if entry is not None:
+            assert self.cache is not None
+
+            if self.cache.is_fresh(entry):
+                body = self.cache.read(entry)
+                if body is not None:
+                    if metrics is not None:
+                        metrics.cache_hit = True
+
+                    return body
+
+        request_headers = {**headers, **entry.conditional_headers} if entry else headers
+
+        resp = self.request(url, metrics=metrics, headers=request_headers, **kwargs)
+        if entry is None or resp.status_code != 304:
+            resp.raise_for_status()
+            body = resp.content
+
+            if self.cache is not None:
+                self.cache.store(
+                    url,
+                    body,
+                    etag=resp.headers.get("ETag"),
+                    last_modified=resp.headers.get("Last-Modified"),
+                )
+
+            return body
+
+        assert self.cache is not None
+
+        body = self.cache.read(entry)
+        if body is None:
+            # The cached body is gone, download it again
+            return self._get_bytes(url, metrics, headers=headers, **kwargs)
+
+        self.cache.refresh(entry)
+        if metrics is not None:
+            metrics.cache_hit = True
+
+        return body
+
+    def get_text(self, url: str, **kwargs: Any) -> str:
+        """Send a GET request and decode the response body as UTF-8 text."""
+        return self.get_bytes(url, **kwargs).decode()
+
+    def get_json(self, url: str, **kwargs: Any) -> Any:
+        """Send a GET request and decode the response body as JSON."""
+        return _decode_json(self.get_bytes(url, **kwargs))
+
+    def iter_bytes(
+        self, url: str, chunk_size: int = DEFAULT_CHUNK_SIZE, **kwargs: Any
+    ) -> Iterator[bytes]:
+        """Send a GET request and stream the response body in chunks.
+
+        The cache is bypassed.
+        Raises requests.HTTPError if the server replies with an error.
+        """
+        url = self.resolve_url(url)
+        with measure_request(url) as metrics:
+            with self.request(url, stream=True, metrics=metrics, **kwargs) as resp:
+                resp.raise_for_status()
+
+                if metrics is None:
+                    yield from resp.iter_content(chunk_size)
+                    return
+
+                body_start = perf_counter()
+                for chunk in resp.iter_content(chunk_size):
+                    metrics.bytes_received += len(chunk)
+                    yield chunk
+                metrics.body = perf_counter() - body_start
+
+    def iter_json(self, url: str, path: Sequence[str] = (), **kwargs: Any) -> Iterator[Any]:
+        """Send a GET request and decode the items of a JSON container while the response body
+        is streamed.
+
+        See JsonStreamParser for the meaning of path. The cache is bypassed.
+        """
+        parser = JsonStreamParser(path)
+
+        for chunk in self.iter_bytes(url, **kwargs):
+            yield from parser.feed(chunk)
+
+        yield from parser.close()
+
+
+@asynccontextmanager
+async def _use_async_client(client: Optional[AsyncHttpClient]) -> AsyncIterator[AsyncHttpClient]:
+    # The given client, or a temporary one closed on exit
+    if client is not None:
+        yield client
+        return
+
+    async with AsyncHttpClient() as owned_client:
+        yield owned_client
+
+
+@contextmanager
+def _use_sync_client(client: Optional[SyncHttpClient]) -> Iterator[SyncHttpClient]:
+    # The given client, or a temporary one closed on exit
+    if client is not None:
+        yield client
+        return
+
+    with SyncHttpClient() as owned_client:
+        yield owned_client
 
 
 class AsyncHttpRequests:
     @classmethod
-    async def get_json(cls, url: str, **kwargs):
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, **kwargs) as resp:
-                return await resp.json()
+    async def get_bytes(cls, url: str, client: Optional[AsyncHttpClient] = None, **kwargs):
+        async with _use_async_client(client) as http_client:
+            return await http_client.get_bytes(url, **kwargs)
+
+    @classmethod
+    async def get_text(cls, url: str, client: Optional[AsyncHttpClient] = None, **kwargs):
+        async with _use_async_client(client) as http_client:
+            return await http_client.get_text(url, **kwargs)
+
+    @classmethod
+    async def get_json(cls, url: str, client: Optional[AsyncHttpClient] = None, **kwargs):
+        async with _use_async_client(client) as http_client:
+            return await http_client.get_json(url, **kwargs)
+
+    @classmethod
+    async def iter_json(
+        cls,
+        url: str,
+        path: Sequence[str] = (),
+        client: Optional[AsyncHttpClient] = None,
+        **kwargs,
+    ) -> AsyncIterator[Any]:
+        async with _use_async_client(client) as http_client:
+            async for item in http_client.iter_json(url, path, **kwargs):
+                yield item
 
 
 class SyncHttpRequests:
     @classmethod
-    def get_json(cls, url: str, **kwargs):
-        return requests.get(url, **kwargs).json()
+    def get_bytes(cls, url: str, client: Optional[SyncHttpClient] = None, **kwargs):
+        with _use_sync_client(client) as http_client:
+            return http_client.get_bytes(url, **kwargs)
+
+    @classmethod
+    def get_text(cls, url: str, client: Optional[SyncHttpClient] = None, **kwargs):
+        with _use_sync_client(client) as http_client:
+            return http_client.get_text(url, **kwargs)
+
+    @classmethod
+    def get_json(cls, url: str, client: Optional[SyncHttpClient] = None, **kwargs):
+        with _use_sync_client(client) as http_client:
+            return http_client.get_json(url, **kwargs)
+
+    @classmethod
+    def iter_json(
+        cls,
+        url: str,
+        path: Sequence[str] = (),
+        client: Optional[SyncHttpClient] = None,
+        **kwargs,
+    ) -> Iterator[Any]:
+        with _use_sync_client(client) as http_client:
+            yield from http_client.iter_json(url, path, **kwargs)
+
+
+async def fetch_many(
+    fetch: Callable[[K], Awaitable[T]],
+    keys: Iterable[K],
+    concurrency: int = DEFAULT_CONCURRENCY,
+) -> AsyncIterator[Tuple[K, Union[T, Exception]]]:
+    """Run fetch() on many keys concurrently, yielding results as they complete.
+
+    At most `concurrency` fetches are in flight at the same time.
+    Results are yielded as (key, result) tuples, where result is the exception raised by
+    fetch() if it failed, so that a single failure doesn't abort the whole batch.
+    Pending fetches are cancelled if the iteration is stopped early.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def run(key: K) -> Tuple[K, Union[T, Exception]]:
+        async with semaphore:
+            try:
+                return key, await fetch(key)
+            except Exception as e:
+                return key, e
+
+    tasks = [asyncio.ensure_future(run(key)) for key in keys]
+    try:
+        for task in asyncio.as_completed(tasks):
+            yield await task
+    finally:
+        for task in tasks:
+            task.cancel()
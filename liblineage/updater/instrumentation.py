@@ -0,0 +1,513 @@
+#
+# SPDX-FileCopyrightText: The LineageOS Project
+# SPDX-License-Identifier: LGPL-3.0-or-later
+#
+"""Instrumentation of the HTTP requests and of the decoding of the responses.
+
+Register hooks with add_hook() to receive the metrics of every request sent by the HTTP
+clients (and AsyncHttpRequests/SyncHttpRequests) and of every decoded response. Without hooks,
+nothing is measured.
+
+InMemoryCollector aggregates the metrics and prints a summary table, OpenTelemetryHook turns
+them into OpenTelemetry spans (pip install opentelemetry-api).
+
+Usage:
+
+.. code-block:: python
+
+    collector = InMemoryCollector()
+    add_hook(collector)
+    devices = await AsyncV2Api.get_many_device_builds(...)
+    collector.print_summary()
+"""
+
+from bisect import bisect_left
+from functools import wraps
+import re
+import sys
+from threading import Lock
+from time import perf_counter, time_ns
+from types import SimpleNamespace
+from typing import IO, Any, Callable, Dict, List, Optional, Sequence, Tuple, TypeVar
+
+import aiohttp
+from yarl import URL
+
+try:
+    from opentelemetry import trace as otel_trace  # pyright: ignore[reportMissingImports]
+except ImportError:
+    otel_trace = None
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+"""Upper bounds (in seconds) of the latency histogram buckets."""
+
+ENDPOINT_PATTERNS: List[Tuple[re.Pattern, str]] = [
+    (re.compile(r"/api/v1/types/[^/]+$"), "/api/v1/types/{device}"),
+    (re.compile(r"/api/v1/(?!types/|devices$)[^/]+/[^/]+/[^/]+$"), "/api/v1/{device}/{type}/{inc}"),
+    (re.compile(r"/api/v2/devices/[^/]+/builds$"), "/api/v2/devices/{device}/builds"),
+    (re.compile(r"/api/v2/devices/[^/]+$"), "/api/v2/devices/{device}"),
+    (re.compile(r"/_data/devices/[^/]+\.yml$"), "/_data/devices/{device}.yml"),
+]
+"""Patterns replacing the variable parts of the known URLs, to group requests by endpoint."""
+
+
+class RequestMetrics:
+    """Metrics of a request.
+
+    Timings are in seconds and cover the last attempt, they're None when unknown (e.g. DNS
+    resolution and connection for a reused connection, or any timing of a cache hit).
+
+    Attributes:
+    - url (str): The URL of the request
+    - started_at (int): When the request started (UNIX timestamp in nanoseconds)
+    - status (Optional[int]): The HTTP status of the response
+    - cache_hit (bool): Whether the body came from the cache (fresh or revalidated)
+    - bytes_received (int): Size of the body received from the server
+    - attempts (int): Number of attempts
+    - dns (Optional[float]): Time spent resolving the host name
+    - connect (Optional[float]): Time spent establishing the connection (including DNS and TLS)
+    - ttfb (Optional[float]): Time to the first byte, from starting the request (including
+      connecting) to receiving the response headers
+    - body (Optional[float]): Time spent receiving the body
+    - total (float): Total time of the request, including retries
+    - error (Optional[BaseException]): The exception raised by the request, if any
+    """
+
+    def __init__(self, url: str) -> None:
+        self.url = url
+        self.started_at = time_ns()
+        self.status: Optional[int] = None
+        self.cache_hit = False
+        self.bytes_received = 0
+        self.attempts = 0
+        self.dns: Optional[float] = None
+        self.connect: Optional[float] = None
+        self.ttfb: Optional[float] = None
+        self.body: Optional[float] = None
+        self.total = 0.0
+        self.error: Optional[BaseException] = None
+
+        self._start = perf_counter()
+
+    @property
+    def endpoint(self) -> str:
+        """The endpoint of the request, its URL without query and variable parts."""
+        return get_endpoint(self.url)
+
+
+class DecodeMetrics:
+    """Metrics of the decoding of a response.
+
+    Attributes:
+    - name (str): Name of the decoded document
+    - size (Optional[int]): Size of the decoded data, when it's bytes or a string
+    - duration (float): Time (in seconds) spent decoding
+    - error (Optional[BaseException]): The exception raised while decoding, if any
+    """
+
+    def __init__(
+        self,
+        name: str,
+        size: Optional[int],
+        duration: float,
+        error: Optional[BaseException] = None,
+    ) -> None:
+        self.name = name
+        self.size = size
+        self.duration = duration
+        self.error = error
+
+
+class InstrumentationHook:
+    """Base class of the instrumentation hooks, override the methods of interest.
+
+    Hooks are called synchronously from the thread or event loop sending the request, they
+    must be quick and thread-safe.
+    """
+
+    def on_request(self, metrics: RequestMetrics) -> None:
+        """Called when a request is done, successfully or not."""
+
+    def on_decode(self, metrics: DecodeMetrics) -> None:
+        """Called when a response is decoded, successfully or not."""
+
+
+# Replaced, never modified in place, so that it can be iterated from any thread without a lock
+_hooks: Tuple[InstrumentationHook, ...] = ()
+_hooks_lock = Lock()
+
+
+def add_hook(hook: InstrumentationHook) -> None:
+    """Register a hook, enabling the instrumentation."""
+    global _hooks
+
+    with _hooks_lock:
+        _hooks = (*_hooks, hook)
+
+
+def remove_hook(hook: InstrumentationHook) -> None:
+    """Unregister a hook, the instrumentation is disabled once there are no hooks left.
+
+    Raises ValueError if the hook isn't registered.
+    """
+    global _hooks
+
+    with _hooks_lock:
+        hooks = list(_hooks)
+        hooks.remove(hook)
+        _hooks = tuple(hooks)
+
+
+def is_enabled() -> bool:
+    """Whether there are hooks registered."""
+    return bool(_hooks)
+
+
+def get_endpoint(url: str) -> str:
+    """Get the endpoint of a URL: host and path, without the variable parts."""
+    parsed = URL(url)
+    path = parsed.path
+    for pattern, replacement in ENDPOINT_PATTERNS:
+        path, count = pattern.subn(replacement, path)
+        if count:
+            break
+
+    return f"{parsed.host}{path}"
+
+
+class _RequestMeasurement:
+    def __init__(self, url: str) -> None:
+        self.metrics = RequestMetrics(url)
+
+    def __enter__(self) -> RequestMetrics:
+        return self.metrics
+
+    def __exit__(self, exc_type: Any, exc: Optional[BaseException], tb: Any) -> None:
+        self.metrics.total = perf_counter() - self.metrics._start
+        # A streamed body whose reading is stopped early isn't a failure
+        if not isinstance(exc, GeneratorExit):
+            self.metrics.error = exc
+
+        for hook in _hooks:
+            hook.on_request(self.metrics)
+
+
+class _NullMeasurement:
+    def __enter__(self) -> None:
+        return None
+
+    def __exit__(self, *args: Any) -> None:
+        pass
+
+
+_NULL_MEASUREMENT = _NullMeasurement()
+
+
+def measure_request(url: str) -> Any:
+    """Measure a request, as a context manager returning its metrics to fill in.
+
+    When disabled, the context manager returns None and costs next to nothing.
+    """
+    return _RequestMeasurement(url) if _hooks else _NULL_MEASUREMENT
+
+
+def instrument_decode(name: str) -> Callable[[F], F]:
+    """Decorator measuring a decoding function.
+
+    The size of the first bytes or string argument is recorded as the size of the data.
+    """
+
+    def decorator(function: F) -> F:
+        @wraps(function)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            hooks = _hooks
+            if not hooks:
+                return function(*args, **kwargs)
+
+            # The data is the first argument, after cls for class methods
+            size = next((len(arg) for arg in args if isinstance(arg, (bytes, str))), None)
+
+            start = perf_counter()
+            error = None
+            try:
+                return function(*args, **kwargs)
+            except BaseException as e:
+                error = e
+                raise
+            finally:
+                metrics = DecodeMetrics(name, size, perf_counter() - start, error)
+                for hook in hooks:
+                    hook.on_decode(metrics)
+
+        return wrapper  # pyright: ignore[reportReturnType]
+
+    return decorator
+
+
+def create_trace_config() -> aiohttp.TraceConfig:
+    """Create an aiohttp trace config measuring the DNS resolution and connection times.
+
+    It fills in the RequestMetrics passed as trace_request_ctx, other requests are ignored.
+    """
+
+    async def on_dns_start(session: Any, context: SimpleNamespace, params: Any) -> None:
+        context.dns_start = perf_counter()
+
+    async def on_dns_end(session: Any, context: SimpleNamespace, params: Any) -> None:
+        metrics = context.trace_request_ctx
+        if isinstance(metrics, RequestMetrics) and hasattr(context, "dns_start"):
+            metrics.dns = perf_counter() - context.dns_start
+
+    async def on_connect_start(session: Any, context: SimpleNamespace, params: Any) -> None:
+        context.connect_start = perf_counter()
+
+    async def on_connect_end(session: Any, context: SimpleNamespace, params: Any) -> None:
+        metrics = context.trace_request_ctx
+        if isinstance(metrics, RequestMetrics) and hasattr(context, "connect_start"):
+            metrics.connect = perf_counter() - context.connect_start
+
+    trace_config = aiohttp.TraceConfig()
+    trace_config.on_dns_resolvehost_start.append(on_dns_start)
+    trace_config.on_dns_resolvehost_end.append(on_dns_end)
+    trace_config.on_connection_create_start.append(on_connect_start)
+    trace_config.on_connection_create_end.append(on_connect_end)
+
+    return trace_config
+
+
+class LatencyHistogram:
+    """Histogram of latencies, with fixed buckets.
+
+    Attributes:
+    - buckets (Sequence[float]): Upper bounds (in seconds) of the buckets, the last bucket
+      holds the latencies above the last bound
+    - counts (List[int]): Number of latencies in every bucket
+    - count (int): Total number of latencies
+    - sum (float): Sum of the latencies
+    - max (float): Highest latency
+    """
+
+    def __init__(self, buckets: Sequence[float] = LATENCY_BUCKETS) -> None:
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    @property
+    def mean(self) -> float:
+        return self.sum / self.count if self.count else 0.0
+
+    def add(self, latency: float) -> None:
+        self.counts[bisect_left(self.buckets, latency)] += 1
+        self.count += 1
+        self.sum += latency
+        self.max = max(self.max, latency)
+
+    def percentile(self, percentile: float) -> float:
+        """Get an upper bound of a percentile (0 to 100): the bound of the bucket holding it."""
+        rank = percentile / 100 * self.count
+        seen = 0
+        for bound, count in zip(self.buckets, self.counts):
+            seen += count
+            if seen >= rank and seen:
+                return min(bound, self.max)
+
+        return self.max
+
+
+class EndpointStats:
+    """Aggregated metrics of the requests to an endpoint.
+
+    Attributes:
+    - requests (int): Number of requests
+    - errors (int): Number of failed requests
+    - cache_hits (int): Number of requests served from the cache
+    - retries (int): Number of retried attempts
+    - bytes_received (int): Total size of the bodies received from the server
+    - latency (LatencyHistogram): Histogram of the total times of the requests
+    - timings (Dict[str, float]): Total time spent in each phase (dns, connect, ttfb, body)
+    """
+
+    def __init__(self) -> None:
+        self.requests = 0
+        self.errors = 0
+        self.cache_hits = 0
+        self.retries = 0
+        self.bytes_received = 0
+        self.latency = LatencyHistogram()
+        self.timings = {"dns": 0.0, "connect": 0.0, "ttfb": 0.0, "body": 0.0}
+
+    def add(self, metrics: RequestMetrics) -> None:
+        self.requests += 1
+        self.errors += metrics.error is not None
+        self.cache_hits += metrics.cache_hit
+        self.retries += max(metrics.attempts - 1, 0)
+        self.bytes_received += metrics.bytes_received
+        self.latency.add(metrics.total)
+
+        for phase in self.timings:
+            timing = getattr(metrics, phase)
+            if timing is not None:
+                self.timings[phase] += timing
+
+
+class DecodeStats:
+    """Aggregated metrics of the decoding of a kind of document.
+
+    Attributes:
+    - count (int): Number of decoded documents
+    - errors (int): Number of documents that failed to decode
+    - size (int): Total size of the decoded data, when known
+    - duration (float): Total time (in seconds) spent decoding
+    """
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.errors = 0
+        self.size = 0
+        self.duration = 0.0
+
+    def add(self, metrics: DecodeMetrics) -> None:
+        self.count += 1
+        self.errors += metrics.error is not None
+        self.size += metrics.size or 0
+        self.duration += metrics.duration
+
+
+class InMemoryCollector(InstrumentationHook):
+    """Hook aggregating the metrics in memory, per endpoint and per decoded document.
+
+    Attributes:
+    - endpoints (Dict[str, EndpointStats]): Metrics of the requests, per endpoint
+    - decoders (Dict[str, DecodeStats]): Metrics of the decoding, per document name
+    """
+
+    def __init__(self) -> None:
+        self.endpoints: Dict[str, EndpointStats] = {}
+        self.decoders: Dict[str, DecodeStats] = {}
+
+        self._lock = Lock()
+
+    def on_request(self, metrics: RequestMetrics) -> None:
+        endpoint = metrics.endpoint
+        with self._lock:
+            stats = self.endpoints.get(endpoint)
+            if stats is None:
+                stats = self.endpoints[endpoint] = EndpointStats()
+            stats.add(metrics)
+
+    def on_decode(self, metrics: DecodeMetrics) -> None:
+        with self._lock:
+            stats = self.decoders.get(metrics.name)
+            if stats is None:
+                stats = self.decoders[metrics.name] = DecodeStats()
+            stats.add(metrics)
+
+    def clear(self) -> None:
+        with self._lock:
+            self.endpoints.clear()
+            self.decoders.clear()
+
+    def format_summary(self) -> str:
+        """Format the metrics as plain text tables, times are in milliseconds."""
+        lines = [
+            f"{'endpoint':<48} {'reqs':>6} {'errs':>5} {'cache':>6} {'retry':>5} "
+            f"{'KiB':>9} {'mean':>8} {'p50':>8} {'p95':>8} {'max':>8} "
+            f"{'dns':>7} {'conn':>7} {'ttfb':>7} {'body':>7}"
+        ]
+
+        with self._lock:
+            for endpoint, stats in sorted(self.endpoints.items()):
+                latency = stats.latency
+                phases = " ".join(
+                    f"{timing / stats.requests * 1000:>7.1f}" for timing in stats.timings.values()
+                )
+                lines.append(
+                    f"{endpoint[-48:]:<48} {stats.requests:>6} {stats.errors:>5} "
+                    f"{stats.cache_hits:>6} {stats.retries:>5} {stats.bytes_received / 1024:>9.1f} "
+                    f"{latency.mean * 1000:>8.1f} {latency.percentile(50) * 1000:>8.1f} "
+                    f"{latency.percentile(95) * 1000:>8.1f} {latency.max * 1000:>8.1f} {phases}"
+                )
+
+            if self.decoders:
+                lines.append("")
+                lines.append(f"{'decoder':<48} {'count':>6} {'errs':>5} {'KiB':>9} {'mean':>8}")
+                for name, stats in sorted(self.decoders.items()):
+                    lines.append(
+                        f"{name:<48} {stats.count:>6} {stats.errors:>5} "
+                        f"{stats.size / 1024:>9.1f} {stats.duration / stats.count * 1000:>8.2f}"
+                    )
+
+        return "\n".join(lines)
+
+    def print_summary(self, file: IO[str] = sys.stdout) -> None:
+        """Print the summary tables (see format_summary())."""
+        print(self.format_summary(), file=file)
+
+
+class OpenTelemetryHook(InstrumentationHook):
+    """Hook recording the requests and the decoding as OpenTelemetry spans.
+
+    Requires opentelemetry-api, the spans are exported by the configured SDK if any.
+    """
+
+    def __init__(self, tracer: Any = None) -> None:
+        """Initialize the hook.
+
+        Args:
+        - tracer (Any): The OpenTelemetry tracer to use, defaults to the "liblineage" tracer of
+          the global tracer provider
+        """
+        if tracer is None:
+            if otel_trace is None:
+                raise RuntimeError("OpenTelemetryHook requires opentelemetry-api")
+
+            tracer = otel_trace.get_tracer("liblineage")
+
+        self.tracer = tracer
+
+    def on_request(self, metrics: RequestMetrics) -> None:
+        attributes = {
+            "http.request.method": "GET",
+            "url.full": metrics.url,
+            "liblineage.endpoint": metrics.endpoint,
+            "liblineage.cache_hit": metrics.cache_hit,
+            "liblineage.attempts": metrics.attempts,
+            "http.response.body.size": metrics.bytes_received,
+        }
+        if metrics.status is not None:
+            attributes["http.response.status_code"] = metrics.status
+        for phase in ("dns", "connect", "ttfb", "body"):
+            timing = getattr(metrics, phase)
+            if timing is not None:
+                attributes[f"liblineage.{phase}_ms"] = timing * 1000
+
+        span = self.tracer.start_span("GET", start_time=metrics.started_at, attributes=attributes)
+        if metrics.error is not None:
+            span.record_exception(metrics.error)
+            self._set_error(span, metrics.error)
+        span.end(end_time=metrics.started_at + int(metrics.total * 1e9))
+
+    def on_decode(self, metrics: DecodeMetrics) -> None:
+        end_time = time_ns()
+        attributes: Dict[str, Any] = {"liblineage.document": metrics.name}
+        if metrics.size is not None:
+            attributes["liblineage.size"] = metrics.size
+
+        span = self.tracer.start_span(
+            f"decode {metrics.name}",
+            start_time=end_time - int(metrics.duration * 1e9),
+            attributes=attributes,
+        )
+        if metrics.error is not None:
+            span.record_exception(metrics.error)
+            self._set_error(span, metrics.error)
+        span.end(end_time=end_time)
+
+    @staticmethod
+    def _set_error(span: Any, error: BaseException) -> None:
+        if otel_trace is not None:
+            span.set_status(otel_trace.Status(otel_trace.StatusCode.ERROR, str(error)))
@@ -0,0 +1,43 @@
+#
+# SPDX-FileCopyrightText: The LineageOS Project
+# SPDX-License-Identifier: LGPL-3.0-or-later
+#
+
+import json
+from typing import Any, Union
+
+try:
+    import msgspec  # pyright: ignore[reportMissingImports]
+except ImportError:
+    msgspec = None
+"""msgspec module if installed, used for typed decoding, None otherwise."""
+
+try:
+    import orjson  # pyright: ignore[reportMissingImports]
+except ImportError:
+    orjson = None
+
+if orjson is not None:
+    JSON_BACKEND = "orjson"
+    """Name of the JSON decoding backend in use."""
+
+    _loads = orjson.loads
+elif msgspec is not None:
+    JSON_BACKEND = "msgspec"
+    """Name of the JSON decoding backend in use."""
+
+    _loads = msgspec.json.Decoder().decode
+else:
+    JSON_BACKEND = "json"
+    """Name of the JSON decoding backend in use."""
+
+    _loads = json.loads
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    """Decode a JSON document with the fastest available backend.
+
+    orjson is preferred, then msgspec, falling back to the standard library.
+    Raises ValueError if the document is malformed.
+    """
+    return _loads(data)
@@ -0,0 +1,191 @@
+#
+# SPDX-FileCopyrightText: The LineageOS Project
+# SPDX-License-Identifier: LGPL-3.0-or-later
+#
+
+import codecs
+from json import JSONDecodeError, JSONDecoder
+import re
+from typing import Any, List, Sequence, Tuple
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_DELIMITERS = " \t\n\r,]}"
+
+# Buffer space reclaimed at once, to avoid copying it after every item
+_TRIM_THRESHOLD = 64 * 1024
+
+# What the parser expects next
+_CONTAINER = 0
+_ITEM_OR_END = 1
+_COMMA_OR_END = 2
+_KEY = 3
+_COLON = 4
+_VALUE = 5
+_DONE = 6
+
+
+class JsonStreamParser:
+    """Incremental JSON parser, yielding the items of a container as soon as they're complete.
+
+    The container is either the top-level value or, when a path of keys is given, the value
+    found by following those keys through nested objects (e.g. ("response",) for
+    {"response": [...]}). Array items are returned as-is, object members as (key, value) tuples.
+
+    Only the item currently being parsed is kept in memory, so memory usage doesn't depend on
+    the size of the document.
+
+    Usage:
+
+    .. code-block:: python
+
+        parser = JsonStreamParser()
+        for chunk in chunks:
+            for item in parser.feed(chunk):
+                ...
+        parser.close()
+    """
+
+    def __init__(self, path: Sequence[str] = ()) -> None:
+        """Initialize the parser.
+
+        Args:
+        - path (Sequence[str]): The keys leading to the container whose items are returned
+        """
+        self.path = tuple(path)
+
+        self._decoder = JSONDecoder()
+        self._text_decoder = codecs.getincrementaldecoder("utf-8")()
+
+        self._buffer = ""
+        self._pos = 0
+        # Don't try to decode an incomplete value again until the buffer reaches this size
+        self._retry_at = 0
+        self._closed = False
+
+        self._depth = 0
+        self._is_object = False
+        self._expect = _CONTAINER
+        self._key: Any = None
+
+    def feed(self, data: bytes) -> List[Any]:
+        """Feed a chunk of the document, returning the items completed by it."""
+        self._buffer += self._text_decoder.decode(data)
+
+        return self._parse()
+
+    def close(self) -> List[Any]:
+        """Signal the end of the document, returning the last items.
+
+        Raises ValueError if the document is truncated or malformed.
+        """
+        self._buffer += self._text_decoder.decode(b"", final=True)
+        self._closed = True
+        self._retry_at = 0
+
+        items = self._parse()
+
+        if self._expect != _DONE:
+            raise ValueError("Truncated JSON document")
+
+        return items
+
+    def _parse(self) -> List[Any]:
+        items = []
+
+        while self._expect != _DONE:
+            whitespace = _WHITESPACE.match(self._buffer, self._pos)
+            assert whitespace is not None
+            self._pos = whitespace.end()
+            if self._pos >= len(self._buffer):
+                break
+
+            char = self._buffer[self._pos]
+            searching = self._depth < len(self.path)
+            closing = "}" if searching or self._is_object else "]"
+
+            if self._expect == _CONTAINER:
+                if char == "[" and not searching:
+                    self._is_object = False
+                elif char == "{":
+                    self._is_object = True
+                else:
+                    raise ValueError(f"Unexpected {char!r} at {self._pos}, expected a container")
+
+                self._pos += 1
+                self._expect = _ITEM_OR_END
+            elif self._expect in (_ITEM_OR_END, _COMMA_OR_END) and char == closing:
+                if searching:
+                    raise ValueError(f"Key {self.path[self._depth]!r} not found")
+
+                self._pos += 1
+                self._expect = _DONE
+            elif self._expect == _ITEM_OR_END:
+                self._expect = _KEY if searching or self._is_object else _VALUE
+            elif self._expect == _COMMA_OR_END:
+                if char != ",":
+                    raise ValueError(f"Unexpected {char!r} at {self._pos}, expected ','")
+
+                self._pos += 1
+                self._expect = _KEY if searching or self._is_object else _VALUE
+            elif self._expect == _KEY:
+                if char != '"':
+                    raise ValueError(f"Unexpected {char!r} at {self._pos}, expected a key")
+
+                complete, self._key = self._decode_value()
+                if not complete:
+                    break
+
+                self._expect = _COLON
+            elif self._expect == _COLON:
+                if char != ":":
+                    raise ValueError(f"Unexpected {char!r} at {self._pos}, expected ':'")
+
+                self._pos += 1
+                self._expect = _VALUE
+            elif self._expect == _VALUE:
+                if searching and self._key == self.path[self._depth]:
+                    self._depth += 1
+                    self._expect = _CONTAINER
+                    continue
+
+                complete, value = self._decode_value()
+                if not complete:
+                    break
+
+                if not searching:
+                    items.append((self._key, value) if self._is_object else value)
+
+                self._expect = _COMMA_OR_END
+
+        if self._pos >= _TRIM_THRESHOLD:
+            self._buffer = self._buffer[self._pos :]
+            self._retry_at = max(self._retry_at - self._pos, 0)
+            self._pos = 0
+
+        return items
+
+    def _decode_value(self) -> Tuple[bool, Any]:
+        # Returns (True, value) if a complete value was decoded, (False, None) otherwise
+        if len(self._buffer) < self._retry_at:
+            return False, None
+
+        try:
+            value, end = self._decoder.raw_decode(self._buffer, self._pos)
+        except JSONDecodeError:
+            if self._closed:
+                raise
+
+            # Wait for the pending data to double, so that a big value spanning many chunks
+            # doesn't get decoded from scratch at every chunk
+            self._retry_at = 2 * len(self._buffer) - self._pos
+            return False, None
+
+        # Numbers and literals may continue in the next chunk (e.g. "12" followed by ".5")
+        if self._buffer[self._pos] not in '"[{' and not self._closed:
+            if end == len(self._buffer) or self._buffer[end] not in _DELIMITERS:
+                return False, None
+
+        self._pos = end
+        self._retry_at = 0
+
+        return True, value
@@ -0,0 +1,344 @@
+#
+# SPDX-FileCopyrightText: The LineageOS Project
+# SPDX-License-Identifier: LGPL-3.0-or-later
+#
+
+import asyncio
+import json
+import os
+from pathlib import Path, PurePosixPath
+from typing import Any, Dict, Iterable, List, Optional, Union
+
+from liblineage.updater.download import DEFAULT_SEGMENTS, AsyncDownloader
+from liblineage.updater.http_cache import HttpCache
+from liblineage.updater.http_utils import DEFAULT_CONCURRENCY, AsyncHttpClient
+from liblineage.updater.v2 import AsyncV2Api
+from liblineage.updater.v2.build import Build
+from liblineage.updater.v2.build_file import BuildFile
+
+DEFAULT_DOWNLOADS = 4
+"""Default number of files downloaded concurrently by a mirror sync."""
+
+STATE_FILENAME = "mirror-state.json"
+"""Name of the state file, in the root of the mirror."""
+
+CACHE_DIRNAME = ".cache"
+"""Name of the HTTP cache directory, in the root of the mirror."""
+
+INDEX_DIR = PurePosixPath("api") / "v2" / "devices"
+"""Path of the builds index, relative to the root of the mirror. The builds of a device are in
+<INDEX_DIR>/<device>/builds, the same layout as the v2 API."""
+
+
+class MirrorState:
+    """Files known to be in a mirror.
+
+    Attributes:
+    - devices (Dict[str, Dict[str, str]]): Dictionary of device codename to its mirrored files,
+      as a dictionary of file path to SHA256 hash
+    """
+
+    def __init__(self, devices: Dict[str, Dict[str, str]]) -> None:
+        self.devices = devices
+
+    @classmethod
+    def from_json(cls, json: Dict[str, Any]):
+        """Create an object from a JSON object."""
+        return cls(json["devices"])
+
+    def to_json(self) -> Dict[str, Any]:
+        """Convert the object to a JSON object."""
+        return {
+            "devices": self.devices,
+        }
+
+    @classmethod
+    def load(cls, path: Path) -> "MirrorState":
+        """Load a saved state, an empty one if missing."""
+        try:
+            text = path.read_text()
+        except FileNotFoundError:
+            return cls({})
+
+        return cls.from_json(json.loads(text))
+
+    def save(self, path: Path) -> None:
+        """Save the state, atomically replacing the previous one."""
+        tmp_path = path.with_name(f"{path.name}.tmp")
+        tmp_path.write_text(json.dumps(self.to_json()))
+        os.replace(tmp_path, path)
+
+
+class MirrorSyncResult:
+    """Outcome of a mirror sync.
+
+    Attributes:
+    - downloaded (List[str]): Paths of the files downloaded
+    - removed (List[str]): Paths of the files removed, since they're gone upstream
+    - errors (Dict[str, Exception]): Errors, keyed by device codename (failed to get its builds)
+      or file path (failed to download it). These are retried at the next sync
+    """
+
+    def __init__(self) -> None:
+        self.downloaded: List[str] = []
+        self.removed: List[str] = []
+        self.errors: Dict[str, Exception] = {}
+
+
+class AsyncMirror:
+    """Local mirror of the build files served by the updater API.
+
+    The mirrored files are stored under the root directory with the same path they have on the
+    server. A state file keeps track of the files of every device, so a sync only downloads the
+    files that are new or whose hash changed, and removes the ones that disappeared upstream.
+
+    The builds of every device are written in the same format and layout as the v2 API (see
+    INDEX_DIR), so that the mirror can be served by a plain HTTP server. The build lists are
+    fetched with a cache in the mirror directory, so the ones that didn't change since the last
+    sync are revalidated without being downloaded again.
+
+    Usage:
+
+    .. code-block:: python
+
+        mirror = AsyncMirror("/srv/mirror", base_url="https://mirror.example.com")
+        result = await mirror.sync()
+        print(f"{len(result.downloaded)} new files, {len(result.removed)} removed")
+    """
+
+    def __init__(
+        self,
+        path: Union[Path, str],
+        base_url: Optional[str] = None,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        downloads: int = DEFAULT_DOWNLOADS,
+        segments: int = DEFAULT_SEGMENTS,
+    ) -> None:
+        """Initialize the mirror.
+
+        Args:
+        - path (Union[Path, str]): The root directory of the mirror, created if needed
+        - base_url (Optional[str]): If set, the URLs in the index point to it instead of the
+          upstream server (e.g. https://mirror.example.com for /full/lemonadep/...)
+        - concurrency (int): Maximum number of build lists fetched concurrently
+        - downloads (int): Maximum number of files downloaded concurrently
+        - segments (int): Number of segments each file is downloaded with
+        """
+        self.path = Path(path)
+        self.base_url = base_url
+        self.concurrency = concurrency
+        self.downloads = downloads
+        self.segments = segments
+
+        self.path.mkdir(parents=True, exist_ok=True)
+
+        self.state_path = self.path / STATE_FILENAME
+        self.state = MirrorState.load(self.state_path)
+
+    def get_file_path(self, filepath: str) -> Path:
+        """Get the local path of a file given its path on the server."""
+        path = PurePosixPath(filepath)
+        if path.is_absolute():
+            path = path.relative_to("/")
+
+        if ".." in path.parts:
+            raise ValueError(f"Invalid file path {filepath}")
+
+        return self.path / path
+
+    def get_index_path(self, device: str) -> Path:
+        """Get the local path of the builds index of a device.
+
+        Raises ValueError if the device name isn't a single path component.
+        """
+        if not device or device == "." or ".." in device or "/" in device or "\\" in device:
+            raise ValueError(f"Invalid device name {device!r}")
+
+        return self.path / INDEX_DIR / device / "builds"
+
+    async def sync(
+        self, devices: Optional[Iterable[str]] = None, client: Optional[AsyncHttpClient] = None
+    ) -> MirrorSyncResult:
+        """Bring the mirror up to date with the server.
+
+        Args:
+        - devices (Optional[Iterable[str]]): The devices to sync. If not set, all the devices
+          of the server are synced, and the ones not there anymore are removed
+        - client (Optional[AsyncHttpClient]): The client used for the requests, by default one
+          with a cache in the mirror directory is used
+        """
+        if client is None:
+            cache = HttpCache(self.path / CACHE_DIRNAME)
+            async with AsyncHttpClient(
+                limit_per_host=self.concurrency, cache=cache
+            ) as owned_client:
+                return await self.sync(devices, owned_client)
+
+        result = MirrorSyncResult()
+
+        if devices is None:
+            oems = await AsyncV2Api.get_oems(client=client)
+            devices = [device.model for oem in oems for device in oem.devices]
+
+            for device in set(self.state.devices) - set(devices):
+                self._remove_device(device, result)
+        else:
+            devices = list(devices)
+
+        semaphore = asyncio.Semaphore(self.downloads)
+        # Files being downloaded, shared by the devices so that a file is only downloaded once
+        downloads: Dict[str, "asyncio.Future[bool]"] = {}
+        tasks = []
+
+        try:
+            async for device, builds in AsyncV2Api.get_many_device_builds(
+                devices, self.concurrency, client
+            ):
+                if isinstance(builds, Exception):
+                    # Keep the device as it is, it's retried at the next sync
+                    result.errors[device] = builds
+                    continue
+
+                try:
+                    # The device name comes from the server, it's used as a path component
+                    self.get_index_path(device)
+                except ValueError as e:
+                    result.errors[device] = e
+                    continue
+
+                tasks.append(
+                    asyncio.ensure_future(
+                        self._sync_device(device, builds, client, semaphore, downloads, result)
+                    )
+                )
+
+            await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+            self.state.save(self.state_path)
+
+        return result
+
+    async def _sync_device(
+        self,
+        device: str,
+        builds: List[Build],
+        client: AsyncHttpClient,
+        semaphore: asyncio.Semaphore,
+        downloads: Dict[str, "asyncio.Future[bool]"],
+        result: MirrorSyncResult,
+    ) -> None:
+        known = self.state.devices.setdefault(device, {})
+        upstream = {file.filepath: file for build in builds for file in build.files}
+
+        changed = [
+            file for filepath, file in upstream.items() if known.get(filepath) != file.sha256
+        ]
+        removed = [filepath for filepath in known if filepath not in upstream]
+
+        async def download(file: BuildFile) -> None:
+            # Files can be shared between devices, wait for another device downloading it
+            # instead of writing the same file concurrently
+            while not self._is_mirrored(file):
+                pending = downloads.get(file.filepath)
+                if pending is None:
+                    break
+
+                if not await asyncio.shield(pending):
+                    # The error is reported by the device that downloaded it
+                    return
+            else:
+                known[file.filepath] = file.sha256
+                return
+
+            future: "asyncio.Future[bool]" = asyncio.get_running_loop().create_future()
+            downloads[file.filepath] = future
+            try:
+                async with semaphore:
+                    try:
+                        path = self.get_file_path(file.filepath)
+                        path.parent.mkdir(parents=True, exist_ok=True)
+
+                        await AsyncDownloader.download(file, path, self.segments, client)
+                    except Exception as e:
+                        result.errors[file.filepath] = e
+                        future.set_result(False)
+                        return
+
+                known[file.filepath] = file.sha256
+                result.downloaded.append(file.filepath)
+                future.set_result(True)
+            finally:
+                del downloads[file.filepath]
+                # Cancelled, the devices waiting for it are being cancelled too
+                future.cancel()
+
+        await asyncio.gather(*(download(file) for file in changed))
+
+        for filepath in removed:
+            del known[filepath]
+            self._remove_file(filepath, result)
+
+        # Only list the builds whose files are all in the mirror, the others are added once
+        # their files are downloaded by a later sync
+        complete_builds = [
+            build
+            for build in builds
+            if all(known.get(file.filepath) == file.sha256 for file in build.files)
+        ]
+
+        # Devices without changes cost nothing beyond getting their builds
+        index_path = self.get_index_path(device)
+        if changed or removed or not index_path.is_file():
+            self._write_index(index_path, complete_builds)
+
+        if changed or removed:
+            self.state.save(self.state_path)
+
+    def _is_mirrored(self, file: BuildFile) -> bool:
+        # Whether the file is already in the mirror for any device
+        return any(files.get(file.filepath) == file.sha256 for files in self.state.devices.values())
+
+    def _remove_device(self, device: str, result: MirrorSyncResult) -> None:
+        for filepath in self.state.devices.pop(device):
+            self._remove_file(filepath, result)
+
+        self._remove_path(self.get_index_path(device))
+
+    def _remove_file(self, filepath: str, result: MirrorSyncResult) -> None:
+        # Files can be shared between devices
+        if any(filepath in files for files in self.state.devices.values()):
+            return
+
+        self._remove_path(self.get_file_path(filepath))
+        result.removed.append(filepath)
+
+    def _remove_path(self, path: Path) -> None:
+        path.unlink(missing_ok=True)
+
+        # Remove the directories left empty
+        for parent in path.parents:
+            if parent == self.path:
+                break
+
+            try:
+                parent.rmdir()
+            except OSError:
+                break
+
+    def _write_index(self, path: Path, builds: List[Build]) -> None:
+        builds_json = [build.to_json() for build in builds]
+
+        if self.base_url is not None:
+            for build_json in builds_json:
+                for file_json in build_json["files"]:
+                    file_json["url"] = f"{self.base_url}{file_json['filepath']}"
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        tmp_path = path.with_name(f"{path.name}.tmp")
+        tmp_path.write_text(json.dumps(builds_json))
+        os.replace(tmp_path, path)
@@ -0,0 +1,170 @@
+#
+# SPDX-FileCopyrightText: The LineageOS Project
+# SPDX-License-Identifier: LGPL-3.0-or-later
+#
+
+import asyncio
+from threading import Lock
+from time import monotonic, sleep
+from typing import Dict, Optional, Tuple
+
+RateLimit = Tuple[float, int]
+"""A rate limit, as (requests per second, burst capacity)."""
+
+
+class RateLimitStats:
+    """Rate limiting metrics of a host.
+
+    Attributes:
+    - requests (int): Number of requests let through
+    - delayed (int): Number of requests that had to wait
+    - wait_time (float): Total time (in seconds) spent waiting
+    - max_wait_time (float): Longest time (in seconds) a request waited
+    """
+
+    def __init__(self) -> None:
+        self.requests = 0
+        self.delayed = 0
+        self.wait_time = 0.0
+        self.max_wait_time = 0.0
+
+    def __repr__(self) -> str:
+        return (
+            f"RateLimitStats(requests={self.requests}, delayed={self.delayed}, "
+            f"wait_time={self.wait_time:.3f}, max_wait_time={self.max_wait_time:.3f})"
+        )
+
+    def record(self, delay: float) -> None:
+        self.requests += 1
+        if delay > 0:
+            self.delayed += 1
+            self.wait_time += delay
+            self.max_wait_time = max(self.max_wait_time, delay)
+
+
+class TokenBucket:
+    """A token bucket, refilled at a constant rate up to its capacity.
+
+    Tokens are reserved ahead of time: a request finding the bucket empty takes a token that
+    will only be available later, and waits until then. Waiting requests are thus served in
+    order, and nothing needs to wake them up.
+
+    Attributes:
+    - rate (float): Tokens added per second
+    - capacity (int): Maximum number of tokens, i.e. requests that can be sent in a burst
+    """
+
+    def __init__(self, rate: float, capacity: int = 1) -> None:
+        if rate <= 0 or capacity < 1:
+            raise ValueError("The rate must be positive and the capacity at least 1")
+
+        self.rate = rate
+        self.capacity = capacity
+
+        self._tokens = float(capacity)
+        self._updated = monotonic()
+
+    def reserve(self) -> float:
+        """Take a token, returning the time (in seconds) to wait before using it.
+
+        Not thread-safe, callers must hold a lock.
+        """
+        now = monotonic()
+        self._tokens = min(self._tokens + (now - self._updated) * self.rate, self.capacity)
+        self._updated = now
+
+        self._tokens -= 1
+
+        return -self._tokens / self.rate if self._tokens < 0 else 0.0
+
+
+class RateLimiter:
+    """Client-side rate limiter, with a token bucket per host.
+
+    Pass it to the HTTP clients to delay their requests instead of getting throttled by the
+    servers. A rate limiter can be shared between clients, including sync and async ones,
+    which then share the limits.
+
+    Usage:
+
+    .. code-block:: python
+
+        limiter = RateLimiter(hosts={"raw.githubusercontent.com": (10, 20)}, default=(50, 50))
+        async with AsyncHttpClient(rate_limiter=limiter) as client:
+            ...
+        print(limiter.stats)
+    """
+
+    def __init__(
+        self,
+        hosts: Optional[Dict[str, RateLimit]] = None,
+        default: Optional[RateLimit] = None,
+    ) -> None:
+        """Initialize the rate limiter.
+
+        Args:
+        - hosts (Optional[Dict[str, RateLimit]]): Rate limit of every host, as
+          (requests per second, burst capacity)
+        - default (Optional[RateLimit]): Rate limit of the other hosts, None to not limit them
+        """
+        self.hosts = dict(hosts or {})
+        self.default = default
+
+        self._lock = Lock()
+        self._buckets: Dict[str, Optional[TokenBucket]] = {}
+        self._stats: Dict[str, RateLimitStats] = {}
+
+    @property
+    def stats(self) -> Dict[str, RateLimitStats]:
+        """Metrics of every host requests were sent to."""
+        with self._lock:
+            return dict(self._stats)
+
+    @property
+    def wait_time(self) -> float:
+        """Total time (in seconds) spent waiting, for all hosts."""
+        with self._lock:
+            return sum(stats.wait_time for stats in self._stats.values())
+
+    def set_limit(self, host: str, limit: Optional[RateLimit]) -> None:
+        """Set the rate limit of a host, None to not limit it."""
+        with self._lock:
+            if limit is None:
+                self.hosts.pop(host, None)
+            else:
+                self.hosts[host] = limit
+
+            self._buckets.pop(host, None)
+
+    def reserve(self, host: str) -> float:
+        """Reserve a request to a host, returning the time (in seconds) to wait before sending it.
+
+        Prefer wait() and async_wait(), which wait for this time.
+        """
+        with self._lock:
+            try:
+                bucket = self._buckets[host]
+            except KeyError:
+                limit = self.hosts.get(host, self.default)
+                bucket = self._buckets[host] = TokenBucket(*limit) if limit is not None else None
+
+            delay = bucket.reserve() if bucket is not None else 0.0
+
+            stats = self._stats.get(host)
+            if stats is None:
+                stats = self._stats[host] = RateLimitStats()
+            stats.record(delay)
+
+        return delay
+
+    def wait(self, host: str) -> None:
+        """Block until a request can be sent to a host."""
+        delay = self.reserve(host)
+        if delay > 0:
+            sleep(delay)
+
+    async def async_wait(self, host: str) -> None:
+        """Wait until a request can be sent to a host."""
+        delay = self.reserve(host)
+        if delay > 0:
+            await asyncio.sleep(delay)
@@ -0,0 +1,171 @@
+#
+# SPDX-FileCopyrightText: The LineageOS Project
+# SPDX-License-Identifier: LGPL-3.0-or-later
+#
+
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+import math
+from random import uniform
+from threading import Lock
+from time import monotonic
+from typing import Dict, FrozenSet, Iterable, Optional
+
+DEFAULT_CONNECT_TIMEOUT = 10.0
+"""Default maximum time (in seconds) to establish a connection."""
+
+DEFAULT_READ_TIMEOUT = 30.0
+"""Default maximum time (in seconds) to wait for data from the server."""
+
+DEFAULT_RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+"""HTTP statuses retried by default, as they're usually transient."""
+
+
+class CircuitOpenError(ConnectionError):
+    """Raised instead of sending a request to a host whose circuit breaker is open."""
+
+
+class RetryPolicy:
+    """When and after how long failed requests are retried.
+
+    Connection errors, timeouts and responses with a retried status are retried, with an
+    exponential backoff: the n-th retry waits up to backoff * 2^n seconds (capped at
+    max_backoff), a random time in that range if jitter is enabled so that many clients don't
+    retry in lockstep. A Retry-After header sent by the server takes precedence.
+
+    Attributes:
+    - attempts (int): Maximum number of attempts, including the first one
+    - backoff (float): Base delay (in seconds) before retrying
+    - max_backoff (float): Maximum delay (in seconds) before retrying
+    - jitter (bool): Whether to randomize the delays
+    - statuses (FrozenSet[int]): The HTTP statuses that are retried
+    - max_retry_after (float): Maximum delay (in seconds) honored from a Retry-After header
+    """
+
+    def __init__(
+        self,
+        attempts: int = 3,
+        backoff: float = 0.5,
+        max_backoff: float = 30.0,
+        jitter: bool = True,
+        statuses: Iterable[int] = DEFAULT_RETRY_STATUSES,
+        max_retry_after: float = 60.0,
+    ) -> None:
+        self.attempts = attempts
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+        self.statuses: FrozenSet[int] = frozenset(statuses)
+        self.max_retry_after = max_retry_after
+
+    def can_retry(self, attempt: int) -> bool:
+        """Whether a request that failed at the given attempt (starting from 0) can be retried."""
+        return attempt + 1 < self.attempts
+
+    def should_retry_status(self, status: int, attempt: int) -> bool:
+        """Whether a response with the given status should be retried."""
+        return status in self.statuses and self.can_retry(attempt)
+
+    def get_delay(self, attempt: int, retry_after: Optional[str] = None) -> float:
+        """Get the time (in seconds) to wait before retrying after the given attempt.
+
+        Args:
+        - attempt (int): The attempt that failed, starting from 0
+        - retry_after (Optional[str]): The Retry-After header of the response, if any
+        """
+        if retry_after is not None:
+            delay = parse_retry_after(retry_after)
+            if delay is not None:
+                return min(delay, self.max_retry_after)
+
+        delay = min(self.backoff * 2**attempt, self.max_backoff)
+
+        return uniform(0, delay) if self.jitter else delay
+
+
+DEFAULT_RETRY_POLICY = RetryPolicy()
+"""Retry policy used by the HTTP clients unless specified otherwise."""
+
+
+class CircuitBreaker:
+    """Per-host circuit breaker.
+
+    After failure_threshold consecutive failures (connection errors, timeouts or 5xx
+    responses) the circuit of a host opens: requests to it fail right away with
+    CircuitOpenError, instead of waiting for timeouts. After reset_timeout seconds a single
+    trial request is let through, closing the circuit if it succeeds or opening it again
+    otherwise.
+
+    A circuit breaker can be shared between clients, including sync and async ones.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0) -> None:
+        """Initialize the circuit breaker.
+
+        Args:
+        - failure_threshold (int): Number of consecutive failures opening the circuit of a host
+        - reset_timeout (float): Time (in seconds) after which an open circuit lets a trial
+          request through
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+
+        self._lock = Lock()
+        self._failures: Dict[str, int] = {}
+        self._opened_at: Dict[str, float] = {}
+
+    def is_open(self, host: str) -> bool:
+        """Whether requests to a host are currently rejected."""
+        with self._lock:
+            opened_at = self._opened_at.get(host)
+            return opened_at is not None and monotonic() - opened_at < self.reset_timeout
+
+    def check(self, host: str) -> None:
+        """Call before sending a request to a host.
+
+        Raises CircuitOpenError if the circuit of the host is open.
+        """
+        with self._lock:
+            opened_at = self._opened_at.get(host)
+            if opened_at is None:
+                return
+
+            now = monotonic()
+            if now - opened_at < self.reset_timeout:
+                raise CircuitOpenError(f"Too many failures from {host}, not sending requests")
+
+            # Let this request through as a trial, the others wait for its outcome
+            self._opened_at[host] = now
+
+    def record_success(self, host: str) -> None:
+        """Call after a request to a host succeeded."""
+        with self._lock:
+            self._failures.pop(host, None)
+            self._opened_at.pop(host, None)
+
+    def record_failure(self, host: str) -> None:
+        """Call after a request to a host failed."""
+        with self._lock:
+            failures = self._failures[host] = self._failures.get(host, 0) + 1
+            if failures >= self.failure_threshold:
+                self._opened_at[host] = monotonic()
+
+
+def parse_retry_after(value: str) -> Optional[float]:
+    """Parse a Retry-After header (seconds or HTTP date) into a delay in seconds."""
+    try:
+        seconds = float(value)
+    except ValueError:
+        pass
+    else:
+        return max(seconds, 0.0) if math.isfinite(seconds) else None
+
+    try:
+        date = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+
+    if date.tzinfo is None:
+        date = date.replace(tzinfo=timezone.utc)
+
+    return max((date - datetime.now(timezone.utc)).total_seconds(), 0.0)
@@ -4,7 +4,7 @@
 #
 """LineageOS updater v1 API."""
 
-from typing import Dict, List
+from typing import AsyncIterator, Dict, Iterator, List, Optional, Tuple
 
 from liblineage.updater import BASE_API_URL
 from liblineage.updater.v1._deserializer import (
@@ -13,7 +13,12 @@ from liblineage.updater.v1._deserializer import (
     get_devices,
 )
 from liblineage.updater.v1.build import Build
-from liblineage.updater.http_utils import AsyncHttpRequests, SyncHttpRequests
+from liblineage.updater.http_utils import (
+    AsyncHttpClient,
+    AsyncHttpRequests,
+    SyncHttpClient,
+    SyncHttpRequests,
+)
 
 API_URL = f"{BASE_API_URL}/v1"
 
@@ -21,42 +26,114 @@ API_URL = f"{BASE_API_URL}/v1"
 class AsyncV1Api:
     @staticmethod
     async def get_device_builds(
-        device: str, rom_type: str, incremental_version: str
+        device: str,
+        rom_type: str,
+        incremental_version: str,
+        client: Optional[AsyncHttpClient] = None,
+        lazy: bool = False,
     ) -> List[Build]:
-        """Get the list of builds for a device."""
+        """Get the list of builds for a device.
+
+        If lazy is True, the builds are decoded on first access (see Build.from_json()).
+        """
         json = await AsyncHttpRequests.get_json(
-            f"{API_URL}/{device}/{rom_type}/{incremental_version}"
+            f"{API_URL}/{device}/{rom_type}/{incremental_version}", client=client
         )
-        return get_device_builds(json)
+        return get_device_builds(json, lazy)
+
+    @staticmethod
+    async def iter_device_builds(
+        device: str,
+        rom_type: str,
+        incremental_version: str,
+        client: Optional[AsyncHttpClient] = None,
+        lazy: bool = False,
+    ) -> AsyncIterator[Build]:
+        """Iterate over the builds of a device, decoding them while the response is streamed.
+
+        Memory usage doesn't depend on the number of builds.
+        If lazy is True, the builds are decoded on first access (see Build.from_json()).
+        """
+        async for build in AsyncHttpRequests.iter_json(
+            f"{API_URL}/{device}/{rom_type}/{incremental_version}", ("response",), client=client
+        ):
+            yield Build.from_json(build, lazy)
 
     @staticmethod
-    async def get_device_types(device: str) -> List[str]:
+    async def get_device_types(device: str, client: Optional[AsyncHttpClient] = None) -> List[str]:
         """Get the list of available build types for a device."""
-        json = await AsyncHttpRequests.get_json(f"{API_URL}/types/{device}")
+        json = await AsyncHttpRequests.get_json(f"{API_URL}/types/{device}", client=client)
         return get_device_types(json)
 
     @staticmethod
-    async def get_devices() -> Dict[str, List[str]]:
+    async def get_devices(client: Optional[AsyncHttpClient] = None) -> Dict[str, List[str]]:
         """Get the list of maintained devices, as a dictionary of version to list of devices."""
-        json = await AsyncHttpRequests.get_json(f"{API_URL}/devices")
+        json = await AsyncHttpRequests.get_json(f"{API_URL}/devices", client=client)
         return get_devices(json)
 
+    @staticmethod
+    async def iter_devices(
+        client: Optional[AsyncHttpClient] = None,
+    ) -> AsyncIterator[Tuple[str, List[str]]]:
+        """Iterate over the maintained devices, as (version, list of devices) tuples, decoding
+        them while the response is streamed."""
+        async for version, devices in AsyncHttpRequests.iter_json(
+            f"{API_URL}/devices", client=client
+        ):
+            yield version, devices
+
 
 class SyncV1Api:
     @staticmethod
-    def get_device_builds(device: str, rom_type: str, incremental_version: str) -> List[Build]:
-        """Get the list of builds for a device."""
-        json = SyncHttpRequests.get_json(f"{API_URL}/{device}/{rom_type}/{incremental_version}")
-        return get_device_builds(json)
+    def get_device_builds(
+        device: str,
+        rom_type: str,
+        incremental_version: str,
+        client: Optional[SyncHttpClient] = None,
+        lazy: bool = False,
+    ) -> List[Build]:
+        """Get the list of builds for a device.
+
+        If lazy is True, the builds are decoded on first access (see Build.from_json()).
+        """
+        json = SyncHttpRequests.get_json(
+            f"{API_URL}/{device}/{rom_type}/{incremental_version}", client=client
+        )
+        return get_device_builds(json, lazy)
 
     @staticmethod
-    def get_device_types(device: str) -> List[str]:
+    def iter_device_builds(
+        device: str,
+        rom_type: str,
+        incremental_version: str,
+        client: Optional[SyncHttpClient] = None,
+        lazy: bool = False,
+    ) -> Iterator[Build]:
+        """Iterate over the builds of a device, decoding them while the response is streamed.
+
+        Memory usage doesn't depend on the number of builds.
+        If lazy is True, the builds are decoded on first access (see Build.from_json()).
+        """
+        for build in SyncHttpRequests.iter_json(
+            f"{API_URL}/{device}/{rom_type}/{incremental_version}", ("response",), client=client
+        ):
+            yield Build.from_json(build, lazy)
+
+    @staticmethod
+    def get_device_types(device: str, client: Optional[SyncHttpClient] = None) -> List[str]:
         """Get the list of available build types for a device."""
-        json = SyncHttpRequests.get_json(f"{API_URL}/types/{device}")
+        json = SyncHttpRequests.get_json(f"{API_URL}/types/{device}", client=client)
         return get_device_types(json)
 
     @staticmethod
-    def get_devices() -> Dict[str, List[str]]:
+    def get_devices(client: Optional[SyncHttpClient] = None) -> Dict[str, List[str]]:
         """Get the list of maintained devices, as a dictionary of version to list of devices."""
-        json = SyncHttpRequests.get_json(f"{API_URL}/devices")
+        json = SyncHttpRequests.get_json(f"{API_URL}/devices", client=client)
         return get_devices(json)
+
+    @staticmethod
+    def iter_devices(client: Optional[SyncHttpClient] = None) -> Iterator[Tuple[str, List[str]]]:
+        """Iterate over the maintained devices, as (version, list of devices) tuples, decoding
+        them while the response is streamed."""
+        for version, devices in SyncHttpRequests.iter_json(f"{API_URL}/devices", client=client):
+            yield version, devices
@@ -5,11 +5,13 @@
 
 from typing import Any, Dict, List
 
+from liblineage.updater.instrumentation import instrument_decode
 from liblineage.updater.v1.build import Build
 
 
-def get_device_builds(json: Dict[str, List[Any]]) -> List[Build]:
-    return [Build.from_json(build) for build in json["response"]]
+@instrument_decode("v1.device_builds")
+def get_device_builds(json: Dict[str, List[Any]], lazy: bool = False) -> List[Build]:
+    return [Build.from_json(build, lazy) for build in json["response"]]
 
 
 def get_device_types(json: Dict[str, List[Any]]) -> List[str]:
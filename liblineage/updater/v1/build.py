@@ -3,11 +3,13 @@
 # SPDX-License-Identifier: LGPL-3.0-or-later
 #
 
-from datetime import datetime
-from typing import Any, Dict
+import datetime as dt
+from typing import Any, Dict, Optional
 
+from liblineage.updater._model import Model
 
-class Build:
+
+class Build(Model):
     """LineageOS device build informations.
 
     Attributes:
@@ -20,9 +22,13 @@ class Build:
     - version (str): The LineageOS version of the update (e.g. 18.1)
     """
 
+    __slots__ = ("_datetime", "_timestamp", "filename", "id", "romtype", "size", "url", "version")
+
+    _fields = ("datetime", "filename", "id", "romtype", "size", "url", "version")
+
     def __init__(
         self,
-        datetime: datetime,
+        datetime: dt.datetime,
         filename: str,
         id: str,
         romtype: str,
@@ -31,7 +37,8 @@ class Build:
         version: str,
     ):
         """Initialize the full update information."""
-        self.datetime = datetime
+        self._datetime: Optional[dt.datetime] = datetime
+        self._timestamp: Optional[int] = None
         self.filename = filename
         self.id = id
         self.romtype = romtype
@@ -40,14 +47,46 @@ class Build:
         self.version = version
 
     @classmethod
-    def from_json(cls, update: Dict[str, Any]):
-        """Create an object from a JSON object."""
-        return cls(
-            datetime.fromtimestamp(update["datetime"]),
-            update["filename"],
-            update["id"],
-            update["romtype"],
-            update["size"],
-            update["url"],
-            update["version"],
-        )
+    def from_json(cls, update: Dict[str, Any], lazy: bool = False):
+        """Create an object from a JSON object.
+
+        If lazy is True, datetime is decoded from the JSON object on first access instead of
+        right away, which is cheaper when only some of the builds are used.
+        """
+        if not lazy:
+            return cls(
+                dt.datetime.fromtimestamp(update["datetime"]),
+                update["filename"],
+                update["id"],
+                update["romtype"],
+                update["size"],
+                update["url"],
+                update["version"],
+            )
+
+        build = cls.__new__(cls)
+
+        build._datetime = None
+        build._timestamp = update["datetime"]
+        build.filename = update["filename"]
+        build.id = update["id"]
+        build.romtype = update["romtype"]
+        build.size = update["size"]
+        build.url = update["url"]
+        build.version = update["version"]
+
+        return build
+
+    @property
+    def datetime(self) -> dt.datetime:
+        if self._datetime is None:
+            assert self._timestamp is not None
+            self._datetime = dt.datetime.fromtimestamp(self._timestamp)
+            self._timestamp = None
+
+        return self._datetime
+
+    @datetime.setter
+    def datetime(self, value: dt.datetime) -> None:
+        self._datetime = value
+        self._timestamp = None
@@ -4,57 +4,141 @@
 #
 """LineageOS updater v2 API."""
 
-from typing import List
+from typing import AsyncIterator, Iterable, Iterator, List, Optional, Tuple, Union
 
 from liblineage.updater import BASE_API_URL
 from liblineage.updater.v2._deserializer import (
     get_oems,
     get_device,
-    get_device_builds,
+    decode_device_builds,
 )
 from liblineage.updater.v2.build import Build
 from liblineage.updater.v2.device import Device
 from liblineage.updater.v2.oem import Oem
-from liblineage.updater.http_utils import AsyncHttpRequests, SyncHttpRequests
+from liblineage.updater.http_utils import (
+    DEFAULT_CONCURRENCY,
+    AsyncHttpClient,
+    AsyncHttpRequests,
+    SyncHttpClient,
+    SyncHttpRequests,
+    fetch_many,
+)
 
 API_URL = f"{BASE_API_URL}/v2"
 
 
 class AsyncV2Api:
     @staticmethod
-    async def get_oems() -> List[Oem]:
+    async def get_oems(client: Optional[AsyncHttpClient] = None) -> List[Oem]:
         """Get the list of OEMs."""
-        json = await AsyncHttpRequests.get_json(f"{API_URL}/oems")
+        json = await AsyncHttpRequests.get_json(f"{API_URL}/oems", client=client)
         return get_oems(json)
 
     @staticmethod
-    async def get_device(device: str) -> Device:
+    async def get_device(device: str, client: Optional[AsyncHttpClient] = None) -> Device:
         """Get the device information."""
-        json = await AsyncHttpRequests.get_json(f"{API_URL}/devices/{device}")
+        json = await AsyncHttpRequests.get_json(f"{API_URL}/devices/{device}", client=client)
         return get_device(json)
 
     @staticmethod
-    async def get_device_builds(device: str) -> List[Build]:
-        """Get the list of builds for a device."""
-        json = await AsyncHttpRequests.get_json(f"{API_URL}/devices/{device}/builds")
-        return get_device_builds(json)
+    async def get_device_builds(
+        device: str, client: Optional[AsyncHttpClient] = None, lazy: bool = False
+    ) -> List[Build]:
+        """Get the list of builds for a device.
+
+        If lazy is True, the builds are decoded on first access (see Build.from_json()).
+        """
+        data = await AsyncHttpRequests.get_bytes(
+            f"{API_URL}/devices/{device}/builds", client=client
+        )
+        return decode_device_builds(data, lazy)
+
+    @staticmethod
+    async def iter_device_builds(
+        device: str, client: Optional[AsyncHttpClient] = None, lazy: bool = False
+    ) -> AsyncIterator[Build]:
+        """Iterate over the builds of a device, decoding them while the response is streamed.
+
+        Memory usage doesn't depend on the number of builds.
+        If lazy is True, the builds are decoded on first access (see Build.from_json()).
+        """
+        async for build in AsyncHttpRequests.iter_json(
+            f"{API_URL}/devices/{device}/builds", client=client
+        ):
+            yield Build.from_json(build, lazy)
+
+    @staticmethod
+    async def get_many_device_builds(
+        devices: Iterable[str],
+        concurrency: int = DEFAULT_CONCURRENCY,
+        client: Optional[AsyncHttpClient] = None,
+        lazy: bool = False,
+    ) -> AsyncIterator[Tuple[str, Union[List[Build], Exception]]]:
+        """Get the list of builds for many devices concurrently.
+
+        Results are yielded as soon as they're available, as (device, builds) tuples.
+        If fetching the builds of a device fails, the raised exception is yielded in place of
+        its list of builds, without affecting the other devices.
+
+        Usage:
+
+        .. code-block:: python
+
+            async for device, builds in AsyncV2Api.get_many_device_builds(devices):
+                if isinstance(builds, Exception):
+                    print(f"{device}: {builds}")
+                    continue
+                ...
+        """
+        if client is None:
+            async with AsyncHttpClient(limit_per_host=concurrency) as owned_client:
+                async for result in AsyncV2Api.get_many_device_builds(
+                    devices, concurrency, owned_client, lazy
+                ):
+                    yield result
+            return
+
+        async def fetch(device: str) -> List[Build]:
+            return await AsyncV2Api.get_device_builds(device, client=client, lazy=lazy)
+
+        async for result in fetch_many(fetch, devices, concurrency):
+            yield result
 
 
 class SyncV2Api:
     @staticmethod
-    def get_oems() -> List[Oem]:
+    def get_oems(client: Optional[SyncHttpClient] = None) -> List[Oem]:
         """Get the list of OEMs."""
-        json = SyncHttpRequests.get_json(f"{API_URL}/oems")
+        json = SyncHttpRequests.get_json(f"{API_URL}/oems", client=client)
         return get_oems(json)
 
     @staticmethod
-    def get_device(device: str) -> Device:
+    def get_device(device: str, client: Optional[SyncHttpClient] = None) -> Device:
         """Get the device information."""
-        json = SyncHttpRequests.get_json(f"{API_URL}/devices/{device}")
+        json = SyncHttpRequests.get_json(f"{API_URL}/devices/{device}", client=client)
         return get_device(json)
 
     @staticmethod
-    def get_device_builds(device: str) -> List[Build]:
-        """Get the list of builds for a device."""
-        json = SyncHttpRequests.get_json(f"{API_URL}/devices/{device}/builds")
-        return get_device_builds(json)
+    def get_device_builds(
+        device: str, client: Optional[SyncHttpClient] = None, lazy: bool = False
+    ) -> List[Build]:
+        """Get the list of builds for a device.
+
+        If lazy is True, the builds are decoded on first access (see Build.from_json()).
+        """
+        data = SyncHttpRequests.get_bytes(f"{API_URL}/devices/{device}/builds", client=client)
+        return decode_device_builds(data, lazy)
+
+    @staticmethod
+    def iter_device_builds(
+        device: str, client: Optional[SyncHttpClient] = None, lazy: bool = False
+    ) -> Iterator[Build]:
+        """Iterate over the builds of a device, decoding them while the response is streamed.
+
+        Memory usage doesn't depend on the number of builds.
+        If lazy is True, the builds are decoded on first access (see Build.from_json()).
+        """
+        for build in SyncHttpRequests.iter_json(
+            f"{API_URL}/devices/{device}/builds", client=client
+        ):
+            yield Build.from_json(build, lazy)
@@ -3,20 +3,84 @@
 # SPDX-License-Identifier: LGPL-3.0-or-later
 #
 
+import datetime as dt
 from typing import Any, List
 
+from liblineage.updater.instrumentation import instrument_decode
+from liblineage.updater.json_backend import loads, msgspec
 from liblineage.updater.v2.build import Build
+from liblineage.updater.v2.build_file import BuildFile
 from liblineage.updater.v2.device import Device
 from liblineage.updater.v2.oem import Oem
 
+if msgspec is not None:
+    # Typed schema of the builds list, so that msgspec validates and decodes it in a single pass
+    # without creating intermediate dictionaries
 
+    class _BuildFileStruct(msgspec.Struct):
+        filename: str
+        filepath: str
+        sha1: str
+        sha256: str
+        size: int
+        url: str
+
+    class _BuildStruct(msgspec.Struct):
+        date: str
+        datetime: int
+        files: List[_BuildFileStruct]
+        os_patch_level: str
+        type: str
+        version: str
+
+    _builds_decoder = msgspec.json.Decoder(List[_BuildStruct])
+
+
+@instrument_decode("v2.oems")
 def get_oems(json: List[Any]) -> List[Oem]:
     return [Oem.from_json(oem) for oem in json]
 
 
+@instrument_decode("v2.device")
 def get_device(json: Any) -> Device:
     return Device.from_json(json)
 
 
-def get_device_builds(json: List[Any]) -> List[Build]:
-    return [Build.from_json(build) for build in json]
+def get_device_builds(json: List[Any], lazy: bool = False) -> List[Build]:
+    return [Build.from_json(build, lazy) for build in json]
+
+
+@instrument_decode("v2.device_builds")
+def decode_device_builds(data: bytes, lazy: bool = False) -> List[Build]:
+    """Decode a raw builds list response.
+
+    When msgspec is installed, the builds are decoded straight into typed structs, otherwise
+    (or when lazy is True, since the JSON objects are kept around) the JSON backend is used.
+    """
+    if lazy or msgspec is None:
+        return get_device_builds(loads(data), lazy)
+
+    # Raises msgspec.ValidationError (a ValueError) if the list doesn't match the schema
+    builds = _builds_decoder.decode(data)
+
+    return [
+        Build(
+            build.date,
+            dt.datetime.fromtimestamp(build.datetime),
+            [
+                BuildFile(
+                    file.filename,
+                    file.filepath,
+                    file.sha1,
+                    file.sha256,
+                    file.size,
+                    file.url,
+                )
+                for file in build.files
+            ],
+            build.os_patch_level,
+            build.type,
+            build.version,
+        )
+        for build in builds
+    ]
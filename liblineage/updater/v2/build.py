@@ -3,51 +3,137 @@
 # SPDX-License-Identifier: LGPL-3.0-or-later
 #
 
-from datetime import datetime
-from typing import Any, Dict, List
+import datetime as dt
+from typing import Any, Dict, List, Optional
 
+from liblineage.updater._model import Model
 from liblineage.updater.v2.build_file import BuildFile
 
 
-class Build:
+class Build(Model):
     """LineageOS device build informations.
 
     Attributes:
     - date (str): The date of the build, in ISO 8601 format
     - datetime (datetime): The date of the build, as a date object
     - files (list[BuildFile]): List of files belonging to this build, first one being the OTA zip
+    - ota_zip (BuildFile): The OTA zip of the build
     - os_patch_level (str): The OS patch level of the build in the format "YYYY-MM"
     - build_type (str): The type of the build (nightly, weekly, etc.)
     - version (str): The version of the build (e.g. 21.0)
     """
 
+    __slots__ = (
+        "date",
+        "_datetime",
+        "_timestamp",
+        "_files",
+        "_files_json",
+        "os_patch_level",
+        "build_type",
+        "version",
+    )
+
+    _fields = ("date", "datetime", "files", "os_patch_level", "build_type", "version")
+
     def __init__(
         self,
         date: str,
-        datetime: datetime,
+        datetime: dt.datetime,
         files: List[BuildFile],
         os_patch_level: str,
         build_type: str,
         version: str,
     ) -> None:
         self.date = date
-        self.datetime = datetime
-        self.files = files
         self.os_patch_level = os_patch_level
         self.build_type = build_type
         self.version = version
 
-        self.ota_zip = self.files[0]
+        self._datetime: Optional[dt.datetime] = datetime
+        self._timestamp: Optional[int] = None
+        self._files: Optional[List[BuildFile]] = files
+        self._files_json: Optional[List[Dict[str, Any]]] = None
 
     @classmethod
-    def from_json(cls, json: Dict[str, Any]):
-        """Create an object from a JSON object."""
-
-        return cls(
-            json["date"],
-            datetime.fromtimestamp(json["datetime"]),
-            [BuildFile.from_json(file) for file in json["files"]],
-            json["os_patch_level"],
-            json["type"],
-            json["version"],
-        )
+    def from_json(cls, json: Dict[str, Any], lazy: bool = False):
+        """Create an object from a JSON object.
+
+        If lazy is True, datetime and files are decoded from the JSON object on first access
+        instead of right away, which is cheaper when only some of the builds are used.
+        """
+        if not lazy:
+            return cls(
+                json["date"],
+                dt.datetime.fromtimestamp(json["datetime"]),
+                [BuildFile.from_json(file) for file in json["files"]],
+                json["os_patch_level"],
+                json["type"],
+                json["version"],
+            )
+
+        build = cls.__new__(cls)
+
+        build.date = json["date"]
+        build.os_patch_level = json["os_patch_level"]
+        build.build_type = json["type"]
+        build.version = json["version"]
+
+        build._datetime = None
+        build._timestamp = json["datetime"]
+        build._files = None
+        build._files_json = json["files"]
+
+        return build
+
+    def to_json(self) -> Dict[str, Any]:
+        """Convert the object to a JSON object, in the API format.
+
+        Fields not decoded yet by a lazy object are passed through as-is.
+        """
+        return {
+            "date": self.date,
+            "datetime": (
+                self._timestamp if self._datetime is None else int(self._datetime.timestamp())
+            ),
+            "files": (
+                self._files_json
+                if self._files is None
+                else [file.to_json() for file in self._files]
+            ),
+            "os_patch_level": self.os_patch_level,
+            "type": self.build_type,
+            "version": self.version,
+        }
+
+    @property
+    def datetime(self) -> dt.datetime:
+        if self._datetime is None:
+            assert self._timestamp is not None
+            self._datetime = dt.datetime.fromtimestamp(self._timestamp)
+            self._timestamp = None
+
+        return self._datetime
+
+    @datetime.setter
+    def datetime(self, value: dt.datetime) -> None:
+        self._datetime = value
+        self._timestamp = None
+
+    @property
+    def files(self) -> List[BuildFile]:
+        if self._files is None:
+            assert self._files_json is not None
+            self._files = [BuildFile.from_json(file) for file in self._files_json]
+            self._files_json = None
+
+        return self._files
+
+    @files.setter
+    def files(self, value: List[BuildFile]) -> None:
+        self._files = value
+        self._files_json = None
+
+    @property
+    def ota_zip(self) -> BuildFile:
+        return self.files[0]
@@ -5,8 +5,10 @@
 
 from typing import Any, Dict
 
+from liblineage.updater._model import Model
 
-class BuildFile:
+
+class BuildFile(Model):
     """LineageOS device build files informations.
 
     Attributes:
@@ -18,6 +20,8 @@ class BuildFile:
     - url (str): The URL to download the file
     """
 
+    __slots__ = ("filename", "filepath", "sha1", "sha256", "size", "url")
+
     def __init__(
         self,
         filename: str,
@@ -45,3 +49,14 @@ class BuildFile:
             json["size"],
             json["url"],
         )
+
+    def to_json(self) -> Dict[str, Any]:
+        """Convert the object to a JSON object, in the API format."""
+        return {
+            "filename": self.filename,
+            "filepath": self.filepath,
+            "sha1": self.sha1,
+            "sha256": self.sha256,
+            "size": self.size,
+            "url": self.url,
+        }
@@ -5,8 +5,10 @@
 
 from typing import Any, Dict, List
 
+from liblineage.updater._model import Model
 
-class Device:
+
+class Device(Model):
     """LineageOS device informations.
 
     Attributes:
@@ -18,6 +20,8 @@ class Device:
     - dependencies (list[str]): The list of repositories used to build this device
     """
 
+    __slots__ = ("name", "model", "oem", "info_url", "versions", "dependencies")
+
     def __init__(
         self,
         name: str,
@@ -45,3 +49,14 @@ class Device:
             json["versions"],
             json["dependencies"],
         )
+
+    def to_json(self) -> Dict[str, Any]:
+        """Convert the object to a JSON object, in the API format."""
+        return {
+            "name": self.name,
+            "model": self.model,
+            "oem": self.oem,
+            "info_url": self.info_url,
+            "versions": self.versions,
+            "dependencies": self.dependencies,
+        }
@@ -3,18 +3,21 @@
 # SPDX-License-Identifier: LGPL-3.0-or-later
 #
 
+from liblineage.updater._model import Model
 from liblineage.updater.v2.oem_device import OemDevice
 from typing import Any, Dict
 
 
-class Oem:
+class Oem(Model):
     """LineageOS OEM informations.
 
     Attributes:
-    - name (datetime): The name of the device
+    - name (str): The name of the OEM
     - devices (list[OemDevice]): The list of supported devices from this OEM
     """
 
+    __slots__ = ("name", "devices")
+
     def __init__(
         self,
         name: str,
@@ -30,3 +33,10 @@ class Oem:
             json["name"],
             [OemDevice.from_json(device) for device in json["devices"]],
         )
+
+    def to_json(self) -> Dict[str, Any]:
+        """Convert the object to a JSON object, in the API format."""
+        return {
+            "name": self.name,
+            "devices": [device.to_json() for device in self.devices],
+        }
@@ -5,8 +5,10 @@
 
 from typing import Any, Dict
 
+from liblineage.updater._model import Model
 
-class OemDevice:
+
+class OemDevice(Model):
     """LineageOS OEM's device informations.
 
     Attributes:
@@ -14,6 +16,8 @@ class OemDevice:
     - model (str): The model name of the device
     """
 
+    __slots__ = ("name", "model")
+
     def __init__(
         self,
         name: str,
@@ -29,3 +33,10 @@ class OemDevice:
             json["name"],
             json["model"],
         )
+
+    def to_json(self) -> Dict[str, Any]:
+        """Convert the object to a JSON object, in the API format."""
+        return {
+            "name": self.name,
+            "model": self.model,
+        }
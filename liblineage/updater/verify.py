@@ -0,0 +1,133 @@
+#
+# SPDX-FileCopyrightText: The LineageOS Project
+# SPDX-License-Identifier: LGPL-3.0-or-later
+#
+
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import hashlib
+import mmap
+import os
+from pathlib import Path
+from typing import Iterable, Iterator, Optional, Tuple, Union
+
+from liblineage.updater.v2.build_file import BuildFile
+
+HASH_BLOCK_SIZE = 1024 * 1024
+"""Size of the blocks hashed at once when verifying a file (bytes)."""
+
+
+class BuildFileHasher:
+    """Incremental SHA1 and SHA256 hasher of a build file, fed while it's being downloaded.
+
+    Usage:
+
+    .. code-block:: python
+
+        hasher = BuildFileHasher(build_file)
+        for chunk in chunks:
+            hasher.update(chunk)
+        hasher.verify()
+    """
+
+    def __init__(self, build_file: BuildFile) -> None:
+        self.build_file = build_file
+
+        self.size = 0
+        self._sha1 = hashlib.sha1()
+        self._sha256 = hashlib.sha256()
+
+    def update(self, data: Union[bytes, memoryview]) -> None:
+        """Hash the next chunk of the file.
+
+        Raises ValueError as soon as the data exceeds the size of the build file.
+        """
+        self.size += len(data)
+        if self.size > self.build_file.size:
+            raise ValueError(
+                f"{self.build_file.filename} is larger than expected ({self.build_file.size} bytes)"
+            )
+
+        self._sha1.update(data)
+        self._sha256.update(data)
+
+    def verify(self) -> None:
+        """Check the size and the hashes of the data against the build file.
+
+        Raises ValueError if they don't match.
+        """
+        if self.size != self.build_file.size:
+            raise ValueError(
+                f"Size mismatch for {self.build_file.filename}: "
+                f"expected {self.build_file.size} bytes, got {self.size}"
+            )
+
+        for name, expected, actual in (
+            ("SHA1", self.build_file.sha1, self._sha1.hexdigest()),
+            ("SHA256", self.build_file.sha256, self._sha256.hexdigest()),
+        ):
+            if expected.lower() != actual:
+                raise ValueError(
+                    f"{name} mismatch for {self.build_file.filename}: "
+                    f"expected {expected}, got {actual}"
+                )
+
+
+class BuildFileVerifier:
+    """Verifier of build files already on disk.
+
+    Files are memory-mapped and hashed in a single pass for both SHA1 and SHA256. hashlib
+    releases the GIL while hashing, so verify_many() scales with the number of threads.
+    """
+
+    @staticmethod
+    def verify(build_file: BuildFile, path: Union[Path, str]) -> None:
+        """Verify a file against a build file.
+
+        The size is checked first, without reading the file.
+        Raises ValueError if the file doesn't match, OSError if it can't be read.
+        """
+        hasher = BuildFileHasher(build_file)
+
+        with open(path, "rb") as file:
+            size = os.fstat(file.fileno()).st_size
+            if size != build_file.size:
+                raise ValueError(
+                    f"Size mismatch for {build_file.filename}: "
+                    f"expected {build_file.size} bytes, got {size}"
+                )
+
+            # Empty files can't be mapped
+            if size:
+                with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    view = memoryview(mapped)
+                    try:
+                        for offset in range(0, size, HASH_BLOCK_SIZE):
+                            hasher.update(view[offset : offset + HASH_BLOCK_SIZE])
+                    finally:
+                        # The map can't be closed while exported
+                        view.release()
+
+        hasher.verify()
+
+    @staticmethod
+    def verify_many(
+        files: Iterable[Tuple[BuildFile, Union[Path, str]]],
+        max_workers: Optional[int] = None,
+    ) -> Iterator[Tuple[Path, Optional[BaseException]]]:
+        """Verify many files concurrently with a thread pool.
+
+        Results are yielded as soon as they're available, as (path, error) tuples where error
+        is None if the file is valid, or the exception raised by verify() otherwise.
+
+        Args:
+        - files (Iterable[Tuple[BuildFile, Union[Path, str]]]): The build files and their paths
+        - max_workers (Optional[int]): Number of threads, defaults to the executor's default
+        """
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                executor.submit(BuildFileVerifier.verify, build_file, path): Path(path)
+                for build_file, path in files
+            }
+
+            for future in as_completed(futures):
+                yield futures[future], future.exception()
@@ -0,0 +1,380 @@
+#
+# SPDX-FileCopyrightText: The LineageOS Project
+# SPDX-License-Identifier: LGPL-3.0-or-later
+#
+"""Columnar export of wiki device data, for vectorized analytics.
+
+Devices are flattened into tables of typed columns: floats (NaN when missing), booleans as
+int8 (-1 when missing), dates as days since the UNIX epoch (datetime64[D] with NaT when missing)
+and strings as categorical codes (-1 when missing) indexing a list of categories. The per-model
+values (e.g. a battery per model) are exploded into one row per model.
+
+Columns are NumPy arrays if NumPy is installed, array.array objects (sharing the same memory
+layout) otherwise. Writing Parquet files requires pyarrow.
+
+Usage:
+
+.. code-block:: python
+
+    columns = DeviceColumns.from_devices(DeviceDataLoader.load("lineage_wiki-main.tar.gz"))
+    batteries = columns.batteries
+    print(numpy.nanmedian(batteries["capacity"]))
+    columns.write_parquet("wiki-parquet")
+"""
+
+from array import array
+from datetime import date
+import math
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Union, cast
+
+from liblineage.wiki.data_types._parsing import parse_number
+from liblineage.wiki.data_types.architecture_data import ArchitectureData
+from liblineage.wiki.device_data import DeviceData
+
+try:
+    import numpy  # pyright: ignore[reportMissingImports]
+except ImportError:
+    numpy = None
+
+try:
+    import pyarrow  # pyright: ignore[reportMissingImports]
+    import pyarrow.parquet  # pyright: ignore[reportMissingImports]
+except ImportError:
+    pyarrow = None
+
+FLOAT = "float"
+"""Column of float64 numbers, NaN when missing."""
+
+BOOL = "bool"
+"""Column of int8 booleans (1 or 0), -1 when missing."""
+
+DATE = "date"
+"""Column of int64 days since the UNIX epoch, the minimum int64 (NaT) when missing."""
+
+CATEGORY = "category"
+"""Column of int32 codes indexing the categories of the column, -1 when missing."""
+
+MISSING_DATE = -(2**63)
+"""Value of a missing date, NumPy's NaT."""
+
+_TYPECODES = {FLOAT: "d", BOOL: "b", DATE: "q", CATEGORY: "i"}
+_DTYPES = {FLOAT: "float64", BOOL: "int8", DATE: "datetime64[D]", CATEGORY: "int32"}
+_EPOCH = date(1970, 1, 1).toordinal()
+
+
+class ColumnarTable:
+    """A table of typed columns of the same length.
+
+    Attributes:
+    - kinds (Dict[str, str]): Kind of every column (FLOAT, BOOL, DATE or CATEGORY)
+    - columns (Dict[str, Any]): The columns, NumPy arrays if NumPy is installed, array.array
+      objects otherwise
+    - categories (Dict[str, List[str]]): Categories of the CATEGORY columns, indexed by the codes
+    """
+
+    def __init__(
+        self,
+        kinds: Dict[str, str],
+        columns: Dict[str, Any],
+        categories: Dict[str, List[str]],
+    ) -> None:
+        self.kinds = kinds
+        self.columns = columns
+        self.categories = categories
+
+    def __len__(self) -> int:
+        return len(next(iter(self.columns.values()), ()))
+
+    def __getitem__(self, column: str) -> Any:
+        return self.columns[column]
+
+    def decode(self, column: str) -> List[Optional[str]]:
+        """Get the values of a CATEGORY column, None when missing."""
+        categories = self.categories[column]
+        return [categories[code] if code >= 0 else None for code in self.columns[column]]
+
+    def to_arrow(self) -> Any:
+        """Convert to a pyarrow Table, CATEGORY columns become dictionary arrays."""
+        if pyarrow is None:
+            raise RuntimeError("Converting to Arrow requires pyarrow")
+
+        arrays = {}
+        for name, kind in self.kinds.items():
+            column = self.columns[name]
+            if kind == DATE and numpy is not None:
+                column = column.view("int64")
+            elif numpy is None:
+                column = column.tolist()
+
+            if kind == FLOAT:
+                arrays[name] = pyarrow.array(column, pyarrow.float64(), from_pandas=True)
+            elif kind == BOOL:
+                arrays[name] = pyarrow.array(
+                    [bool(value) if value >= 0 else None for value in column], pyarrow.bool_()
+                )
+            elif kind == DATE:
+                arrays[name] = pyarrow.array(
+                    [int(value) if value != MISSING_DATE else None for value in column],
+                    pyarrow.date32(),
+                )
+            else:
+                codes = pyarrow.array(
+                    [code if code >= 0 else None for code in column], pyarrow.int32()
+                )
+                arrays[name] = pyarrow.DictionaryArray.from_arrays(
+                    codes, pyarrow.array(self.categories[name], pyarrow.string())
+                )
+
+        return pyarrow.table(arrays)
+
+    def write_parquet(self, path: Union[Path, str]) -> None:
+        """Write the table to a Parquet file (requires pyarrow)."""
+        table = self.to_arrow()
+        assert pyarrow is not None
+        pyarrow.parquet.write_table(table, str(path))
+
+
+class _TableBuilder:
+    def __init__(self, kinds: Dict[str, str]) -> None:
+        self.kinds = kinds
+        self.columns = {name: array(_TYPECODES[kind]) for name, kind in kinds.items()}
+        self.codes: Dict[str, Dict[str, int]] = {
+            name: {} for name, kind in kinds.items() if kind == CATEGORY
+        }
+
+    def append(self, **values: Any) -> None:
+        for name, kind in self.kinds.items():
+            value = values.get(name)
+            column = self.columns[name]
+
+            if kind == FLOAT:
+                column.append(math.nan if value is None else float(value))
+            elif kind == BOOL:
+                column.append(-1 if value is None else int(bool(value)))
+            elif kind == DATE:
+                column.append(MISSING_DATE if value is None else value.toordinal() - _EPOCH)
+            elif value is None:
+                column.append(-1)
+            else:
+                codes = self.codes[name]
+                column.append(codes.setdefault(str(value), len(codes)))
+
+    def build(self) -> ColumnarTable:
+        if numpy is None:
+            columns: Dict[str, Any] = dict(self.columns)
+        else:
+            # Same memory layout, no copy
+            columns = {
+                name: numpy.frombuffer(column, dtype=_DTYPES[self.kinds[name]])
+                for name, column in self.columns.items()
+            }
+
+        categories = {name: list(codes) for name, codes in self.codes.items()}
+
+        return ColumnarTable(self.kinds, columns, categories)
+
+
+class DeviceColumns:
+    """Columnar tables of wiki device data.
+
+    Every table has a device column, with the name of the device, and the per-model tables a
+    model column, missing when the value applies to all the models.
+
+    Attributes:
+    - devices (ColumnarTable): One row per device, with its scalar fields and its earliest
+      release date
+    - batteries (ColumnarTable): One row per battery (capacity in mAh)
+    - screens (ColumnarTable): One row per screen (size in inches, resolution in pixels)
+    - dimensions (ColumnarTable): One row per dimensions (in mm)
+    - releases (ColumnarTable): One row per release date
+    """
+
+    DEVICE_COLUMNS = {
+        "device": CATEGORY,
+        "codename": CATEGORY,
+        "name": CATEGORY,
+        "vendor": CATEGORY,
+        "type": CATEGORY,
+        "soc": CATEGORY,
+        "architecture": CATEGORY,
+        "cpu_cores": FLOAT,
+        "cpu_freq": FLOAT,
+        "current_branch": FLOAT,
+        "versions": FLOAT,
+        "maintainers": FLOAT,
+        "models": FLOAT,
+        "release": DATE,
+        "is_ab_device": BOOL,
+        "is_unlockable": BOOL,
+    }
+    """Columns of the devices table, cpu_freq is the highest one (GHz), versions, maintainers and
+    models are counts."""
+
+    BATTERY_COLUMNS = {
+        "device": CATEGORY,
+        "model": CATEGORY,
+        "capacity": FLOAT,
+        "removable": BOOL,
+        "tech": CATEGORY,
+    }
+    """Columns of the batteries table."""
+
+    SCREEN_COLUMNS = {
+        "device": CATEGORY,
+        "model": CATEGORY,
+        "size": FLOAT,
+        "width": FLOAT,
+        "height": FLOAT,
+        "ppi": FLOAT,
+        "technology": CATEGORY,
+        "refresh_rate": FLOAT,
+    }
+    """Columns of the screens table."""
+
+    DIMENSION_COLUMNS = {
+        "device": CATEGORY,
+        "model": CATEGORY,
+        "height": FLOAT,
+        "width": FLOAT,
+        "depth": FLOAT,
+    }
+    """Columns of the dimensions table."""
+
+    RELEASE_COLUMNS = {
+        "device": CATEGORY,
+        "model": CATEGORY,
+        "release": DATE,
+    }
+    """Columns of the releases table."""
+
+    def __init__(
+        self,
+        devices: ColumnarTable,
+        batteries: ColumnarTable,
+        screens: ColumnarTable,
+        dimensions: ColumnarTable,
+        releases: ColumnarTable,
+    ) -> None:
+        self.devices = devices
+        self.batteries = batteries
+        self.screens = screens
+        self.dimensions = dimensions
+        self.releases = releases
+
+    @property
+    def tables(self) -> Dict[str, ColumnarTable]:
+        """All the tables, by name."""
+        return {
+            "devices": self.devices,
+            "batteries": self.batteries,
+            "screens": self.screens,
+            "dimensions": self.dimensions,
+            "releases": self.releases,
+        }
+
+    @classmethod
+    def from_devices(
+        cls, devices: Union[Mapping[str, DeviceData], Iterable[DeviceData]]
+    ) -> "DeviceColumns":
+        """Flatten device data into columns.
+
+        Args:
+        - devices (Union[Mapping[str, DeviceData], Iterable[DeviceData]]): The devices, either
+          by device name (as returned by DeviceDataLoader.load()) or named by their codename
+        """
+        if isinstance(devices, Mapping):
+            items = cast(Mapping[str, DeviceData], devices).items()
+        else:
+            items = ((device.codename, device) for device in cast(Iterable[DeviceData], devices))
+
+        device_rows = _TableBuilder(cls.DEVICE_COLUMNS)
+        battery_rows = _TableBuilder(cls.BATTERY_COLUMNS)
+        screen_rows = _TableBuilder(cls.SCREEN_COLUMNS)
+        dimension_rows = _TableBuilder(cls.DIMENSION_COLUMNS)
+        release_rows = _TableBuilder(cls.RELEASE_COLUMNS)
+
+        for name, device in items:
+            releases = _explode(device.release)
+
+            architecture = device.architecture
+            if isinstance(architecture, ArchitectureData):
+                architecture = architecture.cpu
+
+            device_rows.append(
+                device=name,
+                codename=device.codename,
+                name=device.name,
+                vendor=device.vendor,
+                type=device.type,
+                soc=", ".join(device.soc) if isinstance(device.soc, list) else device.soc,
+                architecture=architecture,
+                cpu_cores=parse_number(device.cpu_cores),
+                cpu_freq=device.cpu_freq_ghz,
+                current_branch=device.current_branch,
+                versions=len(device.versions or ()),
+                maintainers=len(device.maintainers or ()),
+                models=len(device.models) if isinstance(device.models, list) else None,
+                release=min((release for _, release in releases), default=None),
+                is_ab_device=device.is_ab_device,
+                is_unlockable=device.is_unlockable,
+            )
+
+            for model, release in releases:
+                release_rows.append(device=name, model=model, release=release)
+
+            for model, battery in _explode(device.battery):
+                battery_rows.append(
+                    device=name,
+                    model=model,
+                    capacity=battery.capacity_mah,
+                    removable=battery.removable,
+                    tech=battery.tech,
+                )
+
+            for model, screen in _explode(device.screen):
+                screen_rows.append(
+                    device=name,
+                    model=model,
+                    size=screen.size_in,
+                    width=screen.width_px,
+                    height=screen.height_px,
+                    ppi=screen.ppi,
+                    technology=screen.technology,
+                    refresh_rate=parse_number(screen.refresh_rate),
+                )
+
+            for model, dimensions in _explode(device.dimensions):
+                dimension_rows.append(
+                    device=name,
+                    model=model,
+                    height=dimensions.height_mm,
+                    width=dimensions.width_mm,
+                    depth=dimensions.depth_mm,
+                )
+
+        return cls(
+            device_rows.build(),
+            battery_rows.build(),
+            screen_rows.build(),
+            dimension_rows.build(),
+            release_rows.build(),
+        )
+
+    def write_parquet(self, directory: Union[Path, str]) -> None:
+        """Write every table to <directory>/<table>.parquet (requires pyarrow)."""
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+
+        for name, table in self.tables.items():
+            table.write_parquet(directory / f"{name}.parquet")
+
+
+def _explode(value: Any) -> Sequence[Any]:
+    # (model, value) pairs of a value that may be per model, model is None when it's not
+    if value is None:
+        return []
+    if isinstance(value, dict):
+        return list(value.items())
+
+    return [(None, value)]
@@ -0,0 +1,96 @@
+#
+# SPDX-FileCopyrightText: The LineageOS Project
+# SPDX-License-Identifier: LGPL-3.0-or-later
+#
+
+import re
+from typing import Any, Optional, Tuple
+
+MM_PER_INCH = 25.4
+"""Millimetres in an inch."""
+
+_NUMBER = r"(\d+(?:\.\d+)?)"
+_INCHES = re.compile(rf"{_NUMBER}\s*(?:in\b|inch|\"|″)", re.IGNORECASE)
+_MILLIMETRES = re.compile(rf"{_NUMBER}\s*mm\b", re.IGNORECASE)
+_CENTIMETRES = re.compile(rf"{_NUMBER}\s*cm\b", re.IGNORECASE)
+_BARE_NUMBER = re.compile(rf"^\s*{_NUMBER}\s*$")
+_FIRST_NUMBER = re.compile(_NUMBER)
+_THOUSANDS_SEPARATOR = re.compile(r"(?<=\d)[,\s](?=\d{3}\b)")
+_RESOLUTION = re.compile(r"(\d+)\s*[x×*]\s*(\d+)", re.IGNORECASE)
+_FREQUENCY = re.compile(rf"{_NUMBER}\s*([GM])hz", re.IGNORECASE)
+
+
+def parse_inches(value: Any) -> Optional[float]:
+    """Parse a length in inches, e.g. 6.1 for "6.1 in" or "155 mm (6.1 in)".
+
+    Bare numbers are assumed to be inches, lengths only given in millimetres are converted.
+    """
+    if value is None or isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+
+    text = str(value)
+    for pattern, scale in ((_INCHES, 1.0), (_BARE_NUMBER, 1.0), (_MILLIMETRES, 1 / MM_PER_INCH)):
+        match = pattern.search(text)
+        if match:
+            return float(match[1]) * scale
+
+    return None
+
+
+def parse_millimetres(value: Any) -> Optional[float]:
+    """Parse a length in millimetres, e.g. 158 for "158 mm (6.22 in)".
+
+    Bare numbers are assumed to be millimetres, lengths only given in centimetres or inches
+    are converted.
+    """
+    if value is None or isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+
+    text = str(value)
+    for pattern, scale in (
+        (_MILLIMETRES, 1.0),
+        (_BARE_NUMBER, 1.0),
+        (_CENTIMETRES, 10.0),
+        (_INCHES, MM_PER_INCH),
+    ):
+        match = pattern.search(text)
+        if match:
+            return float(match[1]) * scale
+
+    return None
+
+
+def parse_number(value: Any) -> Optional[float]:
+    """Parse the first number of a value, e.g. 4000 for "4000 mAh" or "4,000 mAh"."""
+    if value is None or isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+
+    match = _FIRST_NUMBER.search(_THOUSANDS_SEPARATOR.sub("", str(value)))
+    return float(match[1]) if match else None
+
+
+def parse_resolution(value: Any) -> Optional[Tuple[int, int]]:
+    """Parse a resolution into (width, height) pixels, e.g. (1080, 2400) for "1080x2400"."""
+    if value is None:
+        return None
+
+    match = _RESOLUTION.search(str(value))
+    return (int(match[1]), int(match[2])) if match else None
+
+
+def parse_max_frequency(value: Any) -> Optional[float]:
+    """Parse the highest frequency in GHz, e.g. 2.84 for "1 x 2.84 GHz + 3 x 2.42 GHz"."""
+    if value is None:
+        return None
+
+    frequencies = [
+        float(number) / (1000 if unit.upper() == "M" else 1)
+        for number, unit in _FREQUENCY.findall(str(value))
+    ]
+    return max(frequencies, default=None)
@@ -6,6 +6,7 @@
 from typing import Dict, Union
 
 from liblineage.wiki.data_types.base_data import BaseData
+from liblineage.wiki.data_types.schema import OneOf, Record, Value
 
 
 class ArchitectureData(BaseData):
@@ -30,11 +31,8 @@ class ArchitectureData(BaseData):
     @classmethod
     def from_data(cls, data: Union[str, Dict]) -> Union[str, "ArchitectureData"]:
         """Create a architecture information object from YAML data."""
-        if isinstance(data, str):
-            architecture = data
-        elif isinstance(data, dict):
-            architecture = cls.from_dict(data)
-        else:
-            raise Exception("Invalid architecture data")
-
-        return architecture
+        return ARCHITECTURE_DATA_SCHEMA.decode(data)
+
+
+ARCHITECTURE_DATA_SCHEMA = OneOf(Value(str), Record(ArchitectureData))
+"""Schema of the architecture information: a single architecture or the CPU and userspace ones."""
@@ -19,6 +19,10 @@ class BaseData:
         """Create a data type object from a dictionary."""
         return cls(**data)
 
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert the object to a dictionary, accepted by from_dict()."""
+        return {k: v for k, v in self.__dict__.items() if not k.startswith("_")}
+
     def __str__(self) -> str:
         """Return a string representation of the data type."""
-        return ", ".join([f"{k}: {v}" for k, v in self.__dict__.items()])
+        return ", ".join([f"{k}: {v}" for k, v in self.__dict__.items() if not k.startswith("_")])
@@ -5,7 +5,9 @@
 
 from typing import Dict, List, Optional, Union
 
+from liblineage.wiki.data_types._parsing import parse_number
 from liblineage.wiki.data_types.base_data import BaseData
+from liblineage.wiki.data_types.schema import Nullable, PerModel, Record
 
 
 class BatteryData(BaseData):
@@ -15,6 +17,9 @@ class BatteryData(BaseData):
     - capacity: The battery capacity (mAh)
     - removable: Whether the battery is removable
     - tech: The battery technology
+
+    Parsed attributes (None if they can't be parsed):
+    - capacity_mah: The battery capacity (mAh), also when given as a string
     """
 
     def __init__(
@@ -30,23 +35,21 @@ class BatteryData(BaseData):
         self.removable = removable
         self.tech = tech
 
+        # Parsed once, for sorting and filtering
+        capacity_mah = parse_number(capacity)
+        self._capacity_mah = int(capacity_mah) if capacity_mah is not None else None
+
+    @property
+    def capacity_mah(self) -> Optional[int]:
+        return self._capacity_mah
+
     @classmethod
     def from_data(
         cls, data: Optional[Union[Dict, List, str]]
     ) -> Optional[Union["BatteryData", Dict[str, "BatteryData"]]]:
         """Create a battery information object from YAML data."""
-        if data is None:
-            battery = None
-        elif isinstance(data, dict):
-            battery = cls.from_dict(data)
-        elif isinstance(data, list):
-            battery = {}
-            for bat in data:
-                device, battery_data = list(bat.items())[0]
-                battery[device] = cls.from_dict(battery_data)
-        elif isinstance(data, str) and data == "None":
-            battery = None
-        else:
-            raise Exception("Invalid battery data")
-
-        return battery
+        return BATTERY_DATA_SCHEMA.decode(data)
+
+
+BATTERY_DATA_SCHEMA = Nullable(PerModel(Record(BatteryData)), none_string=True)
+"""Schema of the battery information: none, or one for all the models or per model."""
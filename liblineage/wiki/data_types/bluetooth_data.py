@@ -6,6 +6,7 @@
 from typing import Dict, List, Optional
 
 from liblineage.wiki.data_types.base_data import BaseData
+from liblineage.wiki.data_types.schema import Nullable, Record
 
 
 class BluetoothData(BaseData):
@@ -30,11 +31,8 @@ class BluetoothData(BaseData):
     @classmethod
     def from_data(cls, data: Optional[Dict]) -> Optional["BluetoothData"]:
         """Create a Bluetooth information object from YAML data."""
-        if data is None:
-            bluetooth = None
-        elif isinstance(data, dict):
-            bluetooth = cls.from_dict(data)
-        else:
-            raise Exception("Invalid Bluetooth data")
-
-        return bluetooth
+        return BLUETOOTH_DATA_SCHEMA.decode(data)
+
+
+BLUETOOTH_DATA_SCHEMA = Nullable(Record(BluetoothData))
+"""Schema of the Bluetooth information."""
@@ -6,6 +6,7 @@
 from typing import Dict, List, Optional, Sequence
 
 from liblineage.wiki.data_types.base_data import BaseData
+from liblineage.wiki.data_types.schema import ListOf, Nullable, Record
 
 
 class CameraData(BaseData):
@@ -30,11 +31,8 @@ class CameraData(BaseData):
     @classmethod
     def from_data(cls, data: Optional[List[Dict]]) -> Optional[Sequence["CameraData"]]:
         """Create a camera information object from YAML data."""
-        if data is None:
-            camera = None
-        elif isinstance(data, list):
-            camera = [cls.from_dict(camera_data) for camera_data in data]
-        else:
-            raise Exception("Invalid camera data")
-
-        return camera
+        return CAMERA_DATA_SCHEMA.decode(data)
+
+
+CAMERA_DATA_SCHEMA = Nullable(ListOf(Record(CameraData)))
+"""Schema of the cameras information: none, or a list of cameras."""
@@ -5,7 +5,9 @@
 
 from typing import Dict, List, Optional, Union
 
+from liblineage.wiki.data_types._parsing import parse_millimetres
 from liblineage.wiki.data_types.base_data import BaseData
+from liblineage.wiki.data_types.schema import Nullable, PerModel, Record
 
 
 class DimensionData(BaseData):
@@ -15,6 +17,11 @@ class DimensionData(BaseData):
     - height: The height
     - width: The width
     - depth: The depth
+
+    Parsed attributes (None if they can't be parsed):
+    - height_mm: The height (mm)
+    - width_mm: The width (mm)
+    - depth_mm: The depth (mm)
     """
 
     def __init__(
@@ -30,23 +37,30 @@ class DimensionData(BaseData):
         self.width = width
         self.depth = depth
 
+        # Parsed once, for sorting and filtering
+        self._height_mm = parse_millimetres(height)
+        self._width_mm = parse_millimetres(width)
+        self._depth_mm = parse_millimetres(depth)
+
+    @property
+    def height_mm(self) -> Optional[float]:
+        return self._height_mm
+
+    @property
+    def width_mm(self) -> Optional[float]:
+        return self._width_mm
+
+    @property
+    def depth_mm(self) -> Optional[float]:
+        return self._depth_mm
+
     @classmethod
     def from_data(
         cls, data: Optional[Union[Dict, List, str]]
     ) -> Optional[Union["DimensionData", Dict[str, "DimensionData"]]]:
         """Create a dimension information object from YAML data."""
-        if data is None:
-            dimensions = None
-        elif isinstance(data, dict):
-            dimensions = cls.from_dict(data)
-        elif isinstance(data, list):
-            dimensions = {}
-            for dim_data in data:
-                device, dim = list(dim_data.items())[0]
-                dimensions[device] = cls.from_dict(dim)
-        elif isinstance(data, str) and data == "None":
-            dimensions = None
-        else:
-            raise Exception("Invalid dimensions data")
-
-        return dimensions
+        return DIMENSION_DATA_SCHEMA.decode(data)
+
+
+DIMENSION_DATA_SCHEMA = Nullable(PerModel(Record(DimensionData)), none_string=True)
+"""Schema of the dimension information: none, or one for all the models or per model."""
@@ -3,10 +3,11 @@
 # SPDX-License-Identifier: LGPL-3.0-or-later
 #
 
-from typing import Dict, Optional
+from typing import Any, Dict, Optional
 
 from liblineage.constants.infra import GITHUB_ORG_URL
 from liblineage.wiki.data_types.base_data import BaseData
+from liblineage.wiki.data_types.schema import Nullable, Record
 
 
 class KernelData(BaseData):
@@ -28,14 +29,18 @@ class KernelData(BaseData):
         self.repo = f"{GITHUB_ORG_URL}/{repo}"
         self.version = version
 
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert the object to a dictionary, accepted by from_dict()."""
+        return {
+            "repo": self.repo.removeprefix(f"{GITHUB_ORG_URL}/"),
+            "version": self.version,
+        }
+
     @classmethod
     def from_data(cls, data: Optional[Dict]) -> Optional["KernelData"]:
         """Create a kernel information object from YAML data."""
-        if data is None:
-            kernel = None
-        elif isinstance(data, dict):
-            kernel = cls.from_dict(data)
-        else:
-            raise Exception("Invalid kernel data")
-
-        return kernel
+        return KERNEL_DATA_SCHEMA.decode(data)
+
+
+KERNEL_DATA_SCHEMA = Nullable(Record(KernelData))
+"""Schema of the kernel information."""
@@ -5,6 +5,8 @@
 
 from typing import Dict, List, Optional, Union
 
+from liblineage.wiki.data_types.schema import ListOf, Nullable, PerModel, Value
+
 
 class NetworkData:
     """LineageOS network information."""
@@ -15,19 +17,9 @@ class NetworkData:
         data: Optional[Union[List, str]],
     ) -> Optional[Union[List[str], Dict[str, List[str]]]]:
         """Create a network information object from YAML data."""
-        if data is None:
-            networks = None
-        elif isinstance(data, list):
-            if data and isinstance(data[0], str):
-                networks = data
-            else:
-                networks = {}
-                for network_data in data:
-                    device, net = list(network_data.items())[0]
-                    networks[device] = net
-        elif isinstance(data, str) and data == "None":
-            networks = None
-        else:
-            raise Exception("Invalid network data")
+        return NETWORK_DATA_SCHEMA.decode(data)
+
 
-        return networks
+NETWORK_DATA_SCHEMA = Nullable(PerModel(ListOf(Value())), none_string=True)
+"""Schema of the network information: none, or a list of networks for all the models or per
+model."""
@@ -5,6 +5,8 @@
 
 from typing import Dict, List, Optional, Union
 
+from liblineage.wiki.data_types.schema import ListOf, Nullable, PerModel, Value
+
 
 class PeripheralsData:
     """LineageOS peripherals information."""
@@ -14,19 +16,9 @@ class PeripheralsData:
         cls, data: Optional[Union[List, str]]
     ) -> Optional[Union[List[str], Dict[str, List[str]]]]:
         """Create a peripherals information object from YAML data."""
-        if data is None:
-            peripherals = None
-        elif isinstance(data, list):
-            if data and isinstance(data[0], str):
-                peripherals = data
-            else:
-                peripherals = {}
-                for peripherals_data in data:
-                    device, periph = list(peripherals_data.items())[0]
-                    peripherals[device] = periph
-        elif isinstance(data, str) and data == "None":
-            peripherals = None
-        else:
-            raise Exception("Invalid peripherals data")
+        return PERIPHERALS_DATA_SCHEMA.decode(data)
+
 
-        return peripherals
+PERIPHERALS_DATA_SCHEMA = Nullable(PerModel(ListOf(Value())), none_string=True)
+"""Schema of the peripherals information: none, or a list of peripherals for all the models or
+per model."""
@@ -6,6 +6,8 @@
 from datetime import datetime, date
 from typing import Dict, List, Union
 
+from liblineage.wiki.data_types.schema import Converted, OneOf, PerModel, Value
+
 
 class ReleaseData:
     """LineageOS release information."""
@@ -27,18 +29,11 @@ class ReleaseData:
     @classmethod
     def from_data(cls, data: Union[date, int, str, List]) -> Union[date, Dict[str, date]]:
         """Create a release information object from YAML data."""
-        if isinstance(data, date):
-            release = data
-        elif isinstance(data, int):
-            release = cls.convert_release_date(data)
-        elif isinstance(data, str):
-            release = cls.convert_release_date(data)
-        elif isinstance(data, list):
-            release = {}
-            for release_data in data:
-                device, rel = list(release_data.items())[0]
-                release[device] = cls.convert_release_date(rel)
-        else:
-            raise Exception("Invalid release data")
-
-        return release
+        return RELEASE_DATA_SCHEMA.decode(data)
+
+
+RELEASE_DATA_SCHEMA = PerModel(
+    OneOf(Value(date), Converted(ReleaseData.convert_release_date, int, str))
+)
+"""Schema of the release information: a date (YYYY-MM-DD, YYYY-MM or YYYY) for all the models or
+per model."""
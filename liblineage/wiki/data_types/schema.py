@@ -0,0 +1,372 @@
+#
+# SPDX-FileCopyrightText: The LineageOS Project
+# SPDX-License-Identifier: LGPL-3.0-or-later
+#
+"""Declarative field schemas for the wiki data types.
+
+A schema describes the shapes a YAML value can take (a record, a list, a value per model,
+etc.) and compiles, once, into a decoder function specialised for it. Decoding collects every
+validation error of the value, with its path, instead of stopping at the first one.
+
+Usage:
+
+.. code-block:: python
+
+    BATTERY_DATA_SCHEMA = Nullable(PerModel(Record(BatteryData)), none_string=True)
+    battery = BATTERY_DATA_SCHEMA.decode({"capacity": 4000, "removable": False})
+"""
+
+import inspect
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Tuple, Type
+
+Decoder = Callable[[Any], Any]
+"""Function decoding a YAML value, raising SchemaValidationError if it's invalid."""
+
+
+class SchemaValidationError(ValueError):
+    """Invalid YAML data.
+
+    Attributes:
+    - errors (List[Tuple[str, str]]): All the errors, as (path, message), the path being empty
+      for the decoded value itself
+    """
+
+    def __init__(self, errors: List[Tuple[str, str]]):
+        """Initialize the error."""
+        # The errors are the only argument, so that the error can be pickled, e.g. to be sent
+        # back from a worker process
+        super().__init__(errors)
+
+        self.errors = errors
+
+    def __str__(self) -> str:
+        return "; ".join(f"{path}: {message}" if path else message for path, message in self.errors)
+
+    def prefixed(self, key: str) -> List[Tuple[str, str]]:
+        """Get the errors with their paths prefixed by the key of the value in its parent."""
+        return [
+            (f"{key}{path}" if not path or path[0] == "[" else f"{key}.{path}", message)
+            for path, message in self.errors
+        ]
+
+
+def _invalid(message: str) -> SchemaValidationError:
+    return SchemaValidationError([("", message)])
+
+
+def _type_names(types: Iterable[type]) -> str:
+    return " or ".join(type_.__name__ for type_ in types)
+
+
+class FieldType:
+    """Base class for field types.
+
+    Attributes:
+    - types (Optional[Tuple[type, ...]]): The Python types accepted by the decoder, None for any
+    - decode (Decoder): The compiled decoder
+    """
+
+    types: Optional[Tuple[type, ...]] = None
+
+    def __init__(self):
+        """Initialize the field type, compiling its decoder."""
+        self.decode = self.compile()
+
+    def compile(self) -> Decoder:
+        """Build the decoder of the field type."""
+        raise NotImplementedError
+
+
+class Value(FieldType):
+    """A value used as is, optionally checking its type.
+
+    Attributes:
+    - types (Optional[Tuple[type, ...]]): The accepted types, None for any
+    """
+
+    def __init__(self, *types: type):
+        """Initialize the field type."""
+        self.types = types or None
+
+        super().__init__()
+
+    def compile(self) -> Decoder:
+        types = self.types
+        if types is None:
+            return lambda value: value
+
+        def decode(value: Any) -> Any:
+            if not isinstance(value, types):
+                raise _invalid(f"expected {_type_names(types)}, got {type(value).__name__}")
+            return value
+
+        return decode
+
+
+class Converted(FieldType):
+    """A value passed to a conversion function, whose ValueError and TypeError are reported.
+
+    Attributes:
+    - function (Callable[[Any], Any]): The conversion function
+    - types (Optional[Tuple[type, ...]]): The accepted types, None for any
+    """
+
+    def __init__(self, function: Callable[[Any], Any], *types: type):
+        """Initialize the field type."""
+        self.function = function
+        self.types = types or None
+
+        super().__init__()
+
+    def compile(self) -> Decoder:
+        function = self.function
+        types = self.types
+
+        def decode(value: Any) -> Any:
+            if types is not None and not isinstance(value, types):
+                raise _invalid(f"expected {_type_names(types)}, got {type(value).__name__}")
+            try:
+                return function(value)
+            except (TypeError, ValueError) as e:
+                raise _invalid(f"invalid value {value!r} ({e})") from None
+
+        return decode
+
+
+class Record(FieldType):
+    """A mapping decoded into a data type, passing its keys as keyword arguments.
+
+    The fields are the parameters of the data type's __init__(), those without a default value
+    being required. Their values are used as is unless they have a field type.
+
+    Attributes:
+    - cls (Type): The data type
+    - fields (Dict[str, FieldType]): Field types of the parameters that aren't used as is
+    - ignore_unknown (bool): Whether keys that aren't parameters are ignored, instead of being
+      reported as errors
+    - decode_kwargs (Decoder): The compiled decoder returning the keyword arguments instead of
+      an instance, e.g. to instantiate a subclass
+    """
+
+    types = (dict,)
+
+    def __init__(
+        self,
+        cls: Type,
+        fields: Optional[Mapping[str, FieldType]] = None,
+        ignore_unknown: bool = False,
+    ):
+        """Initialize the field type."""
+        self.cls = cls
+        self.fields = dict(fields or {})
+        self.ignore_unknown = ignore_unknown
+
+        super().__init__()
+
+    def compile(self) -> Decoder:
+        parameters = [
+            parameter
+            for parameter in inspect.signature(self.cls.__init__).parameters.values()
+            if parameter.name != "self"
+            and parameter.kind in (parameter.POSITIONAL_OR_KEYWORD, parameter.KEYWORD_ONLY)
+        ]
+        known = frozenset(parameter.name for parameter in parameters)
+
+        unknown_fields = self.fields.keys() - known
+        if unknown_fields:
+            raise ValueError(f"{self.cls.__name__} has no {', '.join(sorted(unknown_fields))}")
+
+        # (name, decoder or None to use the value as is, required)
+        specs = tuple(
+            (
+                parameter.name,
+                self.fields[parameter.name].decode if parameter.name in self.fields else None,
+                parameter.default is parameter.empty,
+            )
+            for parameter in parameters
+        )
+        cls = self.cls
+        ignore_unknown = self.ignore_unknown
+
+        def decode_kwargs(value: Any) -> Dict[str, Any]:
+            if not isinstance(value, dict):
+                raise _invalid(f"expected a mapping, got {type(value).__name__}")
+
+            kwargs: Dict[str, Any] = {}
+            errors: List[Tuple[str, str]] = []
+            for name, decoder, required in specs:
+                if name not in value:
+                    if required:
+                        errors.append((name, "missing"))
+                elif decoder is None:
+                    kwargs[name] = value[name]
+                else:
+                    try:
+                        kwargs[name] = decoder(value[name])
+                    except SchemaValidationError as e:
+                        errors.extend(e.prefixed(name))
+
+            if not ignore_unknown and not value.keys() <= known:
+                errors.extend((str(key), "unknown field") for key in value if key not in known)
+
+            if errors:
+                raise SchemaValidationError(errors)
+
+            return kwargs
+
+        def decode(value: Any) -> Any:
+            return cls(**decode_kwargs(value))
+
+        self.decode_kwargs: Decoder = decode_kwargs
+        return decode
+
+
+class ListOf(FieldType):
+    """A list of values of the same field type.
+
+    Attributes:
+    - item (FieldType): The field type of the items
+    """
+
+    types = (list,)
+
+    def __init__(self, item: FieldType):
+        """Initialize the field type."""
+        self.item = item
+
+        super().__init__()
+
+    def compile(self) -> Decoder:
+        decode_item = self.item.decode
+
+        def decode(value: Any) -> Any:
+            if not isinstance(value, list):
+                raise _invalid(f"expected a list, got {type(value).__name__}")
+
+            items = []
+            errors: List[Tuple[str, str]] = []
+            for index, item in enumerate(value):
+                try:
+                    items.append(decode_item(item))
+                except SchemaValidationError as e:
+                    errors.extend(e.prefixed(f"[{index}]"))
+
+            if errors:
+                raise SchemaValidationError(errors)
+
+            return items
+
+        return decode
+
+
+class PerModel(FieldType):
+    """A value for all the models of the device, or a list of {model: value} mappings, decoded
+    into a dictionary of values by model.
+
+    A list is only per model if all its items are mappings, so that the value can itself be a
+    list (e.g. the networks).
+
+    Attributes:
+    - value (FieldType): The field type of the values
+    """
+
+    def __init__(self, value: FieldType):
+        """Initialize the field type."""
+        self.value = value
+
+        super().__init__()
+
+    def compile(self) -> Decoder:
+        decode_value = self.value.decode
+
+        def decode(value: Any) -> Any:
+            if not isinstance(value, list) or not all(isinstance(item, dict) for item in value):
+                return decode_value(value)
+
+            values = {}
+            errors: List[Tuple[str, str]] = []
+            for index, item in enumerate(value):
+                if not item:
+                    errors.append((f"[{index}]", "expected a {model: value} mapping"))
+                    continue
+
+                model, model_value = next(iter(item.items()))
+                try:
+                    values[model] = decode_value(model_value)
+                except SchemaValidationError as e:
+                    errors.extend(e.prefixed(f"[{model}]"))
+
+            if errors:
+                raise SchemaValidationError(errors)
+
+            return values
+
+        return decode
+
+
+class OneOf(FieldType):
+    """A value of any of the field types, chosen by the Python type of the value.
+
+    Attributes:
+    - alternatives (Tuple[FieldType, ...]): The field types, the first accepting the value is
+      used
+    """
+
+    def __init__(self, *alternatives: FieldType):
+        """Initialize the field type."""
+        self.alternatives = alternatives
+
+        super().__init__()
+
+    def compile(self) -> Decoder:
+        alternatives = tuple(
+            (alternative.types or (object,), alternative.decode)
+            for alternative in self.alternatives
+        )
+        expected = _type_names(
+            type_ for alternative in self.alternatives for type_ in alternative.types or (object,)
+        )
+
+        def decode(value: Any) -> Any:
+            for types, decoder in alternatives:
+                if isinstance(value, types):
+                    return decoder(value)
+
+            raise _invalid(f"expected {expected}, got {type(value).__name__}")
+
+        return decode
+
+
+class Nullable(FieldType):
+    """A field type also accepting None.
+
+    Attributes:
+    - value (FieldType): The field type of the values that aren't None
+    - none_string (bool): Whether the "None" string is also decoded as None
+    """
+
+    def __init__(self, value: FieldType, none_string: bool = False):
+        """Initialize the field type."""
+        self.value = value
+        self.none_string = none_string
+
+        super().__init__()
+
+    def compile(self) -> Decoder:
+        decode_value = self.value.decode
+
+        if self.none_string:
+
+            def decode(value: Any) -> Any:
+                if value is None or value == "None":
+                    return None
+                return decode_value(value)
+
+        else:
+
+            def decode(value: Any) -> Any:
+                if value is None:
+                    return None
+                return decode_value(value)
+
+        return decode
@@ -3,9 +3,12 @@
 # SPDX-License-Identifier: LGPL-3.0-or-later
 #
 
+import math
 from typing import Dict, List, Optional, Union
 
+from liblineage.wiki.data_types._parsing import parse_inches, parse_resolution
 from liblineage.wiki.data_types.base_data import BaseData
+from liblineage.wiki.data_types.schema import Nullable, PerModel, Record
 
 
 class ScreenData(BaseData):
@@ -16,6 +19,12 @@ class ScreenData(BaseData):
     - resolution: The screen resolution (e.g. 1080x1920)
     - technology: The screen technology (e.g. LCD)
     - refresh_rate: Maximum screen refresh rate (Hz)
+
+    Parsed attributes (None if they can't be parsed):
+    - size_in: The screen diagonal (inches)
+    - width_px: The screen width (pixels)
+    - height_px: The screen height (pixels)
+    - ppi: The pixel density (pixels per inch)
     """
 
     def __init__(
@@ -33,23 +42,36 @@ class ScreenData(BaseData):
         self.technology = technology
         self.refresh_rate = refresh_rate
 
+        # Parsed once, for sorting and filtering
+        self._size_in = parse_inches(size)
+        self._resolution = parse_resolution(resolution)
+
+    @property
+    def size_in(self) -> Optional[float]:
+        return self._size_in
+
+    @property
+    def width_px(self) -> Optional[int]:
+        return self._resolution[0] if self._resolution else None
+
+    @property
+    def height_px(self) -> Optional[int]:
+        return self._resolution[1] if self._resolution else None
+
+    @property
+    def ppi(self) -> Optional[float]:
+        if not self._resolution or not self._size_in:
+            return None
+
+        return math.hypot(*self._resolution) / self._size_in
+
     @classmethod
     def from_data(
         cls, data: Optional[Union[Dict, List, str]]
     ) -> Optional[Union["ScreenData", Dict[str, "ScreenData"]]]:
         """Create a screen information object from YAML data."""
-        if data is None:
-            screen = None
-        elif isinstance(data, dict):
-            screen = cls.from_dict(data)
-        elif isinstance(data, list):
-            screen = {}
-            for scr in data:
-                device, screen_data = list(scr.items())[0]
-                screen[device] = cls.from_dict(screen_data)
-        elif isinstance(data, str) and data == "None":
-            screen = None
-        else:
-            raise Exception("Invalid screen data")
-
-        return screen
+        return SCREEN_DATA_SCHEMA.decode(data)
+
+
+SCREEN_DATA_SCHEMA = Nullable(PerModel(Record(ScreenData)), none_string=True)
+"""Schema of the screen information: none, or one for all the models or per model."""
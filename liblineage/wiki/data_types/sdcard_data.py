@@ -6,6 +6,7 @@
 from typing import Dict, Optional
 
 from liblineage.wiki.data_types.base_data import BaseData
+from liblineage.wiki.data_types.schema import Nullable, Record
 
 
 class SdcardData(BaseData):
@@ -30,11 +31,8 @@ class SdcardData(BaseData):
     @classmethod
     def from_data(cls, data: Optional[Dict]) -> Optional["SdcardData"]:
         """Create a sdcard information object from YAML data."""
-        if data is None:
-            sdcard = None
-        elif isinstance(data, dict):
-            sdcard = cls.from_dict(data)
-        else:
-            raise Exception("Invalid sdcard data")
-
-        return sdcard
+        return SDCARD_DATA_SCHEMA.decode(data)
+
+
+SDCARD_DATA_SCHEMA = Nullable(Record(SdcardData))
+"""Schema of the sdcard information."""
@@ -0,0 +1,282 @@
+#
+# SPDX-FileCopyrightText: The LineageOS Project
+# SPDX-License-Identifier: LGPL-3.0-or-later
+#
+
+from typing import (
+    AbstractSet,
+    Any,
+    Callable,
+    Dict,
+    FrozenSet,
+    Hashable,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Set,
+    Union,
+    cast,
+)
+
+from liblineage.wiki.device_data import DeviceData
+
+INDEXED_FIELDS = (
+    "soc",
+    "vendor",
+    "type",
+    "versions",
+    "current_branch",
+    "is_ab_device",
+    "maintainers",
+    "release_year",
+)
+"""Fields of the devices that can be queried through the indexes."""
+
+
+class DeviceCatalog:
+    """In-memory collection of wiki device data, with secondary indexes.
+
+    Every field of INDEXED_FIELDS is indexed by value, so that queries intersect precomputed
+    sets of device names instead of scanning the devices. Fields with multiple values (a list,
+    or a value per model) index the device under each of them, and release_year is the year of
+    the release date(s).
+
+    Usage:
+
+    .. code-block:: python
+
+        catalog = DeviceCatalog(DeviceDataLoader.load("lineage_wiki-main.tar.gz"))
+        devices = (
+            catalog.query(is_ab_device=True, soc="Qualcomm SM8250 Snapdragon 865")
+            .between("current_branch", 22, 23)
+            .devices()
+        )
+    """
+
+    def __init__(self, devices: Union[Mapping[str, DeviceData], Iterable[DeviceData]] = ()) -> None:
+        """Initialize the catalog.
+
+        Args:
+        - devices (Union[Mapping[str, DeviceData], Iterable[DeviceData]]): The devices, either
+          by device name (as returned by DeviceDataLoader.load()) or named by their codename
+        """
+        self._devices: Dict[str, DeviceData] = {}
+        self._indexes: Dict[str, Dict[Hashable, Set[str]]] = {field: {} for field in INDEXED_FIELDS}
+        # Snapshot of the device names, cleared on changes
+        self._names: Optional[FrozenSet[str]] = None
+
+        if isinstance(devices, Mapping):
+            for name, device in cast(Mapping[str, DeviceData], devices).items():
+                self.add(device, name)
+        else:
+            for device in cast(Iterable[DeviceData], devices):
+                self.add(device)
+
+    def __len__(self) -> int:
+        return len(self._devices)
+
+    def __iter__(self) -> Iterator[DeviceData]:
+        return iter(self._devices.values())
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._devices
+
+    def __getitem__(self, name: str) -> DeviceData:
+        return self._devices[name]
+
+    @property
+    def names(self) -> FrozenSet[str]:
+        """Names of all the devices, unaffected by later changes to the catalog."""
+        if self._names is None:
+            self._names = frozenset(self._devices)
+
+        return self._names
+
+    def add(self, device: DeviceData, name: Optional[str] = None) -> None:
+        """Add a device, replacing the one with the same name if any.
+
+        Args:
+        - device (DeviceData): The device
+        - name (Optional[str]): The name of the device, defaults to its codename
+        """
+        name = name or device.codename
+        if name in self._devices:
+            self.remove(name)
+
+        self._devices[name] = device
+        self._names = None
+        for field, index in self._indexes.items():
+            for value in self._get_values(device, field):
+                index.setdefault(value, set()).add(name)
+
+    def remove(self, name: str) -> DeviceData:
+        """Remove a device, raising KeyError if there's none with this name."""
+        device = self._devices.pop(name)
+        self._names = None
+        for field, index in self._indexes.items():
+            for value in self._get_values(device, field):
+                names = index[value]
+                names.discard(name)
+                if not names:
+                    del index[value]
+
+        return device
+
+    def get_values(self, field: str) -> List[Any]:
+        """Get the distinct values of an indexed field, e.g. to populate a filter."""
+        return list(self._get_index(field))
+
+    def lookup(self, field: str, value: Any) -> FrozenSet[str]:
+        """Get the names of the devices with a value for an indexed field."""
+        return frozenset(self._lookup(field, value))
+
+    def _lookup(self, field: str, value: Any) -> AbstractSet[str]:
+        # The index set itself, without a copy, for the queries
+        return self._get_index(field).get(value, frozenset())
+
+    def query(self, **criteria: Any) -> "DeviceQuery":
+        """Start a query, optionally with criteria on indexed fields (see DeviceQuery.where())."""
+        query = DeviceQuery(self, self.names)
+        for field, value in criteria.items():
+            query = query.where(field, value)
+
+        return query
+
+    def _get_index(self, field: str) -> Dict[Hashable, Set[str]]:
+        try:
+            return self._indexes[field]
+        except KeyError:
+            raise KeyError(f"{field} isn't indexed, use DeviceQuery.filter() instead") from None
+
+    @classmethod
+    def _get_values(cls, device: DeviceData, field: str) -> Set[Hashable]:
+        if field == "release_year":
+            return {release.year for release in cls._flatten(device.release)}
+
+        return set(cls._flatten(getattr(device, field)))
+
+    @classmethod
+    def _flatten(cls, value: Any) -> Iterator[Any]:
+        # Values can be lists, per model dictionaries, or lists of per model dictionaries
+        if isinstance(value, list):
+            for item in value:
+                yield from cls._flatten(item)
+        elif isinstance(value, dict):
+            for item in value.values():
+                yield from cls._flatten(item)
+        elif isinstance(value, Hashable):
+            yield value
+
+
+class DeviceQuery:
+    """Immutable query over a DeviceCatalog.
+
+    Every method returns a new query, narrowing (or combining, with the &, | and - operators)
+    the set of matching device names. Queries on indexed fields only intersect and merge sets,
+    they never scan the devices.
+
+    The matching names are a snapshot, devices added to the catalog afterwards don't match and
+    the removed ones are skipped by devices().
+    """
+
+    def __init__(self, catalog: DeviceCatalog, names: AbstractSet[str]) -> None:
+        """Initialize the query.
+
+        Args:
+        - catalog (DeviceCatalog): The queried catalog
+        - names (AbstractSet[str]): The names of the matching devices
+        """
+        self.catalog = catalog
+        self._names = frozenset(names)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __iter__(self) -> Iterator[DeviceData]:
+        return iter(self.devices())
+
+    def __and__(self, other: "DeviceQuery") -> "DeviceQuery":
+        return self._narrow(other.names)
+
+    def __or__(self, other: "DeviceQuery") -> "DeviceQuery":
+        return DeviceQuery(self.catalog, self.names | other.names)
+
+    def __sub__(self, other: "DeviceQuery") -> "DeviceQuery":
+        return DeviceQuery(self.catalog, self.names - other.names)
+
+    @property
+    def names(self) -> FrozenSet[str]:
+        """Names of the matching devices."""
+        return self._names
+
+    def where(self, field: str, *values: Any) -> "DeviceQuery":
+        """Keep the devices having any of the values for an indexed field."""
+        if len(values) == 1:
+            return self._narrow(self.catalog._lookup(field, values[0]))
+
+        return self._narrow_any(field, values)
+
+    def exclude(self, field: str, *values: Any) -> "DeviceQuery":
+        """Remove the devices having any of the values for an indexed field."""
+        return DeviceQuery(self.catalog, self.names - self._union(field, values))
+
+    def between(
+        self, field: str, minimum: Optional[Any] = None, maximum: Optional[Any] = None
+    ) -> "DeviceQuery":
+        """Keep the devices with a value of an indexed field in [minimum, maximum).
+
+        Only the distinct values of the field are compared, not the devices.
+        """
+        values = [
+            value
+            for value in self.catalog.get_values(field)
+            if value is not None
+            and (minimum is None or value >= minimum)
+            and (maximum is None or value < maximum)
+        ]
+
+        return self._narrow_any(field, values)
+
+    def filter(self, predicate: Callable[[DeviceData], bool]) -> "DeviceQuery":
+        """Keep the devices matching a predicate, for fields that aren't indexed.
+
+        This scans the matching devices, narrow the query with indexed fields first.
+        """
+        devices = self.catalog._devices
+        return DeviceQuery(
+            self.catalog,
+            {name for name in self.names if name in devices and predicate(devices[name])},
+        )
+
+    def devices(self) -> List[DeviceData]:
+        """Get the matching devices still in the catalog, sorted by name."""
+        devices = self.catalog._devices
+        return [devices[name] for name in sorted(self.names) if name in devices]
+
+    def _union(self, field: str, values: Iterable[Any]) -> AbstractSet[str]:
+        names: Set[str] = set()
+        for value in values:
+            names.update(self.catalog._lookup(field, value))
+
+        return names
+
+    def _narrow(self, names: AbstractSet[str]) -> "DeviceQuery":
+        return DeviceQuery(self.catalog, self._intersect(names))
+
+    def _narrow_any(self, field: str, values: Iterable[Any]) -> "DeviceQuery":
+        # Intersect every set with the (usually smaller) current one, instead of merging them all
+        names: Set[str] = set()
+        for value in values:
+            names.update(self._intersect(self.catalog._lookup(field, value)))
+
+        return DeviceQuery(self.catalog, names)
+
+    def _intersect(self, names: AbstractSet[str]) -> FrozenSet[str]:
+        # Matching all the devices of an unchanged catalog, the names of an index are a subset
+        if self._names is self.catalog._names:
+            return frozenset(names)
+
+        # Iterates over the smallest set
+        return self._names.intersection(names)
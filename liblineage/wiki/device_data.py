@@ -4,22 +4,57 @@
 #
 
 from datetime import date
-import requests
-from typing import Any, Dict, List, Literal, Optional, Sequence, Union
-import yaml
+from typing import (
+    IO,
+    Any,
+    AsyncIterator,
+    Dict,
+    Iterable,
+    List,
+    Literal,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
 
 from liblineage.constants.infra import GITHUB_ORG, GITHUB_ORG_URL
-from liblineage.wiki.data_types.architecture_data import ArchitectureData
-from liblineage.wiki.data_types.battery_data import BatteryData
-from liblineage.wiki.data_types.bluetooth_data import BluetoothData
-from liblineage.wiki.data_types.camera_data import CameraData
-from liblineage.wiki.data_types.dimension_data import DimensionData
-from liblineage.wiki.data_types.kernel_data import KernelData
-from liblineage.wiki.data_types.network_data import NetworkData
-from liblineage.wiki.data_types.peripherals_data import PeripheralsData
-from liblineage.wiki.data_types.release_data import ReleaseData
-from liblineage.wiki.data_types.screen_data import ScreenData
-from liblineage.wiki.data_types.sdcard_data import SdcardData
+from liblineage.updater.http_utils import (
+    DEFAULT_CONCURRENCY,
+    AsyncHttpClient,
+    AsyncHttpRequests,
+    SyncHttpClient,
+    SyncHttpRequests,
+    fetch_many,
+)
+from liblineage.updater.instrumentation import instrument_decode
+from liblineage.wiki.data_types._parsing import parse_max_frequency
+from liblineage.wiki.data_types.architecture_data import (
+    ARCHITECTURE_DATA_SCHEMA,
+    ArchitectureData,
+)
+from liblineage.wiki.data_types.base_data import BaseData
+from liblineage.wiki.data_types.battery_data import BATTERY_DATA_SCHEMA, BatteryData
+from liblineage.wiki.data_types.bluetooth_data import BLUETOOTH_DATA_SCHEMA, BluetoothData
+from liblineage.wiki.data_types.camera_data import CAMERA_DATA_SCHEMA, CameraData
+from liblineage.wiki.data_types.dimension_data import DIMENSION_DATA_SCHEMA, DimensionData
+from liblineage.wiki.data_types.kernel_data import KERNEL_DATA_SCHEMA, KernelData
+from liblineage.wiki.data_types.network_data import NETWORK_DATA_SCHEMA
+from liblineage.wiki.data_types.peripherals_data import PERIPHERALS_DATA_SCHEMA
+from liblineage.wiki.data_types.release_data import RELEASE_DATA_SCHEMA
+from liblineage.wiki.data_types.screen_data import SCREEN_DATA_SCHEMA, ScreenData
+from liblineage.wiki.data_types.schema import Record
+from liblineage.wiki.data_types.sdcard_data import SDCARD_DATA_SCHEMA, SdcardData
+from liblineage.wiki.yaml_loader import load_yaml
+
+LINEAGE_WIKI_DEVICES_URL = (
+    f"https://raw.githubusercontent.com/{GITHUB_ORG}/lineage_wiki/main/_data/devices"
+)
+
+# Fields that can have a value per model, stored as dictionaries of model to value
+_PER_MODEL_FIELDS = frozenset(
+    ("battery", "dimensions", "network", "peripherals", "release", "screen")
+)
 
 
 class DeviceData:
@@ -72,6 +107,9 @@ class DeviceData:
     - required_bootloader: The required bootloader of the device
     - sdcard: The SD card info of the device
     - uses_twrp: Whether the device uses TWRP
+
+    Parsed attributes (None if they can't be parsed):
+    - cpu_freq_ghz: The highest CPU core frequency (GHz)
     """
 
     def __init__(
@@ -168,62 +206,50 @@ class DeviceData:
         self.sdcard = sdcard
         self.uses_twrp = uses_twrp
 
+        # Parsed once, for sorting and filtering
+        self._cpu_freq_ghz = parse_max_frequency(cpu_freq)
+
+    @property
+    def cpu_freq_ghz(self) -> Optional[float]:
+        return self._cpu_freq_ghz
+
     @classmethod
     def from_dict(cls, data: Dict[str, Any]):
-        """Create a device data object from a dictionary."""
-        return cls(
-            architecture=ArchitectureData.from_data(data["architecture"]),
-            battery=BatteryData.from_data(data["battery"]),
-            bluetooth=BluetoothData.from_data(data["bluetooth"]),
-            codename=data["codename"],
-            cpu=data["cpu"],
-            cpu_cores=data["cpu_cores"],
-            cpu_freq=data["cpu_freq"],
-            current_branch=data["current_branch"],
-            dimensions=DimensionData.from_data(data["dimensions"]),
-            gpu=data["gpu"],
-            image=data["image"],
-            install_method=data["install_method"],
-            kernel=KernelData.from_data(data["kernel"]),
-            maintainers=data["maintainers"],
-            name=data["name"],
-            network=NetworkData.from_data(data["network"]),
-            peripherals=PeripheralsData.from_data(data["peripherals"]),
-            release=ReleaseData.from_data(data["release"]),
-            screen=ScreenData.from_data(data["screen"]),
-            soc=data["soc"],
-            tree=data["tree"],
-            type=data["type"],
-            vendor=data["vendor"],
-            vendor_short=data["vendor_short"],
-            versions=data["versions"],
-            wifi=data["wifi"],
-            before_install=data.get("before_install"),
-            before_lineage_install=data.get("before_lineage_install"),
-            before_recovery_install=data.get("before_recovery_install"),
-            cameras=CameraData.from_data(data.get("cameras")),
-            carrier=data.get("carrier"),
-            custom_recovery_codename=data.get("custom_recovery_codename"),
-            custom_recovery_link=data.get("custom_recovery_link"),
-            custom_unlock_cmd=data.get("custom_unlock_cmd"),
-            download_boot=data.get("download_boot"),
-            format_on_upgrade=data.get("format_on_upgrade"),
-            has_recovery_partition=data.get("has_recovery_partition"),
-            is_ab_device=data.get("is_ab_device"),
-            is_unlockable=data.get("is_unlockable"),
-            models=data.get("models"),
-            recovery_boot=data.get("recovery_boot"),
-            required_bootloader=data.get("required_bootloader"),
-            sdcard=SdcardData.from_data(data.get("sdcard")),
-            uses_twrp=data.get("uses_twrp"),
-        )
+        """Create a device data object from a dictionary.
+
+        Raises SchemaValidationError, listing all the invalid fields, if the data is invalid.
+        """
+        return cls(**DEVICE_DATA_SCHEMA.decode_kwargs(data))
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert the object to a dictionary in the format of the wiki YAML files, accepted by
+        from_dict().
+
+        Dates are converted to ISO format strings.
+        """
+        return {
+            name: _to_yaml_data(value, name in _PER_MODEL_FIELDS)
+            for name, value in self.__dict__.items()
+            if not name.startswith("_")
+        }
+
+    @classmethod
+    @instrument_decode("wiki.device_data")
+    def from_yaml_bytes(cls, data: bytes):
+        """Create a device data object from the raw content of a wiki device YAML file."""
+        return cls.from_dict(load_yaml(data))
 
     @classmethod
-    def get_device_data(cls, device: str) -> "DeviceData":
-        url = f"https://raw.githubusercontent.com/{GITHUB_ORG}/lineage_wiki/main/_data/devices/{device}.yml"
-        response = requests.get(url=url)
-        response.raise_for_status()
-        return cls.from_dict(yaml.safe_load(response.text))
+    def from_yaml_stream(cls, stream: Union[IO[bytes], IO[str]]):
+        """Create a device data object from a file-like object of a wiki device YAML file."""
+        return cls.from_dict(load_yaml(stream))
+
+    @classmethod
+    def get_device_data(cls, device: str, client: Optional[SyncHttpClient] = None) -> "DeviceData":
+        response = SyncHttpRequests.get_bytes(
+            f"{LINEAGE_WIKI_DEVICES_URL}/{device}.yml", client=client
+        )
+        return cls.from_yaml_bytes(response)
 
     def __str__(self) -> str:
         """Return a string representation of the device data."""
@@ -302,3 +328,74 @@ class DeviceData:
             return "".join([f"\n - {device}: {str(value)}" for device, value in data.items()])
         else:
             return str(data)
+
+
+DEVICE_DATA_SCHEMA = Record(
+    DeviceData,
+    {
+        "architecture": ARCHITECTURE_DATA_SCHEMA,
+        "battery": BATTERY_DATA_SCHEMA,
+        "bluetooth": BLUETOOTH_DATA_SCHEMA,
+        "dimensions": DIMENSION_DATA_SCHEMA,
+        "kernel": KERNEL_DATA_SCHEMA,
+        "network": NETWORK_DATA_SCHEMA,
+        "peripherals": PERIPHERALS_DATA_SCHEMA,
+        "release": RELEASE_DATA_SCHEMA,
+        "screen": SCREEN_DATA_SCHEMA,
+        "cameras": CAMERA_DATA_SCHEMA,
+        "sdcard": SDCARD_DATA_SCHEMA,
+    },
+    ignore_unknown=True,
+)
+"""Schema of the device data, the other fields are used as is and unknown ones are ignored."""
+
+
+def _to_yaml_data(value: Any, per_model: bool = False) -> Any:
+    if per_model and isinstance(value, dict):
+        return [{model: _to_yaml_data(item)} for model, item in value.items()]
+    if isinstance(value, BaseData):
+        return {key: _to_yaml_data(item) for key, item in value.to_dict().items()}
+    if isinstance(value, list):
+        return [_to_yaml_data(item) for item in value]
+    if isinstance(value, date):
+        return value.isoformat()
+
+    return value
+
+
+class AsyncDeviceData:
+    """Asynchronous variants of the DeviceData fetchers."""
+
+    @staticmethod
+    async def get_device_data(device: str, client: Optional[AsyncHttpClient] = None) -> DeviceData:
+        """Get the wiki data of a device."""
+        response = await AsyncHttpRequests.get_bytes(
+            f"{LINEAGE_WIKI_DEVICES_URL}/{device}.yml", client=client
+        )
+        return DeviceData.from_yaml_bytes(response)
+
+    @staticmethod
+    async def get_many_device_data(
+        devices: Iterable[str],
+        concurrency: int = DEFAULT_CONCURRENCY,
+        client: Optional[AsyncHttpClient] = None,
+    ) -> AsyncIterator[Tuple[str, Union[DeviceData, Exception]]]:
+        """Get the wiki data of many devices concurrently.
+
+        Results are yielded as soon as they're available, as (device, data) tuples.
+        If fetching the data of a device fails, the raised exception is yielded in place of its
+        data, without affecting the other devices.
+        """
+        if client is None:
+            async with AsyncHttpClient(limit_per_host=concurrency) as owned_client:
+                async for result in AsyncDeviceData.get_many_device_data(
+                    devices, concurrency, owned_client
+                ):
+                    yield result
+            return
+
+        async def fetch(device: str) -> DeviceData:
+            return await AsyncDeviceData.get_device_data(device, client=client)
+
+        async for result in fetch_many(fetch, devices, concurrency):
+            yield result
@@ -0,0 +1,180 @@
+#
+# SPDX-FileCopyrightText: The LineageOS Project
+# SPDX-License-Identifier: LGPL-3.0-or-later
+#
+
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from itertools import islice
+import os
+from pathlib import Path, PurePosixPath
+import tarfile
+from typing import Callable, Deque, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+import zipfile
+
+from liblineage.wiki.device_data import DeviceData
+
+DEVICES_DIR = PurePosixPath("_data") / "devices"
+"""Path of the devices data directory in a lineage_wiki checkout."""
+
+CHUNKSIZE = 32
+"""Number of device files sent to a worker process at once."""
+
+PENDING_CHUNKS_PER_WORKER = 2
+"""Number of chunks submitted in advance per worker process, the files of the other ones aren't
+read yet."""
+
+
+class DeviceDataLoader:
+    """Bulk loader of wiki device data from a local lineage_wiki checkout or archive.
+
+    Device files are parsed in parallel with a process pool, without any network access.
+
+    Usage:
+
+    .. code-block:: python
+
+        devices = DeviceDataLoader.load("lineage_wiki-main.tar.gz")
+        print(devices["lemonadep"].name)
+    """
+
+    @classmethod
+    def load(
+        cls,
+        path: Union[Path, str],
+        max_workers: Optional[int] = None,
+        on_error: Optional[Callable[[str, Exception], None]] = None,
+    ) -> Dict[str, DeviceData]:
+        """Load all the device data from a checkout directory or an archive (.tar.* or .zip).
+
+        The path can either be the root of a lineage_wiki checkout or its _data/devices
+        directory. Archives are scanned for any _data/devices/*.yml file, so the ones
+        downloaded from GitHub work as-is.
+
+        Args:
+        - path (Union[Path, str]): The checkout directory or archive
+        - max_workers (Optional[int]): Number of worker processes, defaults to the number of CPUs,
+          0 parses everything in the current process
+        - on_error (Optional[Callable[[str, Exception], None]]): Called with the device name and
+          the exception when a file fails to be parsed, which is then skipped. If not set, the
+          exception is raised
+
+        Returns a dictionary of device name (the file name without extension) to its data.
+        """
+        path = Path(path)
+
+        if path.is_dir():
+            files = cls._iter_directory(path)
+        elif tarfile.is_tarfile(path):
+            files = cls._iter_tarfile(path)
+        elif zipfile.is_zipfile(path):
+            files = cls._iter_zipfile(path)
+        else:
+            raise ValueError(f"{path} is not a directory nor a supported archive")
+
+        if max_workers == 0:
+            results = map(_parse_device_file, files)
+            return cls._collect(results, on_error)
+
+        workers = max_workers or os.cpu_count() or 1
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = cls._map_bounded(executor, files, workers * PENDING_CHUNKS_PER_WORKER)
+            return cls._collect(results, on_error)
+
+    @staticmethod
+    def _map_bounded(
+        executor: ProcessPoolExecutor,
+        files: Iterable[Tuple[str, bytes]],
+        max_pending: int,
+    ) -> Iterator[Tuple[str, Union[DeviceData, Exception]]]:
+        # Like executor.map(), but only max_pending chunks are submitted at once, so that the
+        # files are streamed instead of all being read in memory up front
+        pending: Deque["Future[List[Tuple[str, Union[DeviceData, Exception]]]]"] = deque()
+        files = iter(files)
+
+        try:
+            while True:
+                chunk = list(islice(files, CHUNKSIZE))
+                if not chunk:
+                    break
+
+                if len(pending) >= max_pending:
+                    yield from pending.popleft().result()
+                pending.append(executor.submit(_parse_device_files, chunk))
+
+            while pending:
+                yield from pending.popleft().result()
+        finally:
+            for future in pending:
+                future.cancel()
+
+    @staticmethod
+    def _collect(
+        results: Iterator[Tuple[str, Union[DeviceData, Exception]]],
+        on_error: Optional[Callable[[str, Exception], None]],
+    ) -> Dict[str, DeviceData]:
+        devices = {}
+
+        for name, device_data in results:
+            if isinstance(device_data, Exception):
+                if on_error is None:
+                    raise device_data
+
+                on_error(name, device_data)
+                continue
+
+            devices[name] = device_data
+
+        return devices
+
+    @staticmethod
+    def _iter_directory(path: Path) -> Iterator[Tuple[str, bytes]]:
+        devices_dir = path / DEVICES_DIR
+        if not devices_dir.is_dir():
+            devices_dir = path
+
+        for file in sorted(devices_dir.glob("*.yml")):
+            yield file.stem, file.read_bytes()
+
+    @staticmethod
+    def _iter_tarfile(path: Path) -> Iterator[Tuple[str, bytes]]:
+        # Stream mode, members are read sequentially without seeking
+        with tarfile.open(path, "r|*") as tar:
+            for member in tar:
+                if not member.isfile() or not _is_device_file(member.name):
+                    continue
+
+                file = tar.extractfile(member)
+                assert file is not None
+
+                yield PurePosixPath(member.name).stem, file.read()
+
+    @staticmethod
+    def _iter_zipfile(path: Path) -> Iterator[Tuple[str, bytes]]:
+        with zipfile.ZipFile(path) as zip_file:
+            for info in zip_file.infolist():
+                if info.is_dir() or not _is_device_file(info.filename):
+                    continue
+
+                yield PurePosixPath(info.filename).stem, zip_file.read(info)
+
+
+def _is_device_file(name: str) -> bool:
+    path = PurePosixPath(name)
+    return path.suffix == ".yml" and path.parent.parts[-2:] == DEVICES_DIR.parts
+
+
+def _parse_device_files(
+    files: List[Tuple[str, bytes]],
+) -> List[Tuple[str, Union[DeviceData, Exception]]]:
+    return [_parse_device_file(file) for file in files]
+
+
+def _parse_device_file(file: Tuple[str, bytes]) -> Tuple[str, Union[DeviceData, Exception]]:
+    # Runs in the worker processes, errors are returned to be handled by the caller
+    name, data = file
+
+    try:
+        return name, DeviceData.from_yaml_bytes(data)
+    except Exception as e:
+        return name, e
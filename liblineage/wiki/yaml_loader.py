@@ -0,0 +1,29 @@
+#
+# SPDX-FileCopyrightText: The LineageOS Project
+# SPDX-License-Identifier: LGPL-3.0-or-later
+#
+
+from typing import IO, Any, Union
+
+import yaml
+
+try:
+    # libyaml based, much faster than the pure Python one
+    from yaml import CSafeLoader as SafeLoader
+
+    YAML_BACKEND = "libyaml"
+    """Name of the YAML parsing backend in use."""
+except ImportError:
+    from yaml import SafeLoader
+
+    YAML_BACKEND = "python"
+    """Name of the YAML parsing backend in use."""
+
+
+def load_yaml(stream: Union[bytes, str, IO[bytes], IO[str]]) -> Any:
+    """Parse a YAML document with the fastest available safe loader.
+
+    The stream can be bytes (encoding is detected from the BOM, defaulting to UTF-8), a string
+    or a file-like object.
+    """
+    return yaml.load(stream, Loader=SafeLoader)
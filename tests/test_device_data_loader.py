@@ -0,0 +1,48 @@
+#
+# SPDX-FileCopyrightText: The LineageOS Project
+# SPDX-License-Identifier: LGPL-3.0-or-later
+#
+
+from pathlib import Path
+from typing import Dict
+
+import pytest
+import yaml
+
+from benchmarks._corpus import device_yaml_corpus
+from liblineage.wiki.data_types.schema import SchemaValidationError
+from liblineage.wiki.device_data_loader import DeviceDataLoader
+
+
+@pytest.fixture
+def wiki_dir(tmp_path: Path) -> Path:
+    devices_dir = tmp_path / "_data" / "devices"
+    devices_dir.mkdir(parents=True)
+
+    valid, invalid = device_yaml_corpus(2)
+    (devices_dir / "valid.yml").write_bytes(valid)
+
+    data = yaml.safe_load(invalid)
+    del data["name"]
+    (devices_dir / "invalid.yml").write_text(yaml.safe_dump(data))
+
+    return tmp_path
+
+
+@pytest.mark.parametrize("max_workers", [0, 2])
+def test_load_reports_invalid_files(wiki_dir: Path, max_workers: int):
+    errors: Dict[str, Exception] = {}
+
+    devices = DeviceDataLoader.load(wiki_dir, max_workers=max_workers, on_error=errors.__setitem__)
+
+    assert list(devices) == ["valid"]
+    assert list(errors) == ["invalid"]
+
+    error = errors["invalid"]
+    assert isinstance(error, SchemaValidationError)
+    assert error.errors == [("name", "missing")]
+
+
+def test_load_raises_without_on_error(wiki_dir: Path):
+    with pytest.raises(SchemaValidationError, match="name: missing"):
+        DeviceDataLoader.load(wiki_dir, max_workers=2)